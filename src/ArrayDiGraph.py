@@ -0,0 +1,519 @@
+import random
+from array import array
+from collections.abc import Mapping
+from src.DiGraph import DiGraph
+
+NAN = float("nan")
+# the edge arrays longer than this get a map from the other end to its position
+SLOTS = 16
+
+
+class ArrayNode:
+    """This class represents a view of a vertex in an ArrayDiGraph, the data lives in the arrays of the graph."""
+
+    __slots__ = ("graph", "key")
+
+    def __init__(self, graph, key: int):
+        self.graph = graph
+        self.key = key
+
+    def get_key(self) -> int:
+        """
+        return the ID of the node
+        :return: The ID of the node
+        """
+        return self.key
+
+    @property
+    def pos(self):
+        """
+        The position of the node, None if it has none
+        """
+        i = self.graph.index[self.key] * 3
+        x, y, z = self.graph.pos[i:i + 3]
+        return None if x != x else (x, y, z)
+
+    @property
+    def pos_generated(self) -> bool:
+        """
+        True if the position was generated by get_pos
+        """
+        return bool(self.graph.pos_generated[self.graph.index[self.key]])
+
+    def get_pos(self):
+        """
+        Returns the position of the node
+        if the there is no position to the node it will update in random location
+        :return: The position of the node
+        """
+        pos = self.pos
+        if pos is None:
+            pos = (random.uniform(32.001, 32.999), random.uniform(35.001, 35.999), 0.0)
+            i = self.graph.index[self.key]
+            self.graph.pos[i * 3:i * 3 + 3] = array("d", pos)
+            self.graph.pos_generated[i] = 1
+        return pos
+
+    def get_hashIn(self) -> dict:
+        """
+        Returns the incoming edges list
+        :return: The incoming edges list
+        """
+        return self.graph.all_in_edges_of_node(self.key)
+
+    def get_hashOut(self) -> dict:
+        """
+        Returns the outgoing edges list
+        :return: The outgoing edges list
+        """
+        return self.graph.all_out_edges_of_node(self.key)
+
+    def __eq__(self, other):
+        if other is None or not hasattr(other, "get_hashOut"):
+            return False
+        return self.get_hashIn().keys() == other.get_hashIn().keys() and \
+            self.get_hashOut().keys() == other.get_hashOut().keys()
+
+    def __repr__(self):
+        return repr((self.key, self.pos))
+
+
+class ArrayNodes(Mapping):
+    """This class represents the (node_id, node_data) dictionary of an ArrayDiGraph, the views are created on demand."""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, node_id: int) -> ArrayNode:
+        if node_id not in self.graph.index:
+            raise KeyError(node_id)
+        return ArrayNode(self.graph, node_id)
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.graph.index
+
+    def __iter__(self):
+        return iter(self.graph.index)
+
+    def __len__(self) -> int:
+        return len(self.graph.index)
+
+
+class ArrayDiGraph(DiGraph):
+    """
+    This class represents a directed weighted graph with a compact storage:
+    the node ids are mapped to dense indices, and the edges of every node are kept in typed arrays,
+    array('i') of the other end and array('d') of the weight, for the out-edges and for the in-edges.
+    A removed edge is marked with the index -1 (a tombstone), the arrays of a node are compacted when
+    they hold more tombstones than edges, and all the indices are compacted when more nodes were removed
+    than there are left (see compact).
+    The arrays of a node with more than SLOTS edges on a side also get a dictionary from the other end to its
+    position, so finding an edge of a hub is O(1) instead of a scan of its arrays.
+    The API is the one of DiGraph, get_node and get_all_v return views of the nodes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.index = {}
+        self.ids = array("q")
+        self.pos = array("d")
+        self.pos_generated = bytearray()
+        self.out_nodes = []
+        self.out_weights = []
+        self.in_nodes = []
+        self.in_weights = []
+        self.out_slots = []
+        self.in_slots = []
+        self.out_dead = array("i")
+        self.in_dead = array("i")
+        self.removed = 0
+        self.nodes = ArrayNodes(self)
+
+    def get_node(self, node_id: int) -> ArrayNode:
+        """
+        Returns a view of the node
+        @param node_id:
+        @return: The view of the node, None if it does not exist
+        """
+        if node_id not in self.index:
+            return None
+        return ArrayNode(self, node_id)
+
+    def find(self, nodes: array, slots: dict, j: int) -> int:
+        """
+        Returns the position of the index j in an edge array
+        @param nodes: The edge array
+        @param slots: The map of the positions of the array, None if it is short
+        @param j: The index of the other end
+        @return: The position, -1 if j is not there
+        """
+        if slots is not None:
+            return slots.get(j, -1)
+        try:
+            return nodes.index(j)
+        except ValueError:
+            return -1
+
+    def map_slots(self, nodes: array) -> dict:
+        """
+        Returns the map from the other end to its position for an edge array
+        @param nodes: The edge array
+        @return: The map, None if the array is short enough to be scanned
+        """
+        if len(nodes) <= SLOTS:
+            return None
+        return {j: k for k, j in enumerate(nodes) if j >= 0}
+
+    def get_edge(self, id1: int, id2: int) -> float:
+        """
+        Returns the weight of the edge between id1 to id2
+        @param id1:
+        @param id2:
+        @return: The weight of the edge, -1 if there is no such edge
+        """
+        i = self.index.get(id1)
+        j = self.index.get(id2)
+        if i is None or j is None:
+            return -1
+        k = self.find(self.out_nodes[i], self.out_slots[i], j)
+        return -1 if k < 0 else self.out_weights[i][k]
+
+    def has_edge(self, id1: int, id2: int) -> bool:
+        """
+        Returns if there is an edge between id1 to id2
+        @param id1:
+        @param id2:
+        @return: True if there is an edge False if not
+        """
+        i = self.index.get(id1)
+        j = self.index.get(id2)
+        return i is not None and j is not None and self.find(self.out_nodes[i], self.out_slots[i], j) >= 0
+
+    def v_size(self) -> int:
+        """
+        Returns the number of vertices in this graph
+        @return: The number of vertices in this graph
+        """
+        return len(self.index)
+
+    def get_all_v(self) -> ArrayNodes:
+        """
+        return a dictionary of all the nodes in the Graph, each node is represented using a pair
+        (node_id, node_data)
+        """
+        return self.nodes
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """
+        return a dictionary of all the nodes connected to (into) node_id ,
+        each node is represented using a pair (other_node_id, weight)
+        """
+        i = self.index[id1]
+        ids = self.ids
+        return {ids[j]: w for j, w in zip(self.in_nodes[i], self.in_weights[i]) if j >= 0}
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """
+        return a dictionary of all the nodes connected from node_id , each node is represented using a pair
+        (other_node_id, weight)
+        """
+        i = self.index[id1]
+        ids = self.ids
+        return {ids[j]: w for j, w in zip(self.out_nodes[i], self.out_weights[i]) if j >= 0}
+
+    def append_node(self, node_id: int, pos: tuple):
+        """
+        Appends a node at the next index (the caller holds the write lock)
+        @param node_id: The node ID
+        @param pos: The position of the node
+        @return:
+        """
+        self.index[node_id] = len(self.ids)
+        self.ids.append(node_id)
+        self.pos.extend((NAN, NAN, NAN) if pos is None else (float(p) for p in pos))
+        self.pos_generated.append(0)
+        self.out_nodes.append(array("i"))
+        self.out_weights.append(array("d"))
+        self.in_nodes.append(array("i"))
+        self.in_weights.append(array("d"))
+        self.out_slots.append(None)
+        self.in_slots.append(None)
+        self.out_dead.append(0)
+        self.in_dead.append(0)
+
+    def append_edge(self, i: int, j: int, weight: float):
+        """
+        Appends the edge between the indices i and j (the caller holds the write lock)
+        @param i: The index of the start node
+        @param j: The index of the end node
+        @param weight: The weight of the edge
+        @return:
+        """
+        self.push(self.out_nodes, self.out_weights, self.out_slots, i, j, weight)
+        self.push(self.in_nodes, self.in_weights, self.in_slots, j, i, weight)
+
+    def push(self, nodes: list, weights: list, slots: list, i: int, j: int, weight: float):
+        """
+        Appends the index j to the arrays of the index i on one side, and keeps their map of positions
+        @param nodes: The edge arrays (out or in)
+        @param weights: The weight arrays of the same side
+        @param slots: The maps of positions of the same side
+        @param i: The index of the node
+        @param j: The index of the other end
+        @param weight: The weight of the edge
+        @return:
+        """
+        nodes[i].append(j)
+        weights[i].append(weight)
+        if slots[i] is not None:
+            slots[i][j] = len(nodes[i]) - 1
+        elif len(nodes[i]) > SLOTS:
+            slots[i] = self.map_slots(nodes[i])
+
+    def bury(self, nodes: list, weights: list, slots: list, dead: array, i: int, j: int):
+        """
+        Marks the edge to the index j in the arrays of the index i as removed,
+        and compacts the arrays if they hold more tombstones than edges
+        @param nodes: The edge arrays (out or in)
+        @param weights: The weight arrays of the same side
+        @param slots: The maps of positions of the same side
+        @param dead: The tombstone counters of the same side
+        @param i: The index of the node
+        @param j: The index of the other end
+        @return:
+        """
+        if slots[i] is not None:
+            k = slots[i].pop(j)
+        else:
+            k = self.find(nodes[i], None, j)
+        nodes[i][k] = -1
+        dead[i] += 1
+        if dead[i] * 2 > len(nodes[i]):
+            keep = [k for k, other in enumerate(nodes[i]) if other >= 0]
+            nodes[i] = array("i", (nodes[i][k] for k in keep))
+            weights[i] = array("d", (weights[i][k] for k in keep))
+            slots[i] = self.map_slots(nodes[i])
+            dead[i] = 0
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """
+        Adds a node to the graph.
+        @param node_id: The node ID
+        @param pos: The position of the node
+        @return: True if the node was added successfully, False o.w.
+
+        Note: if the node id already exists the node will not be added
+        """
+        with self.lock.write():
+            if node_id in self.index:
+                return False
+            self.append_node(node_id, pos)
+            self.changed([("add_node", node_id, None, None, None)])
+            return True
+
+    def add_nodes_bulk(self, nodes) -> int:
+        """
+        Adds many nodes to the graph, the MC is increased once for the whole batch.
+        @param nodes: An iterable of (node_id, pos) pairs
+        @return: The number of nodes that were added
+
+        Note: nodes whose id already exists are skipped
+        """
+        with self.lock.write():
+            added = []
+            for node_id, pos in nodes:
+                if node_id not in self.index:
+                    self.append_node(node_id, pos)
+                    added.append(("add_node", node_id, None, None, None))
+            if added:
+                self.changed(added)
+            return len(added)
+
+    def add_edges_bulk(self, edges) -> int:
+        """
+        Adds many edges to the graph, the MC is increased once for the whole batch.
+        @param edges: An iterable of (id1, id2, weight) triples
+        @return: The number of edges that were added
+
+        Note: edges that already exist, loops and edges with a missing node are skipped
+        """
+        with self.lock.write():
+            added = []
+            for id1, id2, weight in edges:
+                i = self.index.get(id1)
+                j = self.index.get(id2)
+                if i is None or j is None or i == j or self.find(self.out_nodes[i], self.out_slots[i], j) >= 0:
+                    continue
+                self.append_edge(i, j, weight)
+                added.append(("add_edge", id1, id2, weight, None))
+            if added:
+                self.num_of_edges += len(added)
+                self.changed(added)
+            return len(added)
+
+    def remove_node(self, node_id: int) -> bool:
+        """
+        Removes a node from the graph.
+        @param node_id: The node ID
+        @return: True if the node was removed successfully, False o.w.
+
+        Note: if the node id does not exists the function will do nothing
+        """
+        with self.lock.write():
+            if node_id not in self.index:
+                return False
+            hash_in = self.all_in_edges_of_node(node_id)
+            hash_out = self.all_out_edges_of_node(node_id)
+            node = (self.get_node(node_id).pos, self.pos_generated[self.index[node_id]])
+            i = self.index.pop(node_id)
+            for j in self.in_nodes[i]:
+                if j >= 0:
+                    self.bury(self.out_nodes, self.out_weights, self.out_slots, self.out_dead, j, i)
+            for j in self.out_nodes[i]:
+                if j >= 0:
+                    self.bury(self.in_nodes, self.in_weights, self.in_slots, self.in_dead, j, i)
+            self.out_nodes[i] = array("i")
+            self.out_weights[i] = array("d")
+            self.in_nodes[i] = array("i")
+            self.in_weights[i] = array("d")
+            self.out_slots[i] = None
+            self.in_slots[i] = None
+            self.num_of_edges -= len(hash_in) + len(hash_out)
+            self.removed += 1
+            if self.removed > len(self.index):
+                self.compact()
+            changes = [("remove_edge", src, node_id, weight, None) for src, weight in hash_in.items()]
+            changes.extend(("remove_edge", node_id, dest, weight, None) for dest, weight in hash_out.items())
+            changes.append(("remove_node", node_id, None, None, node))
+            self.changed(changes)
+            return True
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        Adds an edge to the graph.
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @param weight: The weight of the edge
+        @return: True if the edge was added successfully, False o.w.
+
+        Note: If the edge already exists or one of the nodes dose not exists the functions will do nothing
+        """
+        with self.lock.write():
+            i = self.index.get(id1)
+            j = self.index.get(id2)
+            if i is None or j is None or i == j or self.find(self.out_nodes[i], self.out_slots[i], j) >= 0:
+                return False
+            self.append_edge(i, j, weight)
+            self.num_of_edges += 1
+            self.changed([("add_edge", id1, id2, weight, None)])
+            return True
+
+    def remove_edges_bulk(self, edges) -> int:
+        """
+        Removes many edges from the graph, the MC is increased once for the whole batch.
+        @param edges: An iterable of (id1, id2) pairs
+        @return: The number of edges that were removed
+
+        Note: edges that do not exist are skipped
+        """
+        with self.lock.write():
+            removed = []
+            for id1, id2 in edges:
+                i = self.index.get(id1)
+                j = self.index.get(id2)
+                if i is None or j is None:
+                    continue
+                k = self.find(self.out_nodes[i], self.out_slots[i], j)
+                if k < 0:
+                    continue
+                weight = self.out_weights[i][k]
+                self.bury(self.out_nodes, self.out_weights, self.out_slots, self.out_dead, i, j)
+                self.bury(self.in_nodes, self.in_weights, self.in_slots, self.in_dead, j, i)
+                removed.append(("remove_edge", id1, id2, weight, None))
+            if removed:
+                self.num_of_edges -= len(removed)
+                self.changed(removed)
+            return len(removed)
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """
+        Removes an edge from the graph.
+        @param node_id1: The start node of the edge
+        @param node_id2: The end node of the edge
+        @return: True if the edge was removed successfully, False o.w.
+
+        Note: If such an edge does not exists the function will do nothing
+        """
+        return self.remove_edges_bulk([(node_id1, node_id2)]) == 1
+
+    def undo(self, kind: str, id1: int, id2: int, weight: float, node):
+        """
+        Reverts a change of a batch that is rolled back (see DiGraph.batch)
+        @param kind: The kind of the change
+        @param id1: The node, or the start node of the edge
+        @param id2: The end node of the edge
+        @param weight: The weight of the edge
+        @param node: The (position, generated) of the removed node of "remove_node"
+        @return:
+        """
+        if kind == "add_node":
+            # its edges were already reverted
+            self.index.pop(id1)
+            self.removed += 1
+        elif kind == "remove_node":
+            self.append_node(id1, node[0])
+            self.pos_generated[-1] = node[1]
+        elif kind == "add_edge":
+            i, j = self.index[id1], self.index[id2]
+            self.bury(self.out_nodes, self.out_weights, self.out_slots, self.out_dead, i, j)
+            self.bury(self.in_nodes, self.in_weights, self.in_slots, self.in_dead, j, i)
+            self.num_of_edges -= 1
+        elif kind == "remove_edge":
+            self.append_edge(self.index[id1], self.index[id2], weight)
+            self.num_of_edges += 1
+
+    def compact(self):
+        """
+        Renumbers the nodes to the indices 0..|V|-1 and drops all the tombstones, in O(|V| + |E|).
+        It runs automatically when more nodes were removed than there are left
+        @return:
+        """
+        with self.lock.write():
+            alive = sorted(self.index.values())
+            remap = array("i", [-1]) * len(self.ids)
+            for new, old in enumerate(alive):
+                remap[old] = new
+
+            def rebuild(nodes: list, weights: list) -> (list, list):
+                new_nodes = []
+                new_weights = []
+                for old in alive:
+                    keep = [k for k, other in enumerate(nodes[old]) if other >= 0]
+                    new_nodes.append(array("i", (remap[nodes[old][k]] for k in keep)))
+                    new_weights.append(array("d", (weights[old][k] for k in keep)))
+                return new_nodes, new_weights
+
+            self.out_nodes, self.out_weights = rebuild(self.out_nodes, self.out_weights)
+            self.in_nodes, self.in_weights = rebuild(self.in_nodes, self.in_weights)
+            self.out_slots = [self.map_slots(nodes) for nodes in self.out_nodes]
+            self.in_slots = [self.map_slots(nodes) for nodes in self.in_nodes]
+            self.ids = array("q", (self.ids[old] for old in alive))
+            self.pos = array("d", (self.pos[old * 3 + c] for old in alive for c in range(0, 3)))
+            self.pos_generated = bytearray(self.pos_generated[old] for old in alive)
+            self.out_dead = array("i", bytes(4 * len(alive)))
+            self.in_dead = array("i", bytes(4 * len(alive)))
+            self.index = {self.ids[new]: new for new in range(0, len(alive))}
+            self.removed = 0
+
+    def __eq__(self, other):
+        if other is None or not isinstance(other, DiGraph):
+            return False
+        nodes = self.get_all_v()
+        other_nodes = other.get_all_v()
+        if nodes.keys() != other_nodes.keys():
+            return False
+        return all(self.all_out_edges_of_node(key).keys() == other.all_out_edges_of_node(key).keys()
+                   for key in nodes)
+
+    def __repr__(self):
+        return f"ArrayGraph: |V| = {len(self.index)}, |E| = {self.num_of_edges}"
@@ -0,0 +1,173 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from src.GraphAlgo import GraphAlgo
+
+MAX_WORKERS = 4
+MAX_PENDING = 64
+
+
+class AsyncGraphAlgo:
+    """
+    This class represents an asyncio facade of GraphAlgo: every query runs on a bounded thread pool,
+    so the event loop is never blocked, and the queries of many threads share the graph through its read lock.
+    At most max_pending queries are admitted at a time, the next ones wait for a free slot (backpressure).
+    Identical queries on the same version of the graph are coalesced: they wait for one shared computation,
+    and share its result, so it must not be changed.
+    A query can be cancelled or given a timeout, the computation is cancelled once nobody waits for it,
+    a computation that already started runs to the end in its thread but its result is dropped.
+    """
+
+    def __init__(self, algo: GraphAlgo, max_workers: int = MAX_WORKERS, max_pending: int = MAX_PENDING):
+        self.algo = algo
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="graph-query")
+        self.slots = asyncio.Semaphore(max_pending)
+        self.in_flight = {}
+        self.coalesced = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Shuts down the thread pool, the queries that already started are completed
+        @return:
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, name: str, *args, timeout: float = None, **kwargs):
+        """
+        Runs a query method of GraphAlgo on the thread pool
+        @param name: The name of the method
+        @param args: The arguments of the method
+        @param timeout: The deadline of the query in seconds (including the wait for a slot), None for no deadline
+        @param kwargs: The keyword arguments of the method
+        @return: The result of the method
+
+        Notes:
+        Raises asyncio.TimeoutError if the deadline passed, and the errors of the method itself
+        """
+        key = (name, args, tuple(sorted(kwargs.items())), self.algo.get_graph().get_mc())
+        try:
+            hash(key)
+        except TypeError:
+            # unhashable arguments, the query is not coalesced
+            key = None
+        entry = self.in_flight.get(key) if key is not None else None
+        if entry is None:
+            task = asyncio.get_running_loop().create_task(self.execute(getattr(self.algo, name), args, kwargs))
+            entry = [task, 0]
+            if key is not None:
+                self.in_flight[key] = entry
+                task.add_done_callback(lambda done: self.forget(key, entry))
+        else:
+            self.coalesced += 1
+        entry[1] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(entry[0]), timeout)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[0].done():
+                if key is not None and self.in_flight.get(key) is entry:
+                    del self.in_flight[key]
+                entry[0].cancel()
+
+    def forget(self, key: tuple, entry: list):
+        """
+        Removes a computation from the in flight queries, if a newer one was not stored under its key
+        @param key: The key of the query
+        @param entry: The [task, waiters] entry of the computation
+        @return:
+        """
+        if self.in_flight.get(key) is entry:
+            del self.in_flight[key]
+
+    async def execute(self, method, args: tuple, kwargs: dict):
+        """
+        Waits for a free slot and runs the method on the thread pool,
+        the slot is released when the thread is done, even if the query was cancelled
+        @param method: The method to run
+        @param args: The arguments of the method
+        @param kwargs: The keyword arguments of the method
+        @return: The result of the method
+        """
+        await self.slots.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.executor.submit(method, *args, **kwargs)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda done: loop.call_soon_threadsafe(self.slots.release))
+        return await asyncio.wrap_future(future)
+
+    async def shortest_path(self, id1: int, id2: int, timeout: float = None, **kwargs) -> (float, list):
+        """
+        Returns the shortest path from node id1 to node id2 (see GraphAlgo.shortest_path)
+        @param id1: The start node id
+        @param id2: The end node id
+        @param timeout: The deadline of the query in seconds
+        @param kwargs: The options of GraphAlgo.shortest_path (method, heuristic, weight_per_distance)
+        @return: The distance of the path, a list of the nodes ids that the path goes through
+        """
+        return await self.run("shortest_path", id1, id2, timeout=timeout, **kwargs)
+
+    async def shortest_path_tree(self, src: int, timeout: float = None):
+        """
+        Returns the shortest paths from src to every node it reaches (see GraphAlgo.shortest_path_tree)
+        @param src: The start node id
+        @param timeout: The deadline of the query in seconds
+        @return: The shortest path tree of src
+        """
+        return await self.run("shortest_path_tree", src, timeout=timeout)
+
+    async def shortest_paths_to_many(self, src: int, targets, timeout: float = None) -> dict:
+        """
+        Returns the shortest paths from src to each of the targets (see GraphAlgo.shortest_paths_to_many)
+        @param src: The start node id
+        @param targets: The end node ids
+        @param timeout: The deadline of the query in seconds
+        @return: A dict of target -> (distance, path)
+        """
+        return await self.run("shortest_paths_to_many", src, frozenset(targets), timeout=timeout)
+
+    async def nearest_of(self, src: int, candidates, timeout: float = None) -> (float, list):
+        """
+        Returns the shortest path from src to the closest of the candidates (see GraphAlgo.nearest_of)
+        @param src: The start node id
+        @param candidates: The end node ids
+        @param timeout: The deadline of the query in seconds
+        @return: The distance of the path, a list of the nodes ids that the path goes through
+        """
+        return await self.run("nearest_of", src, frozenset(candidates), timeout=timeout)
+
+    async def connected_component(self, id1: int, timeout: float = None) -> list:
+        """
+        Finds the SCC that node id1 is a part of (see GraphAlgo.connected_component)
+        @param id1: The node id
+        @param timeout: The deadline of the query in seconds
+        @return: The list of nodes in the SCC
+        """
+        return await self.run("connected_component", id1, timeout=timeout)
+
+    async def connected_components(self, timeout: float = None) -> list:
+        """
+        Finds all the SCCs in the graph (see GraphAlgo.connected_components)
+        @param timeout: The deadline of the query in seconds
+        @return: The list all SCC
+        """
+        return await self.run("connected_components", timeout=timeout)
+
+    async def component_id(self, id1: int, timeout: float = None):
+        """
+        Returns the id of the SCC that node id1 is a part of (see GraphAlgo.component_id)
+        @param id1: The node id
+        @param timeout: The deadline of the query in seconds
+        @return: The id of the SCC, None if id1 is not in the graph
+        """
+        return await self.run("component_id", id1, timeout=timeout)
+
+    def __repr__(self):
+        return f"AsyncGraphAlgo: in flight = {len(self.in_flight)}, coalesced = {self.coalesced}"
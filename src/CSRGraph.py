@@ -0,0 +1,275 @@
+from collections.abc import Mapping
+import numpy as np
+from src.GraphInterface import GraphInterface
+
+
+class CSRNode:
+    """This class represents a read-only view of a vertex in a CSRGraph."""
+
+    __slots__ = ("key", "pos")
+
+    def __init__(self, key: int, pos: tuple = None):
+        self.key = key
+        self.pos = pos
+
+    def get_key(self) -> int:
+        """
+        return the ID of the node
+        :return: The ID of the node
+        """
+        return self.key
+
+    def get_pos(self):
+        """
+        Returns the position of the node
+        :return: The position of the node, None if the node has no position
+        """
+        return self.pos
+
+    def __repr__(self):
+        return repr((self.key, self.pos))
+
+
+class CSRNodes(Mapping):
+    """This class represents the (node_id, node_data) dictionary of a CSRGraph, the views are created on demand."""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, node_id: int) -> CSRNode:
+        node = self.graph.get_node(node_id)
+        if node is None:
+            raise KeyError(node_id)
+        return node
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.graph.index
+
+    def __iter__(self):
+        return iter(self.graph.ids.tolist())
+
+    def __len__(self) -> int:
+        return len(self.graph.ids)
+
+
+class CSRGraph(GraphInterface):
+    """
+    This class represents a read-only compressed sparse row (CSR) snapshot of a directed weighted graph.
+    The node ids are remapped to the dense indices 0..n-1, the out-edges of the node at index i are
+    indices[indptr[i]:indptr[i + 1]] with the matching weights, and the in-edges are kept the same way.
+    """
+
+    def __init__(self, ids, pos, indptr, indices, weights, in_indptr, in_indices, in_weights, mc: int = 0):
+        self.ids = ids
+        self.pos = pos
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.in_indptr = in_indptr
+        self.in_indices = in_indices
+        self.in_weights = in_weights
+        self.mc = mc
+        self._index = None
+        self._views = None
+
+    @classmethod
+    def from_graph(cls, graph: GraphInterface):
+        """
+        Builds a CSR snapshot of the given graph
+        @param graph: The graph to snapshot
+        @return: The CSR snapshot of the graph
+        """
+        keys = list(graph.get_all_v().keys())
+        index = {key: i for i, key in enumerate(keys)}
+        n = len(keys)
+        pos = np.full((n, 3), np.nan)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indices = []
+        weights = []
+        for i, key in enumerate(keys):
+            node_pos = getattr(graph.get_node(key), "pos", None)
+            if node_pos is not None:
+                pos[i] = [float(p) for p in node_pos]
+            out_edges = graph.all_out_edges_of_node(key)
+            for dest, w in out_edges.items():
+                indices.append(index[dest])
+                weights.append(w)
+            indptr[i + 1] = indptr[i] + len(out_edges)
+        ids = np.array(keys, dtype=np.int64)
+        indices = np.array(indices, dtype=np.int64)
+        weights = np.array(weights, dtype=np.float64)
+        in_indptr, in_indices, in_weights = cls.transpose(indptr, indices, weights)
+        snapshot = cls(ids, pos, indptr, indices, weights, in_indptr, in_indices, in_weights, graph.get_mc())
+        snapshot._index = index
+        return snapshot
+
+    @staticmethod
+    def transpose(indptr, indices, weights):
+        """
+        Returns the CSR arrays of the transposed graph
+        @param indptr: The row pointers
+        @param indices: The column indices
+        @param weights: The weights of the edges
+        @return: The row pointers, the column indices and the weights of the transposed graph
+        """
+        n = len(indptr) - 1
+        sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+        order = np.argsort(indices, kind="stable")
+        t_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=n), out=t_indptr[1:])
+        return t_indptr, sources[order], weights[order]
+
+    def reversed(self):
+        """
+        Returns the transposed snapshot, it shares the arrays of this snapshot (the in-edges become the out-edges)
+        @return: The transposed snapshot
+        """
+        snapshot = CSRGraph(self.ids, self.pos, self.in_indptr, self.in_indices, self.in_weights,
+                            self.indptr, self.indices, self.weights, self.mc)
+        snapshot._index = self._index
+        return snapshot
+
+    @property
+    def index(self) -> dict:
+        """
+        Returns the mapping of node id -> dense index
+        @return: The mapping of node id -> dense index
+        """
+        if self._index is None:
+            self._index = {key: i for i, key in enumerate(self.ids.tolist())}
+        return self._index
+
+    def views(self) -> tuple:
+        """
+        Returns memoryviews of the out-edge arrays and of the ids, the traversals of GraphAlgo read the slices
+        of a node from them, which is much cheaper than slicing the numpy arrays.
+        The arrays are not copied unless they are not in the native byte order (a snapshot loaded on a big-endian machine)
+        @return: The memoryviews of indptr, indices, weights and ids
+        """
+        if self._views is None:
+            views = []
+            for array in (self.indptr, self.indices, self.weights, self.ids):
+                if not array.dtype.isnative:
+                    array = array.astype(array.dtype.newbyteorder("="))
+                array = np.ascontiguousarray(array)
+                # the arrays of a loaded snapshot have an explicit byte order, which memoryview does not index
+                views.append(memoryview(array).cast("B").cast(array.dtype.char))
+            self._views = tuple(views)
+        return self._views
+
+    def index_of(self, node_id: int) -> int:
+        """
+        Returns the dense index of the node
+        @param node_id: The node ID
+        @return: The dense index of the node, None if the node does not exist
+        """
+        return self.index.get(node_id)
+
+    def get_node(self, node_id: int) -> CSRNode:
+        """
+        Returns a view of the node
+        @param node_id: The node ID
+        @return: The view of the node, None if the node does not exist
+        """
+        i = self.index.get(node_id)
+        if i is None:
+            return None
+        pos = None
+        if not np.isnan(self.pos[i][0]):
+            pos = tuple(self.pos[i].tolist())
+        return CSRNode(node_id, pos)
+
+    def get_edge(self, id1: int, id2: int) -> float:
+        """
+        Returns the weight of the edge between id1 to id2
+        @param id1:
+        @param id2:
+        @return: The weight of the edge, -1 if there is no such edge
+        """
+        return self.all_out_edges_of_node(id1).get(id2, -1) if id1 in self.index else -1
+
+    def has_edge(self, id1: int, id2: int) -> bool:
+        """
+        Returns if there is an edge between id1 to id2
+        @param id1:
+        @param id2:
+        @return: True if there is an edge False if not
+        """
+        return self.get_edge(id1, id2) != -1
+
+    def v_size(self) -> int:
+        """
+        Returns the number of vertices in this graph
+        @return: The number of vertices in this graph
+        """
+        return len(self.ids)
+
+    def e_size(self) -> int:
+        """
+        Returns the number of edges in this graph
+        @return: The number of edges in this graph
+        """
+        return len(self.indices)
+
+    def get_all_v(self) -> dict:
+        """
+        return a dictionary of all the nodes in the Graph, each node is represented using a pair
+        (node_id, node_data)
+        """
+        return CSRNodes(self)
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """
+        return a dictionary of all the nodes connected to (into) node_id ,
+        each node is represented using a pair (other_node_id, weight)
+        """
+        i = self.index[id1]
+        start, end = self.in_indptr[i], self.in_indptr[i + 1]
+        return dict(zip(self.ids[self.in_indices[start:end]].tolist(), self.in_weights[start:end].tolist()))
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """
+        return a dictionary of all the nodes connected from node_id , each node is represented using a pair
+        (other_node_id, weight)
+        """
+        i = self.index[id1]
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return dict(zip(self.ids[self.indices[start:end]].tolist(), self.weights[start:end].tolist()))
+
+    def get_mc(self) -> int:
+        """
+        Returns the version of the graph this snapshot was built from
+        @return: The version of the graph this snapshot was built from
+        """
+        return self.mc
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """
+        The snapshot is read-only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        """
+        The snapshot is read-only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        The snapshot is read-only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """
+        The snapshot is read-only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def __repr__(self):
+        return f"CSRGraph: |V| = {self.v_size()}, |E| = {self.e_size()}, mc = {self.mc}"
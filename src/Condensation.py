@@ -0,0 +1,181 @@
+import random
+from array import array
+from src.StronglyConnected import tarjan_scc
+
+# the number of random DFS interval labels of every component
+LABELS = 3
+
+
+class Condensation:
+    """
+    This class represents the condensation of a directed graph: the DAG of its SCCs, with a reachability index.
+    The SCCs are numbered in topological order, so every edge of the DAG goes from a lower to a higher number
+    and a component never reaches a lower one. On top of this pruning every component c has LABELS interval
+    labels [low, post] from random DFS traversals of the DAG (GRAIL): post is the post-order rank of c and low
+    is the smallest one it reaches, so if c reaches d the interval of d is inside the interval of c.
+    The ranks [start, post] of the descendants of c in the DFS tree, where start is the first rank after c was
+    entered, prove the positive answers that follow the tree.
+    A query the labels do not answer is answered with a DFS that only enters the components that may reach.
+    The labels take O(LABELS * |SCC|) and are built in O(LABELS * (|SCC| + |DAG edges|)).
+    More info:
+    https://en.wikipedia.org/wiki/Strongly_connected_component#Definitions
+    """
+
+    def __init__(self, components: list, component_of: dict, successors: list, mc: int = 0):
+        self.components = components
+        self.component_of = component_of
+        self.successors = successors
+        self.mc = mc
+        self.lows = []
+        self.starts = []
+        self.posts = []
+        rnd = random.Random(len(components))
+        for label in range(0, LABELS):
+            self.label(rnd)
+
+    def label(self, rnd: random.Random):
+        """
+        Adds the interval labels of one DFS of the DAG, from its sources and along the edges in random order
+        @param rnd: The random generator of the orders
+        @return:
+        """
+        successors = self.successors
+        lows = array("i", bytes(4 * len(successors)))
+        starts = array("i", bytes(4 * len(successors)))
+        posts = array("i", bytes(4 * len(successors)))
+        visited = bytearray(len(successors))
+        for targets in successors:
+            for s in targets:
+                visited[s] = 1
+        sources = [c for c in range(0, len(successors)) if not visited[c]]
+        rnd.shuffle(sources)
+        visited = bytearray(len(successors))
+        rank = 0
+        for source in sources:
+            visited[source] = 1
+            starts[source] = rank
+            stack = [(source, iter(rnd.sample(successors[source], len(successors[source]))))]
+            while stack:
+                c, targets = stack[-1]
+                for s in targets:
+                    if not visited[s]:
+                        visited[s] = 1
+                        starts[s] = rank
+                        stack.append((s, iter(rnd.sample(successors[s], len(successors[s])))))
+                        break
+                else:
+                    # the successors in a DAG are all finished
+                    stack.pop()
+                    low = rank
+                    for s in successors[c]:
+                        if lows[s] < low:
+                            low = lows[s]
+                    lows[c] = low
+                    posts[c] = rank
+                    rank += 1
+        self.lows.append(lows)
+        self.starts.append(starts)
+        self.posts.append(posts)
+
+    def may_reach(self, c1: int, c2: int) -> bool:
+        """
+        Returns False if the labels prove that component c1 does not reach component c2
+        @param c1: The start component
+        @param c2: The end component
+        @return: False if c1 does not reach c2, True if it may
+        """
+        if c1 > c2:
+            return False
+        for lows, posts in zip(self.lows, self.posts):
+            if lows[c2] < lows[c1] or posts[c2] > posts[c1]:
+                return False
+        return True
+
+    def tree_reach(self, c1: int, c2: int) -> bool:
+        """
+        Returns True if the labels prove that component c1 reaches component c2, along one of the DFS trees
+        @param c1: The start component
+        @param c2: The end component
+        @return: True if c1 reaches c2, False if it is not proved
+        """
+        for starts, posts in zip(self.starts, self.posts):
+            if starts[c1] <= posts[c2] <= posts[c1]:
+                return True
+        return False
+
+    @classmethod
+    def build(cls, graph, components: list = None):
+        """
+        Builds the condensation of the graph in O(|V| + |E|) plus the labels, O(LABELS * (|SCC| + |DAG edges|))
+        @param graph: The graph
+        @param components: The SCCs of the graph in topological order, by default they are computed with tarjan_scc
+        @return: The condensation of the graph
+        """
+        if components is None:
+            components = tarjan_scc(graph.get_all_v().keys(), graph.all_out_edges_of_node)
+        component_of = {node_id: c for c, component in enumerate(components) for node_id in component}
+        successors = []
+        for c, component in enumerate(components):
+            targets = set()
+            for node_id in component:
+                for dest in graph.all_out_edges_of_node(node_id):
+                    target = component_of[dest]
+                    if target != c:
+                        targets.add(target)
+            successors.append(sorted(targets))
+        return cls(components, component_of, successors, graph.get_mc())
+
+    def get_mc(self) -> int:
+        """
+        Returns the version of the graph the condensation was built on
+        @return: The version of the graph
+        """
+        return self.mc
+
+    def component(self, node_id: int):
+        """
+        Returns the number of the SCC of a node, its topological position in the DAG
+        @param node_id: The node id
+        @return: The number of the SCC, None if the node is not in the graph
+        """
+        return self.component_of.get(node_id)
+
+    def dag_edges(self) -> list:
+        """
+        Returns the edges of the DAG
+        @return: A list of (component, component) pairs
+        """
+        return [(c, s) for c, targets in enumerate(self.successors) for s in targets]
+
+    def can_reach(self, id1: int, id2: int) -> bool:
+        """
+        Returns if there is a path from node id1 to node id2
+        @param id1: The start node id
+        @param id2: The end node id
+        @return: True if id2 is reachable from id1, False o.w. or if one of them is not in the graph
+        """
+        c1 = self.component_of.get(id1)
+        c2 = self.component_of.get(id2)
+        if c1 is None or c2 is None or not self.may_reach(c1, c2):
+            return False
+        if c1 == c2 or self.tree_reach(c1, c2):
+            return True
+        stack = [c1]
+        seen = {c1}
+        while stack:
+            for s in self.successors[stack.pop()]:
+                # the successors are sorted, the ones after c2 can not reach it
+                if s >= c2:
+                    if s == c2:
+                        return True
+                    break
+                if s not in seen and self.may_reach(s, c2):
+                    if self.tree_reach(s, c2):
+                        return True
+                    seen.add(s)
+                    stack.append(s)
+        return False
+
+    def __repr__(self):
+        return f"Condensation: |SCC| = {len(self.components)}, |DAG edges| = {sum(map(len, self.successors))}, " \
+               f"mc = {self.mc}"
@@ -0,0 +1,241 @@
+import json
+from heapq import heapify, heappop, heappush
+from src.GraphBinary import edges_checksum
+
+WITNESS_LIMIT = 500
+
+
+class ContractionHierarchy:
+    """
+    This class represents a contraction hierarchy (CH) of a directed weighted graph.
+    The nodes are contracted one by one in order of importance, and a shortcut edge u -> w is added
+    whenever the path u -> v -> w through the contracted node v is the only shortest path between u and w.
+    Every edge is then stored at its lower ranked end: up[v] holds the edges v -> w and down[v] holds the edges
+    u -> v to higher ranked nodes, so a query is a bidirectional Dijkstra that only goes up the hierarchy.
+    middle[(u, w)] is the contracted node of the shortcut u -> w, which is used to unpack the full path.
+    More info:
+    https://en.wikipedia.org/wiki/Contraction_hierarchies
+    """
+
+    def __init__(self, rank: dict, up: dict, down: dict, middle: dict, mc: int = 0, checksum: int = None):
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.middle = middle
+        self.mc = mc
+        # the edges_checksum of the graph, set when the hierarchy is built, it lets a loaded hierarchy be checked
+        self.checksum = checksum
+
+    @classmethod
+    def build(cls, graph, witness_limit: int = WITNESS_LIMIT):
+        """
+        Contracts all the nodes of the graph, ordered by edge difference (shortcuts added - edges removed)
+        plus the number of contracted neighbors, with lazy updates of the priorities
+        @param graph: The graph (a DiGraph or its CSR snapshot)
+        @param witness_limit: The maximum number of nodes settled by each witness search,
+        when it is reached the shortcut is added, which is always safe
+        @return: The contraction hierarchy of the graph
+        """
+        out_edges = {key: dict(graph.all_out_edges_of_node(key)) for key in graph.get_all_v().keys()}
+        in_edges = {key: dict(graph.all_in_edges_of_node(key)) for key in out_edges}
+        hierarchy = cls({}, {}, {}, {}, graph.get_mc(), edges_checksum(graph))
+        contracted_neighbors = dict.fromkeys(out_edges, 0)
+
+        def priority(node_id: int) -> int:
+            shortcuts = hierarchy.shortcuts(node_id, out_edges, in_edges, witness_limit)
+            degree = len(out_edges[node_id]) + len(in_edges[node_id])
+            return len(shortcuts) - degree + contracted_neighbors[node_id]
+
+        heap = [(priority(key), key) for key in out_edges]
+        heapify(heap)
+        while heap:
+            node_id = heappop(heap)[1]
+            current = priority(node_id)
+            if heap and current > heap[0][0]:
+                heappush(heap, (current, node_id))
+                continue
+            for src, dest, w in hierarchy.shortcuts(node_id, out_edges, in_edges, witness_limit):
+                old = out_edges[src].get(dest)
+                if old is None or w < old:
+                    out_edges[src][dest] = w
+                    in_edges[dest][src] = w
+                    hierarchy.middle[(src, dest)] = node_id
+            hierarchy.rank[node_id] = len(hierarchy.rank)
+            hierarchy.up[node_id] = out_edges.pop(node_id)
+            hierarchy.down[node_id] = in_edges.pop(node_id)
+            for dest in hierarchy.up[node_id]:
+                del in_edges[dest][node_id]
+                contracted_neighbors[dest] += 1
+            for src in hierarchy.down[node_id]:
+                del out_edges[src][node_id]
+                contracted_neighbors[src] += 1
+        return hierarchy
+
+    @staticmethod
+    def shortcuts(node_id: int, out_edges: dict, in_edges: dict, witness_limit: int) -> list:
+        """
+        Returns the shortcuts needed to contract node_id from the remaining graph
+        @param node_id: The node to contract
+        @param out_edges: The out-edges of the remaining graph
+        @param in_edges: The in-edges of the remaining graph
+        @param witness_limit: The maximum number of nodes settled by each witness search
+        @return: A list of (src, dest, weight) shortcuts
+        """
+        shortcuts = []
+        outgoing = out_edges[node_id]
+        if not outgoing:
+            return shortcuts
+        max_out = max(outgoing.values())
+        for src, w_in in in_edges[node_id].items():
+            limit = w_in + max_out
+            dist = {src: 0}
+            settled = 0
+            heap = [(0, src)]
+            while heap and settled < witness_limit:
+                curr_dist, current = heappop(heap)
+                if curr_dist > dist[current]:
+                    continue
+                if curr_dist > limit:
+                    break
+                settled += 1
+                for neighbor, w in out_edges[current].items():
+                    if neighbor == node_id:
+                        continue
+                    new_dist = curr_dist + w
+                    if new_dist < dist.get(neighbor, float("inf")):
+                        dist[neighbor] = new_dist
+                        heappush(heap, (new_dist, neighbor))
+            for dest, w_out in outgoing.items():
+                if dest != src and dist.get(dest, float("inf")) > w_in + w_out:
+                    shortcuts.append((src, dest, w_in + w_out))
+        return shortcuts
+
+    def get_mc(self) -> int:
+        """
+        Returns the version of the graph the hierarchy was built on
+        @return: The version of the graph
+        """
+        return self.mc
+
+    def matches(self, graph) -> bool:
+        """
+        Returns if the hierarchy was built on the current version of the graph, this checks every node and edge
+        (see edges_checksum) so it is meant for a hierarchy that was loaded from a file
+        @param graph: The graph
+        @return: True if the hierarchy can be used with the graph, False if it has to be rebuilt
+        """
+        nodes = graph.get_all_v()
+        return self.mc == graph.get_mc() and len(self.rank) == len(nodes) and \
+            all(nodes.__contains__(key) for key in self.rank) and \
+            self.checksum is not None and self.checksum == edges_checksum(graph)
+
+    def query(self, id1: int, id2: int) -> (float, list):
+        """
+        Returns the shortest path from node id1 to node id2 with a bidirectional search that only uses
+        edges to higher ranked nodes, the shortcuts of the path are unpacked into the original edges
+        @param id1: The start node id
+        @param id2: The end node id
+        @return: The distance of the path, a list of the nodes ids that the path goes through
+        """
+        if id1 not in self.rank or id2 not in self.rank:
+            return float("inf"), []
+        if id1 == id2:
+            return 0, [id1]
+        edges = (self.up, self.down)
+        dist = ({id1: 0}, {id2: 0})
+        parent = ({id1: None}, {id2: None})
+        heaps = ([(0, id1)], [(0, id2)])
+        best = float("inf")
+        meet = None
+        while heaps[0] or heaps[1]:
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            curr_dist, current = heappop(heaps[side])
+            if curr_dist >= best:
+                heaps[side].clear()
+                continue
+            if curr_dist > dist[side][current]:
+                continue
+            other = dist[1 - side].get(current)
+            if other is not None and curr_dist + other < best:
+                best = curr_dist + other
+                meet = current
+            for neighbor, w in edges[side][current].items():
+                new_dist = curr_dist + w
+                if new_dist < dist[side].get(neighbor, float("inf")):
+                    dist[side][neighbor] = new_dist
+                    parent[side][neighbor] = current
+                    heappush(heaps[side], (new_dist, neighbor))
+        if meet is None:
+            return float("inf"), []
+        nodes = []
+        node_id = meet
+        while node_id is not None:
+            nodes.append(node_id)
+            node_id = parent[0][node_id]
+        nodes.reverse()
+        node_id = parent[1][meet]
+        while node_id is not None:
+            nodes.append(node_id)
+            node_id = parent[1][node_id]
+        path_list = [id1]
+        for i in range(0, len(nodes) - 1):
+            path_list.extend(self.unpack(nodes[i], nodes[i + 1]))
+        return best, path_list
+
+    def unpack(self, src: int, dest: int) -> list:
+        """
+        Replaces the edge src -> dest by the original edges it stands for
+        @param src: The start node of the edge
+        @param dest: The end node of the edge
+        @return: The nodes of the original path after src, ending with dest
+        """
+        path_list = []
+        stack = [(src, dest)]
+        while stack:
+            src, dest = stack.pop()
+            via = self.middle.get((src, dest))
+            if via is None:
+                path_list.append(dest)
+            else:
+                stack.append((via, dest))
+                stack.append((src, via))
+        return path_list
+
+    def save(self, file_name: str):
+        """
+        Saves the hierarchy in JSON format to a file
+        @param file_name: The path to the out file
+        @return:
+        """
+        ranked = sorted(self.rank, key=self.rank.get)
+        data = {"mc": self.mc,
+                "checksum": self.checksum,
+                "Nodes": ranked,
+                "Up": [[src, dest, w] for src in ranked for dest, w in self.up[src].items()],
+                "Down": [[dest, src, w] for dest in ranked for src, w in self.down[dest].items()],
+                "Middle": [[src, dest, via] for (src, dest), via in self.middle.items()]}
+        with open(file_name, "w") as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, file_name: str):
+        """
+        Loads a hierarchy saved by save
+        @param file_name: The path to the hierarchy file
+        @return: The contraction hierarchy
+        """
+        with open(file_name, "r") as file:
+            data = json.load(file)
+        ranked = data["Nodes"]
+        rank = {key: i for i, key in enumerate(ranked)}
+        up = {key: {} for key in ranked}
+        down = {key: {} for key in ranked}
+        for src, dest, w in data["Up"]:
+            up[src][dest] = w
+        for dest, src, w in data["Down"]:
+            down[dest][src] = w
+        middle = {(src, dest): via for src, dest, via in data["Middle"]}
+        return cls(rank, up, down, middle, data["mc"], data["checksum"])
+
+    def __repr__(self):
+        return f"ContractionHierarchy: |V| = {len(self.rank)}, |shortcuts| = {len(self.middle)}, mc = {self.mc}"
@@ -1,17 +1,25 @@
 import json
 import random
+from collections import namedtuple
+from contextlib import contextmanager
+from src.CSRGraph import CSRGraph
 from src.GraphInterface import GraphInterface
+from src.RWLock import RWLock
 
 
 class Node:
-    """This abstract class represents a vertex."""
+    """
+    This abstract class represents a vertex.
+    The nodes hold only their key, position and edges in slots, the algorithms keep their state per call,
+    for a compact columnar copy of a large graph see DiGraph.freeze
+    """
+
+    __slots__ = ("key", "pos", "pos_generated", "hashIn", "hashOut")
 
     def __init__(self, key: int, pos: tuple = None):
         self.key = key
         self.pos = pos
-        self.weight = 0
-        self.info = ""
-        self.parent = None
+        self.pos_generated = False
         self.hashIn = {}
         self.hashOut = {}
 
@@ -32,53 +40,9 @@ class Node:
             x = random.uniform(32.001, 32.999)
             y = random.uniform(35.001, 35.999)
             self.pos = (x, y, 0)
+            self.pos_generated = True
         return self.pos
 
-    def get_weight(self) -> float:
-        """
-        Returns the distance
-        :return: The distance
-        """
-        return self.weight
-
-    def set_weight(self, w: float):
-        """
-        Sets the distance
-        :param w:
-        :return:
-        """
-        self.weight = w
-
-    def get_info(self) -> str:
-        """
-        Returns the info of the node
-        :return: The info of the node
-        """
-        return self.info
-
-    def set_info(self, s: str):
-        """
-        Sets the info of the node
-        :param s:
-        :return:
-        """
-        self.info = s
-
-    def get_parent(self):
-        """
-        Returns the parent of the node
-        :return: The parent of the node
-        """
-        return self.parent
-
-    def set_parent(self, node_id: int):
-        """
-        Sets the parent of the node
-        :param node_id:
-        :return:
-        """
-        self.parent = node_id
-
     def get_hashIn(self) -> dict:
         """
         Returns the incoming edges list
@@ -93,9 +57,9 @@ class Node:
         :param weight:
         :return: True if the node added successfully False if not
         """
-        if self.key is not node_id:
-            if self.hashIn.get(node_id):
-                if self.hashIn.get(node_id) != weight:
+        if self.key != node_id:
+            if node_id in self.hashIn:
+                if self.hashIn[node_id] != weight:
                     self.hashIn[node_id] = weight
                     return True
             self.hashIn.setdefault(node_id, weight)
@@ -107,7 +71,7 @@ class Node:
         :param node_id:
         :return: True if the node removed successfully False if not
         """
-        if self.hashIn.get(node_id):
+        if node_id in self.hashIn:
             del self.hashIn[node_id]
             return True
         return False
@@ -134,9 +98,9 @@ class Node:
         :param weight:
         :return: True if the node added successfully False if not
         """
-        if self.key is not node_id:
-            if self.hashOut.get(node_id):
-                if self.hashOut.get(node_id) != weight:
+        if self.key != node_id:
+            if node_id in self.hashOut:
+                if self.hashOut[node_id] != weight:
                     self.hashOut[node_id] = weight
                     return True
             self.hashOut.setdefault(node_id, weight)
@@ -148,7 +112,7 @@ class Node:
         :param node_id:
         :return: True if the node removed successfully False if not
         """
-        if self.hashOut.get(node_id):
+        if node_id in self.hashOut:
             del self.hashOut[node_id]
             return True
         return False
@@ -175,17 +139,33 @@ class Node:
     def __repr__(self):
         return repr((self.key, self.pos))
 
-    def __lt__(self, other):
-        return self.weight < other.weight
+
+Mutation = namedtuple("Mutation", ["kind", "id1", "id2", "weight", "mc"])
+Mutation.__doc__ = """
+This class represents a change of a graph, as reported to its observers.
+kind is one of "add_node", "remove_node", "add_edge", "remove_edge" or "batch",
+id2 and weight are None for the node changes, mc is the version of the graph after the change.
+"batch" reports a batch of several operations (see DiGraph.batch), id1, id2 and weight are None:
+its changes were made on versions of the graph that are gone, so the observers have to rebuild their state.
+"""
 
 
 class DiGraph(GraphInterface):
-    """This abstract class represents a directed weighted graph."""
+    """
+    This abstract class represents a directed weighted graph.
+    Every change of the graph holds the write lock (self.lock), the algorithms hold the read lock,
+    so queries from many threads run together and never see a half-done change
+    """
 
     def __init__(self):
         self.nodes = {}
         self.num_of_edges = 0
         self.mc = 0
+        self._frozen = None
+        self._reversed = None
+        self._observers = []
+        self._batch = None
+        self.lock = RWLock()
 
     def get_node(self, node_id: int) -> Node:
         """
@@ -262,6 +242,142 @@ class DiGraph(GraphInterface):
         """
         return self.mc
 
+    def freeze(self) -> CSRGraph:
+        """
+        Returns a read-only CSR snapshot of the graph.
+        The snapshot is cached and rebuilt only after the graph was changed (see get_mc)
+        @return: The CSR snapshot of the graph
+        """
+        with self.lock.read():
+            frozen = self._frozen
+            if frozen is None or frozen.get_mc() != self.mc:
+                frozen = CSRGraph.from_graph(self)
+                self._frozen = frozen
+            return frozen
+
+    def reversed(self):
+        """
+        Returns a read-only view of the transposed graph.
+        The view shares the nodes of this graph, so it is never copied and always up to date
+        @return: The reversed view of the graph
+        """
+        if self._reversed is None:
+            self._reversed = ReversedDiGraph(self)
+        return self._reversed
+
+    def subscribe(self, observer):
+        """
+        Registers an observer that is called with a Mutation after every change of the graph.
+        When a node is removed, the removal of each of its edges is reported before the removal of the node.
+        An error of an observer is printed and does not stop the change nor the other observers,
+        so an observer that fails must not be left half-updated (the observers of this package rebuild then)
+        @param observer: A function of Mutation
+        @return:
+        """
+        with self.lock.write():
+            self._observers.append(observer)
+
+    def unsubscribe(self, observer):
+        """
+        Removes an observer registered with subscribe
+        @param observer: The observer
+        @return:
+        """
+        with self.lock.write():
+            if observer in self._observers:
+                self._observers.remove(observer)
+
+    def notify(self, changes: list):
+        """
+        Reports the changes of one operation to the observers, every observer gets all of them in order
+        @param changes: A list of (kind, id1, id2, weight, node)
+        @return:
+        """
+        if not self._observers:
+            return
+        mutations = [Mutation(kind, id1, id2, weight, self.mc) for kind, id1, id2, weight, node in changes]
+        for observer in list(self._observers):
+            try:
+                for mutation in mutations:
+                    observer(mutation)
+            except Exception as e:
+                print(e)
+
+    def changed(self, changes: list):
+        """
+        Reports the changes of one operation: outside a batch the MC is increased once and the observers are
+        notified, inside a batch the changes are kept until it ends (see batch)
+        @param changes: A list of (kind, id1, id2, weight, node), node is the removed node of "remove_node"
+        @return:
+        """
+        if self._batch is not None:
+            self._batch.append(changes)
+            return
+        self.mc += 1
+        self.notify(changes)
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups changes of the graph into one transaction, in a with block:
+        the MC is increased once and the observers are notified when the block ends,
+        so the caches of the graph are invalidated once for the whole batch.
+        A batch of one operation is reported like the operation, a batch of several operations is reported
+        as one "batch" Mutation, since its changes can not be replayed on the graph they ended in.
+        If the block raises an exception all its changes are rolled back, and if there were any the MC is
+        still increased and a "batch" Mutation is reported, since what was cached inside the block is gone.
+        The write lock is held for the whole block, nested batches are part of the outer one.
+        Queries inside the block may get results that were cached before it
+        @return: A context manager of the graph
+        """
+        with self.lock.write():
+            if self._batch is not None:
+                yield self
+                return
+            self._batch = []
+            try:
+                yield self
+            except BaseException:
+                operations, self._batch = self._batch, None
+                for changes in reversed(operations):
+                    for change in reversed(changes):
+                        self.undo(*change)
+                if operations:
+                    self.mc += 1
+                    self.notify([("batch", None, None, None, None)])
+                raise
+            operations, self._batch = self._batch, None
+            if operations:
+                self.mc += 1
+                if len(operations) == 1:
+                    self.notify(operations[0])
+                else:
+                    self.notify([("batch", None, None, None, None)])
+
+    def undo(self, kind: str, id1: int, id2: int, weight: float, node):
+        """
+        Reverts a change of a batch that is rolled back, the changes are reverted from the last one
+        @param kind: The kind of the change
+        @param id1: The node, or the start node of the edge
+        @param id2: The end node of the edge
+        @param weight: The weight of the edge
+        @param node: The removed node of "remove_node"
+        @return:
+        """
+        if kind == "add_node":
+            del self.nodes[id1]
+        elif kind == "remove_node":
+            # its edges are restored by the remove_edge changes before it
+            self.nodes[id1] = node
+        elif kind == "add_edge":
+            del self.nodes[id1].hashOut[id2]
+            del self.nodes[id2].hashIn[id1]
+            self.num_of_edges -= 1
+        elif kind == "remove_edge":
+            self.nodes[id1].hashOut[id2] = weight
+            self.nodes[id2].hashIn[id1] = weight
+            self.num_of_edges += 1
+
     def add_node(self, node_id: int, pos: tuple = None) -> bool:
         """
         Adds a node to the graph.
@@ -271,34 +387,102 @@ class DiGraph(GraphInterface):
 
         Note: if the node id already exists the node will not be added
         """
-        if not self.nodes.__contains__(node_id):
-            node = Node(node_id, pos)
-            self.nodes[node_id] = node
-            self.mc += 1
+        with self.lock.write():
+            if node_id in self.nodes:
+                return False
+            self.nodes[node_id] = Node(node_id, pos)
+            self.changed([("add_node", node_id, None, None, None)])
             return True
-        return False
+
+    def add_nodes_bulk(self, nodes) -> int:
+        """
+        Adds many nodes to the graph, the MC is increased once for the whole batch.
+        @param nodes: An iterable of (node_id, pos) pairs
+        @return: The number of nodes that were added
+
+        Note: nodes whose id already exists are skipped
+        """
+        with self.lock.write():
+            added = []
+            for node_id, pos in nodes:
+                if node_id not in self.nodes:
+                    self.nodes[node_id] = Node(node_id, pos)
+                    added.append(("add_node", node_id, None, None, None))
+            if added:
+                self.changed(added)
+            return len(added)
+
+    def add_edges_bulk(self, edges) -> int:
+        """
+        Adds many edges to the graph, the MC is increased once for the whole batch.
+        @param edges: An iterable of (id1, id2, weight) triples
+        @return: The number of edges that were added
+
+        Note: edges that already exist, loops and edges with a missing node are skipped
+        """
+        with self.lock.write():
+            nodes = self.nodes
+            added = []
+            for id1, id2, weight in edges:
+                src = nodes.get(id1)
+                dest = nodes.get(id2)
+                if src is None or dest is None or id1 == id2 or id2 in src.hashOut:
+                    continue
+                src.hashOut[id2] = weight
+                dest.hashIn[id1] = weight
+                added.append(("add_edge", id1, id2, weight, None))
+            if added:
+                self.num_of_edges += len(added)
+                self.changed(added)
+            return len(added)
+
+    def remove_edges_bulk(self, edges) -> int:
+        """
+        Removes many edges from the graph, the MC is increased once for the whole batch.
+        @param edges: An iterable of (id1, id2) pairs
+        @return: The number of edges that were removed
+
+        Note: edges that do not exist are skipped
+        """
+        with self.lock.write():
+            nodes = self.nodes
+            removed = []
+            for id1, id2 in edges:
+                src = nodes.get(id1)
+                if src is None or id2 not in src.hashOut:
+                    continue
+                weight = src.hashOut.pop(id2)
+                del nodes[id2].hashIn[id1]
+                removed.append(("remove_edge", id1, id2, weight, None))
+            if removed:
+                self.num_of_edges -= len(removed)
+                self.changed(removed)
+            return len(removed)
 
     def remove_node(self, node_id: int) -> bool:
         """
-        Removes a node from the graph.
+        Removes a node from the graph, in O(degree of the node).
         @param node_id: The node ID
         @return: True if the node was removed successfully, False o.w.
 
         Note: if the node id does not exists the function will do nothing
         """
-        if self.nodes.__contains__(node_id):
-            hash_in = self.get_node(node_id).get_hashIn()
-            hash_out = self.get_node(node_id).get_hashOut()
-            for node in hash_in.keys():
-                self.get_node(node).remove_hashOut(node_id)
-                self.num_of_edges -= 1
-            for node in hash_out.keys():
-                self.get_node(node).remove_hashIn(node_id)
-                self.num_of_edges -= 1
-            self.nodes.pop(node_id)
-            self.mc += 1
+        with self.lock.write():
+            node = self.nodes.pop(node_id, None)
+            if node is None:
+                return False
+            nodes = self.nodes
+            changes = []
+            for src, weight in node.hashIn.items():
+                del nodes[src].hashOut[node_id]
+                changes.append(("remove_edge", src, node_id, weight, None))
+            for dest, weight in node.hashOut.items():
+                del nodes[dest].hashIn[node_id]
+                changes.append(("remove_edge", node_id, dest, weight, None))
+            self.num_of_edges -= len(changes)
+            changes.append(("remove_node", node_id, None, None, node))
+            self.changed(changes)
             return True
-        return False
 
     def add_edge(self, id1: int, id2: int, weight: float) -> bool:
         """
@@ -310,14 +494,16 @@ class DiGraph(GraphInterface):
 
         Note: If the edge already exists or one of the nodes dose not exists the functions will do nothing
         """
-        if self.nodes.__contains__(id1) and self.nodes.__contains__(id2):
-            if not self.has_edge(id1, id2) and id1 != id2:
-                self.get_node(id1).add_hashOut(id2, weight)
-                self.get_node(id2).add_hashIn(id1, weight)
-                self.num_of_edges += 1
-                self.mc += 1
-                return True
-        return False
+        with self.lock.write():
+            src = self.nodes.get(id1)
+            dest = self.nodes.get(id2)
+            if src is None or dest is None or id1 == id2 or id2 in src.hashOut:
+                return False
+            src.hashOut[id2] = weight
+            dest.hashIn[id1] = weight
+            self.num_of_edges += 1
+            self.changed([("add_edge", id1, id2, weight, None)])
+            return True
 
     def remove_edge(self, node_id1: int, node_id2: int) -> bool:
         """
@@ -328,14 +514,7 @@ class DiGraph(GraphInterface):
 
         Note: If such an edge does not exists the function will do nothing
         """
-        if self.nodes.__contains__(node_id1) and self.nodes.__contains__(node_id2):
-            if self.has_edge(node_id1, node_id2):
-                self.get_node(node_id1).remove_hashOut(node_id2)
-                self.get_node(node_id2).remove_hashIn(node_id1)
-                self.num_of_edges -= 1
-                self.mc += 1
-                return True
-        return False
+        return self.remove_edges_bulk([(node_id1, node_id2)]) == 1
 
     def __eq__(self, other):
         if other is None or self.__class__ != other.__class__:
@@ -353,3 +532,119 @@ class DiGraph(GraphInterface):
         graph = "\n".join(_info)
         return graph
 
+
+
+class ReversedDiGraph(GraphInterface):
+    """
+    This class represents a read-only view of a directed weighted graph with all its edges reversed.
+    The out-edges of a node are the in-edges of the same node in the original graph and vice versa.
+    """
+
+    def __init__(self, graph: GraphInterface):
+        self.graph = graph
+
+    def reversed(self) -> GraphInterface:
+        """
+        Returns the original graph
+        @return: The original graph
+        """
+        return self.graph
+
+    def get_node(self, node_id: int):
+        """
+        Returns the node of the original graph
+        @param node_id:
+        @return: The node of the original graph
+        """
+        return self.graph.get_node(node_id)
+
+    def get_edge(self, id1: int, id2: int) -> float:
+        """
+        Returns the weight of the edge between id1 to id2 (the edge between id2 to id1 in the original graph)
+        @param id1:
+        @param id2:
+        @return: The weight of the edge
+        """
+        return self.graph.get_edge(id2, id1)
+
+    def has_edge(self, id1: int, id2: int) -> bool:
+        """
+        Returns if there is an edge between id1 to id2 (an edge between id2 to id1 in the original graph)
+        @param id1:
+        @param id2:
+        @return: True if there is an edge False if not
+        """
+        return self.graph.has_edge(id2, id1)
+
+    def v_size(self) -> int:
+        """
+        Returns the number of vertices in this graph
+        @return: The number of vertices in this graph
+        """
+        return self.graph.v_size()
+
+    def e_size(self) -> int:
+        """
+        Returns the number of edges in this graph
+        @return: The number of edges in this graph
+        """
+        return self.graph.e_size()
+
+    def get_all_v(self) -> dict:
+        """
+        return a dictionary of all the nodes in the Graph, each node is represented using a pair
+        (node_id, node_data)
+        """
+        return self.graph.get_all_v()
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """
+        return a dictionary of all the nodes connected to (into) node_id ,
+        each node is represented using a pair (other_node_id, weight)
+        """
+        return self.graph.all_out_edges_of_node(id1)
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """
+        return a dictionary of all the nodes connected from node_id , each node is represented using a pair
+        (other_node_id, weight)
+        """
+        return self.graph.all_in_edges_of_node(id1)
+
+    def get_mc(self) -> int:
+        """
+        Returns the current version of the original graph
+        @return: The current version of the original graph
+        """
+        return self.graph.get_mc()
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """
+        The view is read-only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        """
+        The view is read-only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        The view is read-only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """
+        The view is read-only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def __repr__(self):
+        return f"Reversed {self.graph!r}"
@@ -0,0 +1,191 @@
+from heapq import heappop, heappush
+from src.GraphInterface import GraphInterface
+from src.ShortestPathTree import ShortestPathTree
+
+
+class DynamicSSSP:
+    """
+    This class maintains the shortest path trees of a set of sources while the graph changes,
+    by observing its mutations (see DiGraph.subscribe), in the style of Ramalingam and Reps:
+    an edge that shortens a path starts a Dijkstra from its end node that only visits the nodes that improve,
+    and removing a tree edge only recomputes the subtree below it, from the in-edges of the rest of the tree.
+    A change of a weight is reported as a removal and an insertion of the edge.
+    More info:
+    Ramalingam and Reps, On the Computational Complexity of Dynamic Graph Problems (1996)
+    """
+
+    def __init__(self, graph: GraphInterface, sources=()):
+        self.graph = graph
+        self.trees = {}
+        self.mc = graph.get_mc()
+        for src in sources:
+            self.add_source(src)
+        graph.subscribe(self.on_mutation)
+
+    def close(self):
+        """
+        Stops observing the graph
+        @return:
+        """
+        self.graph.unsubscribe(self.on_mutation)
+
+    def add_source(self, src: int):
+        """
+        Registers a source and computes its shortest path tree
+        @param src: The source node id
+        @return:
+        """
+        dist = {}
+        parent = {}
+        if self.graph.get_all_v().__contains__(src):
+            dist[src] = 0
+            parent[src] = None
+            self.propagate(dist, parent, [(0, src)])
+        self.trees[src] = (dist, parent)
+
+    def remove_source(self, src: int):
+        """
+        Stops maintaining the tree of a source
+        @param src: The source node id
+        @return:
+        """
+        self.trees.pop(src, None)
+
+    def sources(self) -> list:
+        """
+        Returns the registered sources
+        @return: The list of source node ids
+        """
+        return list(self.trees)
+
+    def rebuild(self):
+        """
+        Recomputes the trees of all the sources from scratch
+        @return:
+        """
+        for src in list(self.trees):
+            self.add_source(src)
+        self.mc = self.graph.get_mc()
+
+    def is_current(self) -> bool:
+        """
+        Returns if every change of the graph was observed
+        @return: True if the trees are up to date, False o.w.
+        """
+        return self.mc == self.graph.get_mc()
+
+    def tree(self, src: int) -> ShortestPathTree:
+        """
+        Returns the shortest path tree of a registered source, it is a live view that follows the changes of the graph
+        @param src: The source node id
+        @return: The shortest path tree, None if src is not registered
+        """
+        if src not in self.trees:
+            return None
+        if not self.is_current():
+            self.rebuild()
+        dist, parent = self.trees[src]
+        return ShortestPathTree(src, dist, parent, self.mc)
+
+    def on_mutation(self, mutation):
+        """
+        Repairs the trees after a change of the graph
+        @param mutation: The change (see DiGraph.Mutation)
+        @return:
+        """
+        if mutation.kind == "batch" or mutation.mc not in (self.mc, self.mc + 1):
+            # some change was not observed, or can not be replayed
+            self.rebuild()
+            return
+        try:
+            for src, (dist, parent) in self.trees.items():
+                if mutation.kind == "add_edge":
+                    self.edge_added(dist, parent, mutation.id1, mutation.id2, mutation.weight)
+                elif mutation.kind == "remove_edge":
+                    self.edge_removed(dist, parent, mutation.id1, mutation.id2)
+                elif mutation.kind == "remove_node" and mutation.id1 == src:
+                    dist.clear()
+                    parent.clear()
+                elif mutation.kind == "add_node" and mutation.id1 == src:
+                    dist[src] = 0
+                    parent[src] = None
+        except BaseException:
+            # the trees may be half-repaired, they are rebuilt on the next change or query
+            self.mc = -1
+            raise
+        self.mc = mutation.mc
+
+    def edge_added(self, dist: dict, parent: dict, id1: int, id2: int, weight: float):
+        """
+        Repairs a tree after the edge id1 -> id2 was added
+        @param dist: The distances of the tree
+        @param parent: The parents of the tree
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @param weight: The weight of the edge
+        @return:
+        """
+        if id1 not in dist:
+            return
+        new_dist = dist[id1] + weight
+        if new_dist < dist.get(id2, float("inf")):
+            dist[id2] = new_dist
+            parent[id2] = id1
+            self.propagate(dist, parent, [(new_dist, id2)])
+
+    def edge_removed(self, dist: dict, parent: dict, id1: int, id2: int):
+        """
+        Repairs a tree after the edge id1 -> id2 was removed, only if it was a tree edge
+        @param dist: The distances of the tree
+        @param parent: The parents of the tree
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @return:
+        """
+        if id2 not in parent or parent[id2] != id1:
+            return
+        nodes = self.graph.get_all_v()
+        affected = [id2]
+        found = {id2}
+        for node_id in affected:
+            if not nodes.__contains__(node_id):
+                continue
+            for child in self.graph.all_out_edges_of_node(node_id):
+                if child not in found and parent.get(child) == node_id:
+                    found.add(child)
+                    affected.append(child)
+        for node_id in affected:
+            del dist[node_id]
+            del parent[node_id]
+        heap = []
+        for node_id in affected:
+            if not nodes.__contains__(node_id):
+                continue
+            for src, w in self.graph.all_in_edges_of_node(node_id).items():
+                if src in dist and dist[src] + w < dist.get(node_id, float("inf")):
+                    dist[node_id] = dist[src] + w
+                    parent[node_id] = src
+            if node_id in dist:
+                heap.append((dist[node_id], node_id))
+        heap.sort()
+        self.propagate(dist, parent, heap)
+
+    def propagate(self, dist: dict, parent: dict, heap: list):
+        """
+        Runs Dijkstra from the nodes in the heap, visiting only the nodes whose distance improves
+        @param dist: The distances of the tree
+        @param parent: The parents of the tree
+        @param heap: A heap of (distance, node id) to start from
+        @return:
+        """
+        out_edges = self.graph.all_out_edges_of_node
+        while heap:
+            curr_dist, current = heappop(heap)
+            if curr_dist > dist.get(current, float("inf")):
+                continue
+            for neighbor, w in out_edges(current).items():
+                new_dist = curr_dist + w
+                if new_dist < dist.get(neighbor, float("inf")):
+                    dist[neighbor] = new_dist
+                    parent[neighbor] = current
+                    heappush(heap, (new_dist, neighbor))
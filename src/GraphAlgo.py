@@ -1,13 +1,53 @@
-import json
 from typing import List
-from queue import PriorityQueue, Queue
+import math
+import os
+import tempfile
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import wraps
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush
 from matplotlib.patches import ConnectionPatch
-from src.DiGraph import DiGraph
+from src.CSRGraph import CSRGraph
+from src.Condensation import Condensation
+from src.ContractionHierarchy import ContractionHierarchy
+from src.DiGraph import DiGraph, ReversedDiGraph
+from src.DynamicSSSP import DynamicSSSP
 from src.GraphAlgoInterface import GraphAlgoInterface
+from src.GraphBinary import load_binary, save_binary
+from src.GraphJson import iter_json_arrays, parse_pos, save_graph_json
 from src.GraphInterface import GraphInterface
+from src.Landmarks import LandmarkIndex
+from src.QueryCache import QUERY_CACHE_SIZE, QueryCache
+from src.Reachability import Reachability
+from src.ShortestPathTree import ShortestPathTree
+from src.StronglyConnected import IncrementalSCC, tarjan_scc
 import matplotlib.pyplot as plt
 import numpy as np
 
+LOAD_BATCH = 10000
+FLOYD_WARSHALL_LIMIT = 200
+TREE_CACHE_SIZE = 16
+LANDMARKS = 8
+
+
+
+def read_locked(method):
+    """
+    Runs a query of GraphAlgo under the read lock of its graph (see DiGraph.lock), if the graph has one
+    @param method: The query method
+    @return: The locked method
+    """
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        lock = getattr(self.graph_algo, "lock", None)
+        if lock is None:
+            return method(self, *args, **kwargs)
+        with lock.read():
+            return method(self, *args, **kwargs)
+
+    return locked
 
 class GraphAlgo(GraphAlgoInterface):
     """This abstract class represents the algorithms of a graph."""
@@ -16,6 +56,29 @@ class GraphAlgo(GraphAlgoInterface):
         if graph is None:
             self.graph = DiGraph()
         self.graph_algo = graph
+        self._scc_graph = None
+        self._scc_mc = -1
+        self._components = []
+        self._component_of = {}
+        self.scc_tracker = None
+        self.sssp_tracker = None
+        self._trees = OrderedDict()
+        self._trees_graph = None
+        self.tree_cache_size = TREE_CACHE_SIZE
+        self._positions = None
+        self._positions_graph = None
+        self._positions_mc = -1
+        self._weight_per_distance = None
+        self.landmarks = None
+        self._landmarks_graph = None
+        self.landmarks_auto_rebuild = True
+        self.hierarchy = None
+        self._hierarchy_graph = None
+        self._cache_lock = threading.RLock()
+        self.query_cache = None
+        self._reachability = None
+        self._condensation = None
+        self._condensation_graph = None
 
     def get_graph(self) -> GraphInterface:
         """
@@ -23,74 +86,135 @@ class GraphAlgo(GraphAlgoInterface):
         """
         return self.graph_algo
 
-    def load_from_json(self, file_name: str) -> bool:
+    def load_from_json(self, file_name: str, graph_class: type = DiGraph) -> bool:
         """
         Loads a graph from a json file.
         @param file_name: The path to the json file
+        @param graph_class: The class of the loaded graph, DiGraph or ArrayDiGraph for the compact storage
         @returns True if the loading was successful, False o.w.
         """
         try:
             with open(file_name, "r") as file:
-                graph = DiGraph()
-                load = json.load(file)
-                for node in load.get("Nodes"):
-                    key = node.get("id")
-                    pos = None
-                    if node.get("pos") is not None:
-                        node_pos = node.get("pos").split(",")
-                        x = node_pos[0]
-                        y = node_pos[1]
-                        z = node_pos[2]
-                        pos = (x, y, z)
-                    graph.add_node(key, pos)
-                for edge in load.get("Edges"):
-                    graph.add_edge(edge.get("src"), edge.get("dest"), edge.get("w"))
+                graph = graph_class()
+                nodes = []
+                edges = []
+                nodes_seen = False
+                for key, item in iter_json_arrays(file):
+                    if key == "Nodes":
+                        nodes_seen = True
+                        nodes.append((item.get("id"), parse_pos(item.get("pos"))))
+                        if len(nodes) >= LOAD_BATCH:
+                            graph.add_nodes_bulk(nodes)
+                            nodes.clear()
+                    elif key == "Edges":
+                        edges.append((item.get("src"), item.get("dest"), item.get("w")))
+                        # the edges can be added only after their nodes, so they are kept if the nodes come later
+                        if nodes_seen and len(edges) >= LOAD_BATCH:
+                            graph.add_nodes_bulk(nodes)
+                            nodes.clear()
+                            graph.add_edges_bulk(edges)
+                            edges.clear()
+                graph.add_nodes_bulk(nodes)
+                graph.add_edges_bulk(edges)
             self.graph_algo = graph
             return True
         except IOError as e:
             print(e)
             return False
 
-    def save_to_json(self, file_name: str) -> bool:
+    @read_locked
+    def save_to_json(self, file_name: str, atomic: bool = False) -> bool:
         """
         Saves the graph in JSON format to a file
         @param file_name: The path to the out file
+        @param atomic: If True, the graph is written to a temporary file that is renamed to file_name when complete
+        @return: True if the save was successful, False o.w.
+        """
+        try:
+            save_graph_json(self.graph_algo, file_name, atomic)
+            return True
+        except IOError as e:
+            print(e)
+            return False
+
+    def load_from_binary(self, file_name: str, mmap: bool = True, verify: bool = False) -> bool:
+        """
+        Loads a graph from a binary file (see save_to_binary).
+        The loaded graph is a read-only CSRGraph, use load_from_json for a graph that can be changed.
+        @param file_name: The path to the binary file
+        @param mmap: If True, the file is memory-mapped instead of being read into memory
+        @param verify: If True, the checksum of the file is checked (see load_binary)
+        @returns True if the loading was successful, False o.w.
+        """
+        try:
+            self.graph_algo = load_binary(file_name, mmap, verify)
+            return True
+        except (IOError, ValueError) as e:
+            print(e)
+            return False
+
+    @read_locked
+    def save_to_binary(self, file_name: str) -> bool:
+        """
+        Saves the graph in a compact binary format that can be memory-mapped by load_from_binary
+        @param file_name: The path to the out file
         @return: True if the save was successful, False o.w.
         """
-        Nodes = []
-        Edges = []
-        for node in self.graph_algo.get_all_v():
-            nodes = {"id": node}
-            Nodes.append(nodes)
-            node_out = self.graph_algo.all_out_edges_of_node(node)
-            edges_keys = self.graph_algo.all_out_edges_of_node(node).keys()
-            for dest in edges_keys:
-                edges = {"src": node, "dest": dest, "w": node_out.get(dest)}
-                Edges.append(edges)
-        ans = {"Nodes": Nodes, "Edges": Edges}
         try:
-            with open(file_name, "w") as file:
-                json.dump(ans, file)
-                return True
+            save_binary(self.snapshot(), file_name)
+            return True
         except IOError as e:
             print(e)
             return False
 
-    def shortest_path(self, id1: int, id2: int) -> (float, list):
+    @read_locked
+    def shortest_path(self, id1: int, id2: int, method: str = "dijkstra", heuristic: str = None,
+                      weight_per_distance: float = None) -> (float, list):
         """
         Returns the shortest path from node id1 to node id2 using Dijkstra's Algorithm
         @param id1: The start node id
         @param id2: The end node id
+        @param method: "dijkstra" for a search from id1, "bidirectional" for searches from both ends,
+        "ch" for a query on the contraction hierarchy of the graph (see build_contraction_hierarchy)
+        @param heuristic: "euclidean" to run A* guided by the positions of the nodes,
+        it falls back to Dijkstra if some node has no position (or a random one from Node.get_pos).
+        "landmarks" to run A* guided by the landmark index (see build_landmarks),
+        it falls back to Dijkstra if there is no index
+        @param weight_per_distance: A lower bound on the weight of an edge per unit of euclidean distance
+        between its nodes, by default the smallest ratio in the graph
         @return: The distance of the path, a list of the nodes ids that the path goes through
 
         Notes:
         If there is no path between id1 and id2, or one of them dose not exist the function returns (float('inf'),[])
         More info:
         https://en.wikipedia.org/wiki/Dijkstra's_algorithm
+        https://en.wikipedia.org/wiki/A*_search_algorithm
+        """
+        cache = self.result_cache()
+        if cache is None or weight_per_distance is not None:
+            # a given weight_per_distance may overestimate, then the path is not the shortest one
+            return self.search_shortest_path(id1, id2, method, heuristic, weight_per_distance)
+        key = ("shortest_path", id1, id2)
+        found, result = cache.get(key)
+        if not found:
+            path_size, path_list = self.search_shortest_path(id1, id2, method, heuristic, weight_per_distance)
+            result = (path_size, tuple(path_list))
+            cache.put(key, result)
+        return result[0], list(result[1])
+
+    def search_shortest_path(self, id1: int, id2: int, method: str = "dijkstra", heuristic: str = None,
+                             weight_per_distance: float = None) -> (float, list):
+        """
+        Finds the shortest path from node id1 to node id2 without the query cache (see shortest_path)
+        @param id1: The start node id
+        @param id2: The end node id
+        @param method: "dijkstra", "bidirectional" or "ch"
+        @param heuristic: None, "euclidean" or "landmarks"
+        @param weight_per_distance: A lower bound on the weight of an edge per unit of euclidean distance
+        @return: The distance of the path, a list of the nodes ids that the path goes through
         """
         path_list = []
         path_size = float("inf")
-        node2 = self.graph_algo.get_node(id2)
         nodes = self.graph_algo.get_all_v()
         if not nodes.__contains__(id1) or not nodes.__contains__(id2):
             return path_size, path_list
@@ -98,19 +222,597 @@ class GraphAlgo(GraphAlgoInterface):
             path_size = 0
             path_list.append(id1)
             return path_size, path_list
-        self.dijkstra(id1)
-        path_size = node2.get_weight()
-        if path_size != -1:
-            path_list.insert(0, id2)
-            prev_node = node2.get_parent()
-            while prev_node != id1:
-                path_list.insert(0, prev_node)
-                prev_node = self.graph_algo.get_node(prev_node).get_parent()
-            path_list.insert(0, id1)
+        tree = self.cached_tree(id1)
+        if tree is None:
+            if heuristic is not None:
+                estimate = self.heuristic(id2, heuristic, weight_per_distance)
+                if estimate is not None:
+                    return self.a_star(id1, id2, estimate)
+            if method == "bidirectional":
+                return self.bidirectional_dijkstra(id1, id2)
+            if method == "ch":
+                return self.contraction_hierarchy().query(id1, id2)
+            if method != "dijkstra":
+                raise ValueError(f"Unknown shortest path method {method}")
+            dist, parent = self.dijkstra(id1, id2)
+            tree = ShortestPathTree(id1, dist, parent, self.graph_algo.get_mc())
+        return tree.distance(id2), tree.path(id2)
+
+    @read_locked
+    def a_star(self, id1: int, id2: int, estimate) -> (float, list):
+        """
+        Returns the shortest path from node id1 to node id2 using A*.
+        The heuristic must be consistent (never more than the edge weight plus the estimate of the next node),
+        then every node is settled once, like in Dijkstra.
+        @param id1: The start node id
+        @param id2: The end node id
+        @param estimate: A function of node id -> lower bound of the distance from the node to id2
+        @return: The distance of the path, a list of the nodes ids that the path goes through
+        """
+        out_edges = self.graph_algo.all_out_edges_of_node
+        dist = {id1: 0}
+        parent = {id1: None}
+        settled = set()
+        heap = [(estimate(id1), id1)]
+        while heap:
+            current = heappop(heap)[1]
+            if current in settled:
+                continue
+            if current == id2:
+                return dist[id2], ShortestPathTree(id1, dist, parent).path(id2)
+            settled.add(current)
+            curr_dist = dist[current]
+            for neighbor, wei in out_edges(current).items():
+                if neighbor in settled:
+                    continue
+                new_dist = curr_dist + wei
+                old_dist = dist.get(neighbor)
+                if old_dist is None or new_dist < old_dist:
+                    dist[neighbor] = new_dist
+                    parent[neighbor] = current
+                    heappush(heap, (new_dist + estimate(neighbor), neighbor))
+        return float("inf"), []
+
+    def heuristic(self, id2: int, heuristic: str, weight_per_distance: float = None):
+        """
+        Returns an A* heuristic towards id2
+        @param id2: The end node id
+        @param heuristic: The name of the heuristic, "euclidean" or "landmarks"
+        @param weight_per_distance: See shortest_path
+        @return: A function of node id -> lower bound of the distance to id2, None if the heuristic can not be used
+        """
+        if heuristic == "landmarks":
+            index = self.landmark_index()
+            return None if index is None else index.estimate(id2)
+        if heuristic != "euclidean":
+            raise ValueError(f"Unknown heuristic {heuristic}")
+        positions = self.positions()
+        if positions is None:
+            return None
+        if weight_per_distance is None:
+            weight_per_distance = self.min_weight_per_distance()
+        x2, y2, z2 = positions[id2]
+
+        def estimate(node_id: int) -> float:
+            x, y, z = positions[node_id]
+            return weight_per_distance * math.sqrt((x - x2) ** 2 + (y - y2) ** 2 + (z - z2) ** 2)
+
+        return estimate
+
+    @read_locked
+    def build_landmarks(self, k: int = LANDMARKS) -> LandmarkIndex:
+        """
+        Builds the landmark (ALT) index of the graph, used by shortest_path(heuristic="landmarks").
+        The index is rebuilt automatically when the graph changes, unless landmarks_auto_rebuild is False,
+        then it is dropped.
+        @param k: The number of landmarks, every landmark costs two Dijkstra runs and 16 bytes per node
+        @return: The landmark index
+        """
+        self.landmarks = LandmarkIndex.build(self, k)
+        self._landmarks_graph = self.graph_algo
+        return self.landmarks
+
+    @read_locked
+    def landmark_index(self):
+        """
+        Returns the landmark index of the current version of the graph
+        @return: The landmark index, None if there is none
+        """
+        with self._cache_lock:
+            index = self.landmarks
+            if index is None:
+                return None
+            if self._landmarks_graph is not self.graph_algo or index.get_mc() != self.graph_algo.get_mc():
+                if self.landmarks_auto_rebuild and self.graph_algo is not None:
+                    return self.build_landmarks(len(index.landmarks))
+                self.landmarks = None
+                return None
+            return index
+
+    def save_landmarks(self, file_name: str) -> bool:
+        """
+        Saves the landmark index to a file, usually next to the graph file (e.g. "graph.json.landmarks")
+        @param file_name: The path to the out file
+        @return: True if the save was successful, False o.w.
+        """
+        index = self.landmark_index()
+        if index is None:
+            return False
+        try:
+            index.save(file_name)
+            return True
+        except IOError as e:
+            print(e)
+            return False
+
+    def load_landmarks(self, file_name: str) -> bool:
+        """
+        Loads a landmark index saved by save_landmarks
+        @param file_name: The path to the index file
+        @return: True if the index was loaded and matches the current version of the graph, False o.w.
+        """
+        try:
+            index = LandmarkIndex.load(file_name)
+        except (IOError, ValueError, KeyError) as e:
+            print(e)
+            return False
+        if not index.matches(self.graph_algo):
+            return False
+        with self._cache_lock:
+            self.landmarks = index
+            self._landmarks_graph = self.graph_algo
+        return True
+
+    @read_locked
+    def build_contraction_hierarchy(self) -> ContractionHierarchy:
+        """
+        Builds the contraction hierarchy of the graph, used by shortest_path(method="ch").
+        The preprocessing is slow, so for a static graph it should be done once and saved with save_hierarchy
+        @return: The contraction hierarchy
+        """
+        self.hierarchy = ContractionHierarchy.build(self.graph_algo)
+        self._hierarchy_graph = self.graph_algo
+        return self.hierarchy
+
+    @read_locked
+    def contraction_hierarchy(self) -> ContractionHierarchy:
+        """
+        Returns the contraction hierarchy of the current version of the graph, it is rebuilt if the graph changed
+        @return: The contraction hierarchy
+        """
+        with self._cache_lock:
+            hierarchy = self.hierarchy
+            if hierarchy is None or self._hierarchy_graph is not self.graph_algo or \
+                    hierarchy.get_mc() != self.graph_algo.get_mc():
+                return self.build_contraction_hierarchy()
+            return hierarchy
+
+    def save_hierarchy(self, file_name: str) -> bool:
+        """
+        Saves the contraction hierarchy of the graph in JSON format to a file
+        @param file_name: The path to the out file
+        @return: True if the save was successful, False o.w.
+        """
+        try:
+            self.contraction_hierarchy().save(file_name)
+            return True
+        except IOError as e:
+            print(e)
+            return False
+
+    def load_hierarchy(self, file_name: str) -> bool:
+        """
+        Loads a contraction hierarchy saved by save_hierarchy
+        @param file_name: The path to the hierarchy file
+        @return: True if the hierarchy was loaded and matches the current version of the graph, False o.w.
+        """
+        try:
+            hierarchy = ContractionHierarchy.load(file_name)
+        except (IOError, ValueError, KeyError) as e:
+            print(e)
+            return False
+        if not hierarchy.matches(self.graph_algo):
+            return False
+        with self._cache_lock:
+            self.hierarchy = hierarchy
+            self._hierarchy_graph = self.graph_algo
+        return True
+
+    @read_locked
+    def positions(self):
+        """
+        Returns the positions of all the nodes as floats, cached until the graph changes
+        @return: A dict of node id -> (x, y, z), None if some node has no position or a randomly generated one
+        """
+        with self._cache_lock:
+            graph = self.graph_algo
+            if graph is not self._positions_graph or graph.get_mc() != self._positions_mc:
+                positions = {}
+                if isinstance(graph, CSRGraph):
+                    if not np.isnan(graph.pos).any():
+                        positions = dict(zip(graph.ids.tolist(), map(tuple, graph.pos.tolist())))
+                else:
+                    for key, node in graph.get_all_v().items():
+                        pos = getattr(node, "pos", None)
+                        if pos is None or getattr(node, "pos_generated", False):
+                            positions = {}
+                            break
+                        positions[key] = tuple(float(p) for p in pos)
+                self._positions = positions if len(positions) == graph.v_size() else None
+                self._positions_graph = graph
+                self._positions_mc = graph.get_mc()
+                self._weight_per_distance = None
+            return self._positions
+
+    @read_locked
+    def min_weight_per_distance(self) -> float:
+        """
+        Returns the smallest ratio between the weight of an edge and the euclidean distance between its nodes,
+        this makes the euclidean heuristic consistent for every edge of the graph
+        @return: The smallest ratio, inf if no edge has a positive length
+        """
+        with self._cache_lock:
+            positions = self.positions()
+            if self._weight_per_distance is None:
+                ratio = float("inf")
+                for key, (x, y, z) in positions.items():
+                    for dest, w in self.graph_algo.all_out_edges_of_node(key).items():
+                        x2, y2, z2 = positions[dest]
+                        length = math.sqrt((x - x2) ** 2 + (y - y2) ** 2 + (z - z2) ** 2)
+                        if length > 0 and w / length < ratio:
+                            ratio = w / length
+                self._weight_per_distance = ratio if ratio != float("inf") else 0
+            return self._weight_per_distance
+
+    @read_locked
+    def bidirectional_dijkstra(self, id1: int, id2: int) -> (float, list):
+        """
+        Returns the shortest path from node id1 to node id2 by running Dijkstra forward from id1 (over the out-edges)
+        and backward from id2 (over the in-edges) until the two searches meet.
+        The search stops once the smallest keys of the two heaps add up to at least the best path found so far.
+        @param id1: The start node id
+        @param id2: The end node id
+        @return: The distance of the path, a list of the nodes ids that the path goes through
+        """
+        if id1 == id2:
+            return 0, [id1]
+        edges = (self.graph_algo.all_out_edges_of_node, self.reversed_graph().all_out_edges_of_node)
+        dist = ({id1: 0}, {id2: 0})
+        parent = ({id1: None}, {id2: None})
+        settled = (set(), set())
+        heaps = ([(0, id1)], [(0, id2)])
+        best = float("inf")
+        meet = None
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            curr_dist, current = heappop(heaps[side])
+            if current in settled[side]:
+                continue
+            settled[side].add(current)
+            side_dist, other_dist = dist[side], dist[1 - side]
+            for neighbor, wei in edges[side](current).items():
+                if neighbor in settled[side]:
+                    continue
+                new_dist = curr_dist + wei
+                old_dist = side_dist.get(neighbor)
+                if old_dist is None or new_dist < old_dist:
+                    side_dist[neighbor] = new_dist
+                    parent[side][neighbor] = current
+                    heappush(heaps[side], (new_dist, neighbor))
+                    if neighbor in other_dist and new_dist + other_dist[neighbor] < best:
+                        best = new_dist + other_dist[neighbor]
+                        meet = neighbor
+        if meet is None:
+            return float("inf"), []
+        path_list = ShortestPathTree(id1, dist[0], parent[0]).path(meet)
+        prev_node = parent[1][meet]
+        while prev_node is not None:
+            path_list.append(prev_node)
+            prev_node = parent[1][prev_node]
+        return best, path_list
+
+    def reversed_graph(self) -> GraphInterface:
+        """
+        Returns a read-only view of the graph with all its edges reversed (see DiGraph.reversed)
+        @return: The reversed view of the graph
+        """
+        graph = self.graph_algo
+        if hasattr(graph, "reversed"):
+            return graph.reversed()
+        return ReversedDiGraph(graph)
+
+    @read_locked
+    def shortest_paths_to_many(self, src: int, targets) -> dict:
+        """
+        Returns the shortest paths from src to each of the targets,
+        the search stops as soon as all the targets are settled.
+        @param src: The start node id
+        @param targets: The end node ids
+        @return: A dict of target -> (distance, path), the unreachable targets get (float('inf'), [])
+        """
+        targets = set(targets)
+        tree = self.cached_tree(src)
+        if tree is None:
+            nodes = self.graph_algo.get_all_v()
+            dist, parent = {}, {}
+            if nodes.__contains__(src):
+                dist, parent = self.dijkstra(src, {target for target in targets if nodes.__contains__(target)})
+            tree = ShortestPathTree(src, dist, parent, self.graph_algo.get_mc())
+        return {target: (tree.distance(target), tree.path(target)) for target in targets}
+
+    def shortest_path_batch(self, pairs, workers: int = None, chunk_size: int = None):
+        """
+        Answers a batch of shortest path queries. The queries are grouped by source, and every group
+        shares one Dijkstra run that stops when all its targets are settled (see shortest_paths_to_many).
+        The groups can be spread over a process pool (see process_pool)
+        @param pairs: An iterable of (id1, id2) queries
+        @param workers: The number of processes to use, by default the queries run in this process
+        @param chunk_size: The number of groups sent to a worker at a time, by default 4 chunks per worker
+        @return: A generator of (distance, path) for every query, in the order of pairs,
+        each result is yielded as soon as it and all the results before it are ready
+        """
+        groups = {}
+        for i, (id1, id2) in enumerate(pairs):
+            groups.setdefault(id1, []).append((i, id2))
+        groups = list(groups.items())
+        if workers is None or workers <= 1 or len(groups) <= 1:
+            chunks = [groups[i:i + 1] for i in range(0, len(groups))]
+            yield from ordered_results(map(self.group_paths, chunks))
+            return
+        if chunk_size is None:
+            chunk_size = -(-len(groups) // (workers * 4))
+        chunks = [groups[i:i + chunk_size] for i in range(0, len(groups), chunk_size)]
+        with self.process_pool(workers) as pool:
+            yield from ordered_results(pool.map(worker_paths, chunks))
+
+    @read_locked
+    def group_paths(self, groups: list) -> list:
+        """
+        Answers groups of shortest path queries that share their source
+        @param groups: A list of (src, [(query index, target), ...])
+        @return: A list of (query index, (distance, path))
+        """
+        results = []
+        for src, queries in groups:
+            paths = self.shortest_paths_to_many(src, [target for i, target in queries])
+            results.extend((i, paths[target]) for i, target in queries)
+        return results
+
+    @contextmanager
+    def process_pool(self, workers: int):
+        """
+        Starts a process pool whose workers share a read-only snapshot of the graph.
+        The snapshot is written once to a temporary binary file that every worker memory-maps (see load_binary),
+        so the graph is never pickled and its pages are shared through the page cache
+        @param workers: The number of processes
+        @return: A context manager of the ProcessPoolExecutor, the workers run worker_rows and worker_paths
+        """
+        fd, file_name = tempfile.mkstemp(suffix=".graph")
+        os.close(fd)
+        try:
+            save_binary(self.snapshot(), file_name)
+            with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(file_name,)) as pool:
+                yield pool
+        finally:
+            os.remove(file_name)
+
+    @read_locked
+    def nearest_of(self, src: int, candidates) -> (float, list):
+        """
+        Finds the candidate that is closest to src, the search stops as soon as the first candidate is settled.
+        @param src: The start node id
+        @param candidates: The candidate node ids
+        @return: The distance to the nearest candidate and the path to it (the candidate is its last node),
+        (float('inf'), []) if no candidate is reachable
+        """
+        candidates = set(candidates)
+        tree = self.cached_tree(src)
+        if tree is not None:
+            reachable = [node_id for node_id in candidates if node_id in tree]
+            if not reachable:
+                return float("inf"), []
+            nearest = min(reachable, key=tree.distance)
+            return tree.distance(nearest), tree.path(nearest)
+        if not candidates or not self.graph_algo.get_all_v().__contains__(src):
+            return float("inf"), []
+        parent = {}
+        for node_id, node_dist, node_parent in self.settle(src):
+            parent[node_id] = node_parent
+            if node_id in candidates:
+                return node_dist, ShortestPathTree(src, {node_id: node_dist}, parent).path(node_id)
+        return float("inf"), []
+
+    @read_locked
+    def shortest_path_tree(self, src: int) -> ShortestPathTree:
+        """
+        Returns the shortest paths from src to every node it reaches.
+        The last tree_cache_size trees are cached until the graph changes,
+        so repeated queries from the same source only walk the path.
+        @param src: The start node id
+        @return: The shortest path tree of src, it reaches no node if src does not exist
+        """
+        tree = self.cached_tree(src)
+        if tree is not None:
+            return tree
+        mc = self.graph_algo.get_mc()
+        if not self.graph_algo.get_all_v().__contains__(src):
+            return ShortestPathTree(src, {}, {}, mc)
+        dist, parent = self.dijkstra(src)
+        tree = ShortestPathTree(src, dist, parent, mc)
+        with self._cache_lock:
+            self._trees[(src, mc)] = tree
+            if len(self._trees) > self.tree_cache_size:
+                self._trees.popitem(last=False)
+        return tree
+
+    @read_locked
+    def cached_tree(self, src: int):
+        """
+        Returns the cached shortest path tree of src, if it was computed on the current version of the graph
+        or src is a source of the shortest path tracker (see track_shortest_paths)
+        @param src: The start node id
+        @return: The shortest path tree, None if it is not cached
+        """
+        with self._cache_lock:
+            tracker = self.shortest_path_tracker()
+            if tracker is not None and src in tracker.trees:
+                return tracker.tree(src)
+            if self._trees_graph is not self.graph_algo:
+                self._trees.clear()
+                self._trees_graph = self.graph_algo
+            key = (src, self.graph_algo.get_mc())
+            tree = self._trees.get(key)
+            if tree is not None:
+                self._trees.move_to_end(key)
+            return tree
+
+    def track_shortest_paths(self, sources=(), enable: bool = True):
+        """
+        Starts (or stops) maintaining the shortest path trees of the sources as the graph changes (see DynamicSSSP),
+        the queries from these sources then never run a full Dijkstra. The graph must support DiGraph.subscribe
+        @param sources: The start node ids to track
+        @param enable: True to start, False to stop
+        @return: The shortest path tracker, None if it was stopped
+        """
+        if self.sssp_tracker is not None:
+            self.sssp_tracker.close()
+            self.sssp_tracker = None
+        if enable:
+            self.sssp_tracker = DynamicSSSP(self.graph_algo, sources)
+        return self.sssp_tracker
+
+    def shortest_path_tracker(self):
+        """
+        Returns the shortest path tracker of the current graph
+        @return: The shortest path tracker, None if no shortest paths are tracked
+        """
+        tracker = self.sssp_tracker
+        if tracker is None or tracker.graph is not self.graph_algo:
+            return None
+        return tracker
+
+    def cache_queries(self, maxsize: int = QUERY_CACHE_SIZE, ttl: float = None, keep_unaffected: bool = False):
+        """
+        Starts (or stops) caching the results of shortest_path, connected_component and connected_components
+        on the current version of the graph (see QueryCache).
+        The paths are cached by their ends only, a path found with another method or heuristic has the same distance.
+        The queries with a weight_per_distance are not cached, since it may not be a lower bound
+        @param maxsize: The maximum number of cached results, 0 to stop caching
+        @param ttl: The number of seconds a result is kept, None to keep it until it is evicted or the graph changes
+        @param keep_unaffected: If True, a change of the graph only drops the results it may affect,
+        the graph must support DiGraph.subscribe
+        @return: The query cache, None if it was stopped
+        """
+        # subscribing and closing take the write lock of the graph, which must not be waited for
+        # while holding _cache_lock: the queries take the read lock first and then _cache_lock
+        cache = QueryCache(self.graph_algo, maxsize, ttl, keep_unaffected) if maxsize > 0 else None
+        with self._cache_lock:
+            previous, self.query_cache = self.query_cache, cache
+        if previous is not None:
+            previous.close()
+        return cache
+
+    def result_cache(self):
+        """
+        Returns the query cache of the current graph
+        @return: The query cache, None if the queries are not cached
+        """
+        cache = self.query_cache
+        if cache is None or cache.graph is not self.graph_algo:
+            return None
+        return cache
+
+    @read_locked
+    def all_pairs_shortest_paths(self, sources: list = None, predecessors: bool = False, workers: int = None):
+        """
+        Computes the shortest distances from every node in sources to every node in the graph.
+        Small graphs are solved with a vectorized Floyd-Warshall, larger ones with one Dijkstra per source,
+        which can be spread over a process pool.
+        @param sources: The source node ids, by default all the nodes of the graph
+        @param predecessors: If True, the predecessor matrix is returned as well
+        @param workers: The number of processes to use for the Dijkstra runs, by default they run in this process
+        @return: The distance matrix, and the predecessor matrix if predecessors is True.
+        Row i belongs to sources[i] and column j to the j-th node of get_all_v().
+        Unreachable nodes have the distance inf, the predecessor of a source and of unreachable nodes is -1,
+        the row of a source that is not in the graph is all inf (and -1)
+
+        More info:
+        https://en.wikipedia.org/wiki/Floyd%E2%80%93Warshall_algorithm
+        """
+        ids = list(self.graph_algo.get_all_v().keys())
+        if sources is None:
+            sources = ids
+        if len(ids) <= FLOYD_WARSHALL_LIMIT:
+            all_dist, all_pred = self.floyd_warshall()
+            index = {key: i for i, key in enumerate(ids)}
+            dist = np.full((len(sources), len(ids)), np.inf)
+            pred = np.full((len(sources), len(ids)), -1, dtype=np.int64)
+            known = [row for row, src in enumerate(sources) if src in index]
+            rows = [index[sources[row]] for row in known]
+            dist[known], pred[known] = all_dist[rows], all_pred[rows]
+        elif workers is not None and workers > 1 and len(sources) > workers:
+            chunk_size = -(-len(sources) // (workers * 4))
+            chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+            with self.process_pool(workers) as pool:
+                results = list(pool.map(worker_rows, chunks))
+            dist = np.concatenate([chunk_dist for chunk_dist, chunk_pred in results])
+            pred = np.concatenate([chunk_pred for chunk_dist, chunk_pred in results])
         else:
-            path_size = float("inf")
-        return path_size, path_list
+            dist, pred = self.dijkstra_rows(sources)
+        if predecessors:
+            return dist, pred
+        return dist
+
+    @read_locked
+    def dijkstra_rows(self, sources: list) -> (np.ndarray, np.ndarray):
+        """
+        Runs Dijkstra from every node in sources
+        @param sources: The source node ids
+        @return: The distance matrix and the predecessor matrix (see all_pairs_shortest_paths)
+        """
+        ids = list(self.graph_algo.get_all_v().keys())
+        index = {key: i for i, key in enumerate(ids)}
+        dist = np.full((len(sources), len(ids)), np.inf)
+        pred = np.full((len(sources), len(ids)), -1, dtype=np.int64)
+        for row, src in enumerate(sources):
+            if src not in index:
+                continue
+            distances, parents = self.dijkstra(src)
+            for key, d in distances.items():
+                dist[row, index[key]] = d
+                if parents[key] is not None:
+                    pred[row, index[key]] = parents[key]
+        return dist, pred
 
+    @read_locked
+    def floyd_warshall(self) -> (np.ndarray, np.ndarray):
+        """
+        Computes the shortest distances between all the pairs of nodes with a vectorized Floyd-Warshall,
+        it takes O(|V|^2) memory so it is meant for small graphs
+        @return: The distance matrix and the predecessor matrix (see all_pairs_shortest_paths)
+        """
+        ids = list(self.graph_algo.get_all_v().keys())
+        index = {key: i for i, key in enumerate(ids)}
+        n = len(ids)
+        dist = np.full((n, n), np.inf)
+        pred = np.full((n, n), -1, dtype=np.int64)
+        for i, key in enumerate(ids):
+            for dest, w in self.graph_algo.all_out_edges_of_node(key).items():
+                dist[i, index[dest]] = w
+                pred[i, index[dest]] = i
+        np.fill_diagonal(dist, 0)
+        np.fill_diagonal(pred, -1)
+        for k in range(n):
+            through = dist[:, k, None] + dist[None, k, :]
+            better = through < dist
+            dist = np.where(better, through, dist)
+            pred = np.where(better, pred[k][None, :], pred)
+        ids = np.array(ids, dtype=np.int64)
+        return dist, np.where(pred >= 0, ids[pred], -1)
+
+    @read_locked
     def connected_component(self, id1: int) -> list:
         """
         Finds the Strongly Connected Component(SCC) that node id1 is a part of.
@@ -119,18 +821,74 @@ class GraphAlgo(GraphAlgoInterface):
 
         Notes:
         If the graph is None or id1 is not in the graph, the function should return an empty list []
+        The SCCs are computed once for the whole graph and cached until the graph changes,
+        so after the first call this only copies the component of id1.
         """
-        _list = []
-        _dict = {}
-        if self.get_graph().get_all_v().__contains__(id1):
-            dfs_list = self.dfs(id1)
-            self.replace_dicts()
-            for node_id in dfs_list:
-                _dict[node_id] = "visited"
-            _list = self.dfs(id1, _dict)
-            self.replace_dicts()
-        return _list
+        cache = self.result_cache()
+        key = ("connected_component", id1)
+        if cache is not None:
+            found, component = cache.get(key)
+            if found:
+                return list(component)
+        component = self.search_connected_component(id1)
+        if cache is not None:
+            cache.put(key, tuple(component))
+        return component
+
+    def search_connected_component(self, id1: int) -> list:
+        """
+        Finds the SCC that node id1 is a part of without the query cache (see connected_component)
+        @param id1: The node id
+        @return: The list of nodes in the SCC
+        """
+        tracker = self.component_tracker()
+        if tracker is not None:
+            return tracker.connected_component(id1)
+        component = self.component_id(id1)
+        if component is None:
+            return []
+        return list(self._components[component])
+
+    @read_locked
+    def reachability(self) -> Reachability:
+        """
+        Returns the reachability engine of the current version of the graph, it works on the CSR snapshot
+        @return: The reachability engine
+        """
+        with self._cache_lock:
+            snapshot = self.snapshot()
+            if self._reachability is None or self._reachability.graph is not snapshot:
+                self._reachability = Reachability(snapshot)
+            return self._reachability
+
+    def reachable_from(self, *sources, max_hops: int = None) -> list:
+        """
+        Returns the nodes that are reachable from any of the sources, with a level-synchronous BFS (see Reachability)
+        @param sources: The start node ids
+        @param max_hops: The maximum number of edges of a path, None for no limit
+        @return: The list of node ids
+        """
+        return self.reachability().reachable_from(*sources, max_hops=max_hops)
+
+    def reaches(self, *targets, max_hops: int = None) -> list:
+        """
+        Returns the nodes that reach any of the targets, with a level-synchronous BFS (see Reachability)
+        @param targets: The end node ids
+        @param max_hops: The maximum number of edges of a path, None for no limit
+        @return: The list of node ids
+        """
+        return self.reachability().reaches(*targets, max_hops=max_hops)
 
+    def hop_distances(self, *sources, max_hops: int = None) -> dict:
+        """
+        Returns the number of edges from the closest source to every reachable node (see Reachability)
+        @param sources: The start node ids
+        @param max_hops: The maximum number of edges of a path, None for no limit (k-hop neighborhood)
+        @return: A dict of node id -> number of edges
+        """
+        return self.reachability().hop_distances(*sources, max_hops=max_hops)
+
+    @read_locked
     def connected_components(self) -> List[list]:
         """
         Finds all the Strongly Connected Component(SCC) in the graph.
@@ -139,15 +897,120 @@ class GraphAlgo(GraphAlgoInterface):
         Notes:
         If the graph is None the function should return an empty list []
         """
-        self.reset_nodes()
-        _list = []
-        for node_id in self.graph_algo.get_all_v().keys():
-            if self.graph_algo.get_node(node_id).get_info() != "black":
-                list_of_scc = self.connected_component(node_id)
-                for key in list_of_scc:
-                    self.graph_algo.get_node(key).set_info("black")
-                _list.append(list_of_scc)
-        return _list
+        if self.graph_algo is None:
+            return []
+        cache = self.result_cache()
+        if cache is not None:
+            found, components = cache.get(("connected_components",))
+            if found:
+                return [list(component) for component in components]
+        tracker = self.component_tracker()
+        if tracker is not None:
+            components = tracker.connected_components()
+        else:
+            self.scc()
+            components = [list(component) for component in self._components]
+        if cache is not None:
+            cache.put(("connected_components",), tuple(tuple(component) for component in components))
+        return components
+
+    @read_locked
+    def component_id(self, id1: int):
+        """
+        Returns the id of the SCC that node id1 is a part of, two nodes are in the same SCC iff their ids are equal.
+        Without track_components the id is the index of the SCC in the list of connected_components
+        @param id1: The node id
+        @return: The id of the SCC, None if id1 is not in the graph
+        """
+        if self.graph_algo is None:
+            return None
+        tracker = self.component_tracker()
+        if tracker is not None:
+            return tracker.component_id(id1)
+        self.scc()
+        return self._component_of.get(id1)
+
+    def track_components(self, enable: bool = True):
+        """
+        Starts (or stops) maintaining the SCCs incrementally as the graph changes (see IncrementalSCC),
+        instead of recomputing them all after every change. The graph must support DiGraph.subscribe
+        @param enable: True to start, False to stop
+        @return: The incremental SCC maintainer, None if it was stopped
+        """
+        if self.scc_tracker is not None:
+            self.scc_tracker.close()
+            self.scc_tracker = None
+        if enable:
+            self.scc_tracker = IncrementalSCC(self.graph_algo)
+        return self.scc_tracker
+
+    def component_tracker(self):
+        """
+        Returns the incremental SCC maintainer of the current graph
+        @return: The incremental SCC maintainer, None if the SCCs are not tracked
+        """
+        tracker = self.scc_tracker
+        if tracker is None or tracker.graph is not self.graph_algo:
+            return None
+        return tracker
+
+    @read_locked
+    def scc(self) -> List[list]:
+        """
+        Computes all the SCCs of the graph with an iterative version of Tarjan's algorithm in O(|V| + |E|).
+        The result is cached until the graph (or its MC) changes.
+        @return: The list of all SCC, in topological order of the condensed graph
+        """
+        with self._cache_lock:
+            graph = self.graph_algo
+            if self._scc_graph is graph and self._scc_mc == graph.get_mc():
+                return self._components
+            components = tarjan_scc(graph.get_all_v().keys(), graph.all_out_edges_of_node)
+            self._component_of = {node_id: i for i, component in enumerate(components) for node_id in component}
+            self._components = components
+            self._scc_graph = graph
+            self._scc_mc = graph.get_mc()
+            return components
+
+    @read_locked
+    def condensation(self) -> Condensation:
+        """
+        Returns the condensation of the graph: the DAG of its SCCs with a reachability index (see Condensation),
+        built from the cached SCCs and kept until the graph (or its MC) changes
+        @return: The condensation of the graph
+        """
+        with self._cache_lock:
+            graph = self.graph_algo
+            condensation = self._condensation
+            if condensation is None or self._condensation_graph is not graph or \
+                    condensation.get_mc() != graph.get_mc():
+                condensation = Condensation.build(graph, self.scc())
+                self._condensation = condensation
+                self._condensation_graph = graph
+            return condensation
+
+    def can_reach(self, id1: int, id2: int) -> bool:
+        """
+        Returns if there is a path from node id1 to node id2, most queries are answered by the labels
+        of the condensation and the others by a DFS of the DAG that the labels prune
+        @param id1: The start node id
+        @param id2: The end node id
+        @return: True if id2 is reachable from id1, False o.w. or if one of them is not in the graph
+        """
+        return self.condensation().can_reach(id1, id2)
+
+    @read_locked
+    def snapshot(self) -> CSRGraph:
+        """
+        Returns a read-only CSR snapshot of the graph (see DiGraph.freeze)
+        @return: The CSR snapshot of the graph
+        """
+        graph = self.graph_algo
+        if isinstance(graph, CSRGraph):
+            return graph
+        if hasattr(graph, "freeze"):
+            return graph.freeze()
+        return CSRGraph.from_graph(graph)
 
     def plot_graph(self) -> None:
         """
@@ -170,80 +1033,194 @@ class GraphAlgo(GraphAlgoInterface):
         plt.title("Graph")
         plt.show()
 
-    def reset_nodes(self):
+    @read_locked
+    def dijkstra(self, src: int, dest=None, graph: GraphInterface = None) -> (dict, dict):
         """
-        Resets the weight, parent and info of each node in the graph
-        @return:
+        Finds the shortest distance from src to each node in the graph (see settle)
+        @param src: The start node id
+        @param dest: If given, the search stops as soon as this node is settled,
+        it can also be a set of nodes, then the search stops once all of them are settled
+        @param graph: The graph to search, by default the graph of the algorithm (pass graph.reversed() for a backward search)
+        @return: A dict of node id -> distance and a dict of node id -> parent id for every settled node
         """
-        nodes = self.graph_algo.get_all_v()
-        for key in nodes.keys():
-            node = self.graph_algo.get_node(key)
-            node.set_weight(-1)
-            node.set_parent(-1)
-            node.set_info("white")
+        remaining = set(dest) if isinstance(dest, (set, frozenset, list, tuple)) else None
+        if remaining is not None and len(remaining) == 0:
+            return {}, {}
+        dist = {}
+        parent = {}
+        for node_id, node_dist, node_parent in self.settle(src, graph):
+            dist[node_id] = node_dist
+            parent[node_id] = node_parent
+            if remaining is None:
+                if node_id == dest:
+                    break
+            else:
+                remaining.discard(node_id)
+                if not remaining:
+                    break
+        return dist, parent
 
-    def dijkstra(self, src: int):
+    def settle(self, src: int, graph: GraphInterface = None):
         """
-        The method checks what the shortest path from src to each node in the graph
-        and updates the weight(path_size) and the parent(path_list) of each node
-        @param src:
-        @return:
+        Runs Dijkstra's algorithm from src using a binary heap and yields the nodes in the order they are settled,
+        so the caller can stop the search at any point.
+        The search state is kept in local dicts, so the nodes of the graph are not modified.
+        Stale heap entries are skipped when popped (lazy deletion) instead of being updated in place.
+        @param src: The start node id
+        @param graph: The graph to search, by default the graph of the algorithm
+        @return: A generator of (node id, distance, parent id) triples in increasing order of distance
         """
-        queue = PriorityQueue()
-        self.reset_nodes()
-        queue.put(src)
-        self.graph_algo.get_node(src).set_weight(0)
-        while not queue.empty():
-            current = queue.get()
-            curr_node = self.graph_algo.get_node(current)
-            curr_node.set_info("black")
-            for neighbor in self.graph_algo.all_out_edges_of_node(current).keys():
-                next_node = self.graph_algo.get_node(neighbor)
-                wei = self.graph_algo.get_edge(current, neighbor)
-                if next_node.get_info() != "black":
-                    queue.put(next_node.get_key())
-                    if next_node.get_weight() > curr_node.get_weight() + wei or next_node.get_weight() == -1:
-                        next_node.set_weight(curr_node.get_weight() + wei)
-                        next_node.set_parent(curr_node.get_key())
-
-                if next_node.get_weight() > curr_node.get_weight() + wei:
-                    next_node.set_weight(curr_node.get_weight() + wei)
-                    next_node.set_parent(curr_node.get_key())
-                    queue.put(next_node.get_key())
-
-    def replace_dicts(self):
-        """
-        Replaces between the dicts: the HashIn is the HashOut
-        and the HashOut is the HashIn
-        @return:
+        graph = graph or self.graph_algo
+        if isinstance(graph, CSRGraph):
+            yield from self.settle_csr(src, graph)
+            return
+        out_edges = graph.all_out_edges_of_node
+        dist = {src: 0}
+        parent = {src: None}
+        settled = set()
+        heap = [(0, src)]
+        while heap:
+            curr_dist, current = heappop(heap)
+            if current in settled:
+                continue
+            settled.add(current)
+            yield current, curr_dist, parent[current]
+            for neighbor, wei in out_edges(current).items():
+                if neighbor in settled:
+                    continue
+                new_dist = curr_dist + wei
+                old_dist = dist.get(neighbor)
+                if old_dist is None or new_dist < old_dist:
+                    dist[neighbor] = new_dist
+                    parent[neighbor] = current
+                    heappush(heap, (new_dist, neighbor))
+
+    def settle_csr(self, src: int, graph: CSRGraph):
         """
-        for key in self.graph_algo.get_all_v():
-            node = self.graph_algo.get_node(key)
-            _in = node.get_hashIn()
-            _out = node.get_hashOut()
-            node.set_hashIn(_out)
-            node.set_hashOut(_in)
+        settle on a CSR snapshot: the search runs on the dense indices and reads the edges of a node
+        from its slices of the arrays (see CSRGraph.views), instead of building a dict of them with all_out_edges_of_node
+        @param src: The start node id
+        @param graph: The CSR snapshot to search
+        @return: A generator of (node id, distance, parent id) triples in increasing order of distance
+        """
+        indptr, indices, weights, ids = graph.views()
+        i = graph.index[src]
+        dist = {i: 0}
+        parent = {i: None}
+        settled = bytearray(len(ids))
+        heap = [(0, i)]
+        while heap:
+            curr_dist, current = heappop(heap)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            p = parent[current]
+            yield ids[current], curr_dist, None if p is None else ids[p]
+            start, end = indptr[current], indptr[current + 1]
+            for neighbor, wei in zip(indices[start:end], weights[start:end]):
+                if settled[neighbor]:
+                    continue
+                new_dist = curr_dist + wei
+                old_dist = dist.get(neighbor)
+                if old_dist is None or new_dist < old_dist:
+                    dist[neighbor] = new_dist
+                    parent[neighbor] = current
+                    heappush(heap, (new_dist, neighbor))
 
-    def dfs(self, node_id: int, _dict: dict = None) -> list:
+    @read_locked
+    def dfs(self, node_id: int, _dict: dict = None, graph: GraphInterface = None) -> list:
         """
         Returns a list of the nodes that connect to the node_id
-        and mark them as "visited"
         @param node_id:
-        @param _dict:
+        @param _dict: If given, only the nodes marked as "visited" in it are returned
+        @param graph: The graph to walk, by default the graph of the algorithm (pass graph.reversed() to walk backwards)
         @return:
         """
-        self.reset_nodes()
+        graph = graph or self.graph_algo
+        if isinstance(graph, CSRGraph):
+            return self.dfs_csr(node_id, _dict, graph)
         _list = [node_id]
-        queue = Queue()
-        queue.put(node_id)
-        self.graph_algo.get_node(node_id).set_info("visited")
-        while not queue.empty():
-            curr_node = queue.get()
-            for id2 in self.get_graph().all_out_edges_of_node(curr_node):
-                node = self.graph_algo.get_node(id2)
-                if node.get_info() != "visited":
-                    queue.put(id2)
-                    node.set_info("visited")
+        visited = {node_id}
+        queue = deque([node_id])
+        edges_of_node = graph.all_out_edges_of_node
+        while queue:
+            curr_node = queue.popleft()
+            for id2 in edges_of_node(curr_node):
+                if id2 not in visited:
+                    queue.append(id2)
+                    visited.add(id2)
                     if _dict is None or _dict.get(id2) == "visited":
                         _list.append(id2)
         return _list
+
+    def dfs_csr(self, node_id: int, _dict: dict, graph: CSRGraph) -> list:
+        """
+        dfs on a CSR snapshot: the walk runs on the dense indices and reads the slices of the arrays (see CSRGraph.views)
+        @param node_id:
+        @param _dict: If given, only the nodes marked as "visited" in it are returned
+        @param graph: The CSR snapshot to walk
+        @return:
+        """
+        indptr, indices, weights, ids = graph.views()
+        i = graph.index[node_id]
+        _list = [node_id]
+        visited = bytearray(len(ids))
+        visited[i] = 1
+        queue = deque([i])
+        while queue:
+            current = queue.popleft()
+            for j in indices[indptr[current]:indptr[current + 1]]:
+                if not visited[j]:
+                    queue.append(j)
+                    visited[j] = 1
+                    if _dict is None or _dict.get(ids[j]) == "visited":
+                        _list.append(ids[j])
+        return _list
+
+
+worker_algo = None
+
+
+def init_worker(file_name: str):
+    """
+    Initializes a worker process of a process pool with the memory-mapped graph snapshot
+    @param file_name: The path to the binary file of the snapshot (see GraphAlgo.process_pool)
+    @return:
+    """
+    global worker_algo
+    worker_algo = GraphAlgo(load_binary(file_name, mmap=True))
+
+
+def worker_rows(sources: list) -> (np.ndarray, np.ndarray):
+    """
+    Runs Dijkstra from every node in sources inside a worker process
+    @param sources: The source node ids
+    @return: The distance matrix and the predecessor matrix of the sources
+    """
+    return worker_algo.dijkstra_rows(sources)
+
+
+def worker_paths(groups: list) -> list:
+    """
+    Answers groups of shortest path queries inside a worker process
+    @param groups: A list of (src, [(query index, target), ...])
+    @return: A list of (query index, (distance, path))
+    """
+    return worker_algo.group_paths(groups)
+
+
+def ordered_results(chunks):
+    """
+    Yields the results of the chunks in the order of their query indexes,
+    keeping only the results that arrived before their turn
+    @param chunks: An iterable of lists of (query index, result), every index appears once
+    @return: A generator of the results
+    """
+    pending = {}
+    next_index = 0
+    for chunk in chunks:
+        for i, result in chunk:
+            pending[i] = result
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
@@ -0,0 +1,151 @@
+import struct
+import zlib
+from array import array
+import numpy as np
+from src.CSRGraph import CSRGraph
+from src.GraphJson import iter_json_arrays, parse_pos
+
+MAGIC = b"DIGRAPH\x00"
+VERSION = 1
+# magic, version, flags, number of nodes, number of edges, mc, crc32 of the payload, padding
+HEADER = struct.Struct("<8sIIqqqI4x")
+CRC_CHUNK = 1 << 24
+
+
+def sections(n: int, m: int) -> list:
+    """
+    Returns the layout of the payload that follows the header, every section is 8 bytes aligned
+    @param n: The number of nodes
+    @param m: The number of edges
+    @return: A list of (name, dtype, shape) in the order of the file
+    """
+    return [("ids", np.int64, (n,)),
+            ("pos", np.float64, (n, 3)),
+            ("indptr", np.int64, (n + 1,)),
+            ("indices", np.int64, (m,)),
+            ("weights", np.float64, (m,)),
+            ("in_indptr", np.int64, (n + 1,)),
+            ("in_indices", np.int64, (m,)),
+            ("in_weights", np.float64, (m,))]
+
+
+def edges_checksum(graph) -> int:
+    """
+    Returns a checksum of the node ids and of the edges with their weights, in an order that does not depend
+    on the order the graph was built in, so files derived from the graph can be checked against it
+    @param graph: The graph
+    @return: The crc32 of the sorted node ids and (src, dest, weight) triples
+    """
+    nodes = graph.get_all_v()
+    ids = np.sort(np.fromiter(nodes.keys(), dtype="<i8", count=len(nodes)))
+    edges = np.array([(src, dest, w) for src in ids.tolist() for dest, w in graph.all_out_edges_of_node(src).items()],
+                     dtype=[("src", "<i8"), ("dest", "<i8"), ("w", "<f8")])
+    edges.sort(order=("src", "dest"))
+    return zlib.crc32(edges.tobytes(), zlib.crc32(ids.tobytes()))
+
+
+def save_binary(graph, file_name: str):
+    """
+    Saves the graph in the binary format:
+    a header, the node id table, the positions (NaN when missing) and the CSR arrays of the out and in edges.
+    @param graph: The graph to save, a DiGraph is saved through its CSR snapshot
+    @param file_name: The path to the out file
+    @return:
+    """
+    snapshot = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    n, m = snapshot.v_size(), snapshot.e_size()
+    with open(file_name, "wb") as file:
+        file.write(bytes(HEADER.size))
+        crc = 0
+        for name, dtype, shape in sections(n, m):
+            data = np.ascontiguousarray(getattr(snapshot, name), dtype=np.dtype(dtype).newbyteorder("<"))
+            crc = zlib.crc32(memoryview(data).cast("B"), crc)
+            file.write(memoryview(data).cast("B"))
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, 0, n, m, snapshot.get_mc(), crc))
+
+
+def load_binary(file_name: str, mmap: bool = True, verify: bool = False) -> CSRGraph:
+    """
+    Loads a graph saved by save_binary
+    @param file_name: The path to the binary file
+    @param mmap: If True, the arrays are memory-mapped read-only instead of being read into memory,
+    so processes that load the same file share its pages through the page cache
+    @param verify: If True, the checksum of the payload is checked, this reads the whole file.
+    By default only the header and the size of the file are checked, so a memory-mapped load takes O(1)
+    @return: The read-only CSR graph
+    """
+    with open(file_name, "rb") as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{file_name} is not a graph binary file")
+    magic, version, flags, n, m, mc, crc = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{file_name} is not a graph binary file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported graph binary version {version}")
+    layout = sections(n, m)
+    size = HEADER.size + sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for name, dtype, shape in layout)
+    payload = np.memmap(file_name, dtype=np.uint8, mode="r") if mmap else np.fromfile(file_name, dtype=np.uint8)
+    if len(payload) != size:
+        raise ValueError(f"{file_name} is truncated or corrupted")
+    if verify:
+        check = 0
+        for start in range(HEADER.size, size, CRC_CHUNK):
+            check = zlib.crc32(memoryview(payload[start:min(start + CRC_CHUNK, size)]), check)
+        if check != crc:
+            raise ValueError(f"{file_name} failed the checksum")
+    arrays = {}
+    offset = HEADER.size
+    for name, dtype, shape in layout:
+        count = int(np.prod(shape))
+        dtype = np.dtype(dtype).newbyteorder("<")
+        arrays[name] = payload[offset:offset + count * dtype.itemsize].view(dtype).reshape(shape)
+        offset += count * dtype.itemsize
+    return CSRGraph(mc=mc, **arrays)
+
+
+def json_to_binary(json_file: str, binary_file: str):
+    """
+    Converts a graph from the json format ({"Nodes": [...], "Edges": [...]}) to the binary format.
+    The json file is streamed into flat arrays, the graph is never built as a DiGraph.
+    Like DiGraph, duplicated nodes and edges keep their first occurrence, loops and edges with a missing node are skipped
+    @param json_file: The path to the json file
+    @param binary_file: The path to the out file
+    @return:
+    """
+    index = {}
+    ids = array("q")
+    pos = array("d")
+    srcs = array("q")
+    dests = array("q")
+    weights = array("d")
+    nan = float("nan")
+    with open(json_file, "r") as file:
+        for key, item in iter_json_arrays(file):
+            if key == "Nodes":
+                node_id = item.get("id")
+                if node_id not in index:
+                    index[node_id] = len(ids)
+                    ids.append(node_id)
+                    node_pos = parse_pos(item.get("pos"))
+                    pos.extend((nan, nan, nan) if node_pos is None else (float(p) for p in node_pos))
+            elif key == "Edges":
+                srcs.append(item.get("src"))
+                dests.append(item.get("dest"))
+                weights.append(item.get("w"))
+    n = len(ids)
+    src = np.fromiter((index.get(key, -1) for key in srcs), dtype=np.int64, count=len(srcs))
+    dest = np.fromiter((index.get(key, -1) for key in dests), dtype=np.int64, count=len(dests))
+    w = np.frombuffer(weights, dtype=np.float64)
+    keep = np.flatnonzero((src >= 0) & (dest >= 0) & (src != dest))
+    first = np.sort(keep[np.unique(src[keep] * n + dest[keep], return_index=True)[1]])
+    order = first[np.argsort(src[first], kind="stable")]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src[order], minlength=n), out=indptr[1:])
+    indices = dest[order]
+    w = w[order]
+    in_indptr, in_indices, in_weights = CSRGraph.transpose(indptr, indices, w)
+    ids = np.frombuffer(ids, dtype=np.int64)
+    pos = np.frombuffer(pos, dtype=np.float64).reshape((n, 3))
+    save_binary(CSRGraph(ids, pos, indptr, indices, w, in_indptr, in_indices, in_weights), binary_file)
@@ -0,0 +1,224 @@
+import json
+import os
+import tempfile
+
+CHUNK_SIZE = 1 << 16
+WRITE_BATCH = 4096
+WHITESPACE = " \t\n\r"
+
+
+class JsonArrayReader:
+    """
+    This class represents an incremental reader of a JSON object whose values are arrays, like the graph files:
+    {"Edges": [...], "Nodes": [...]}
+    The file is read in chunks and the items of the arrays are decoded one at a time,
+    so only the current chunk and the current item are kept in memory.
+    """
+
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def __iter__(self):
+        """
+        Yields a pair (key, item) for every item of every array in the object, in the order of the file.
+        Values of the object that are not arrays are decoded and skipped.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self._decode()
+            self._expect(":")
+            if self._peek() == "[":
+                self.pos += 1
+                if self._peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield key, self._decode()
+                        if self._next() == "]":
+                            break
+            else:
+                self._decode()
+            if self._next() == "}":
+                return
+
+    def _fill(self) -> bool:
+        """
+        Reads the next chunk of the file into the buffer, dropping the part that was already consumed
+        @return: False if the end of the file was reached
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """
+        Skips the whitespaces and returns the next character without consuming it
+        @return: The next character, "" at the end of the file
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def _next(self) -> str:
+        """
+        Consumes the next separator, which must be "," or a closing bracket
+        @return: The separator
+        """
+        char = self._peek()
+        if char not in (",", "]", "}"):
+            raise json.JSONDecodeError("Expecting ',' delimiter", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def _expect(self, char: str):
+        """
+        Consumes the next character, which must be char
+        @param char:
+        @return:
+        """
+        if self._peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def _decode(self):
+        """
+        Decodes the next JSON value, reading more chunks until the value is complete
+        @return: The decoded value
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or not self._fill():
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+
+def iter_json_arrays(file, chunk_size: int = CHUNK_SIZE):
+    """
+    Yields a pair (key, item) for every item of the arrays of the JSON object in the file
+    @param file: A text file opened for reading
+    @param chunk_size: The number of characters to read at a time
+    @return: A generator of (key, item) pairs
+    """
+    return iter(JsonArrayReader(file, chunk_size))
+
+
+def parse_pos(pos: str):
+    """
+    Parses the position of a node from the "x,y,z" format of the json files
+    @param pos: The position string
+    @return: The position tuple of floats, None if pos is None
+    """
+    if pos is None:
+        return None
+    node_pos = pos.split(",")
+    x = float(node_pos[0])
+    y = float(node_pos[1])
+    z = float(node_pos[2])
+    return x, y, z
+
+
+def format_pos(pos) -> str:
+    """
+    Formats the position of a node in the "x,y,z" format of the json files
+    @param pos: The position tuple
+    @return: The position string, None if pos is None
+    """
+    if pos is None:
+        return None
+    return ",".join(str(p) for p in pos)
+
+
+def write_graph_json(graph, file, batch_size: int = WRITE_BATCH):
+    """
+    Writes the graph to the file in the json format {"Nodes": [...], "Edges": [...]}.
+    The items are written in batches as they are produced, so the whole document is never kept in memory.
+    @param graph: The graph to write
+    @param file: A text file opened for writing
+    @param batch_size: The number of items to buffer before each write
+    @return:
+    """
+    encode = json.JSONEncoder().encode
+    parts = []
+
+    def write_items(header: str, items):
+        file.write(header)
+        separator = ""
+        for item in items:
+            parts.append(separator + encode(item))
+            separator = ", "
+            if len(parts) >= batch_size:
+                file.write("".join(parts))
+                parts.clear()
+        file.write("".join(parts))
+        parts.clear()
+
+    def nodes():
+        for key in graph.get_all_v().keys():
+            pos = format_pos(getattr(graph.get_node(key), "pos", None))
+            yield {"id": key} if pos is None else {"pos": pos, "id": key}
+
+    def edges():
+        for key in graph.get_all_v().keys():
+            for dest, w in graph.all_out_edges_of_node(key).items():
+                yield {"src": key, "w": w, "dest": dest}
+
+    write_items('{"Nodes": [', nodes())
+    write_items('], "Edges": [', edges())
+    file.write("]}")
+
+
+def save_graph_json(graph, file_name: str, atomic: bool = False, batch_size: int = WRITE_BATCH):
+    """
+    Saves the graph in json format to a file
+    @param graph: The graph to save
+    @param file_name: The path to the out file
+    @param atomic: If True, the graph is written to a temporary file in the same directory that replaces
+    file_name only after it was completely written, so file_name is never left half-written
+    @param batch_size: The number of items to buffer before each write
+    @return:
+    """
+    if not atomic:
+        with open(file_name, "w") as file:
+            write_graph_json(graph, file, batch_size)
+        return
+    directory, name = os.path.split(os.path.abspath(file_name))
+    fd, tmp_name = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as file:
+            write_graph_json(graph, file, batch_size)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file with mode 0600, give it the mode open(file_name, "w") would leave
+        if os.path.exists(file_name):
+            mode = os.stat(file_name).st_mode & 0o7777
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, file_name)
+    except BaseException:
+        os.remove(tmp_name)
+        raise
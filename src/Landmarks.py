@@ -0,0 +1,124 @@
+import numpy as np
+from src.GraphBinary import edges_checksum
+
+
+class LandmarkIndex:
+    """
+    This class represents a landmark (ALT) index: the distances from and to a few landmark nodes.
+    By the triangle inequality, for every landmark L and nodes v, t:
+    d(v, t) >= d(L, t) - d(L, v) and d(v, t) >= d(v, L) - d(t, L),
+    which gives a consistent A* heuristic that keeps the answers exact.
+    More info:
+    Goldberg and Harrelson, Computing the Shortest Path: A* Search Meets Graph Theory (SODA 2005)
+    """
+
+    def __init__(self, ids, landmarks, from_landmarks, to_landmarks, mc: int = 0, checksum: int = None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.landmarks = list(landmarks)
+        # from_landmarks[v][i] = d(L_i, v), to_landmarks[v][i] = d(v, L_i)
+        self.from_landmarks = np.ascontiguousarray(from_landmarks, dtype=np.float64)
+        self.to_landmarks = np.ascontiguousarray(to_landmarks, dtype=np.float64)
+        self.mc = mc
+        # the edges_checksum of the graph, set when the index is built, it lets a loaded index be checked
+        self.checksum = checksum
+        self.index = {key: i for i, key in enumerate(self.ids.tolist())}
+
+    @classmethod
+    def build(cls, algo, k: int = 8):
+        """
+        Selects k landmarks by farthest-first traversal and computes their distances with Dijkstra
+        @param algo: The GraphAlgo of the graph
+        @param k: The number of landmarks
+        @return: The landmark index of the graph
+        """
+        graph = algo.get_graph()
+        reversed_graph = algo.reversed_graph()
+        ids = list(graph.get_all_v().keys())
+        index = {key: i for i, key in enumerate(ids)}
+        n = len(ids)
+        k = min(k, n)
+        from_landmarks = np.full((n, k), np.inf)
+        to_landmarks = np.full((n, k), np.inf)
+        landmarks = []
+        closest = np.full(n, np.inf)
+        for i in range(0, k):
+            if i == 0:
+                landmark = ids[0]
+            else:
+                # the node farthest from the chosen landmarks, nodes they do not reach at all come first
+                landmark = ids[int(np.argmax(closest))]
+            landmarks.append(landmark)
+            for key, d in algo.dijkstra(landmark)[0].items():
+                from_landmarks[index[key], i] = d
+            for key, d in algo.dijkstra(landmark, graph=reversed_graph)[0].items():
+                to_landmarks[index[key], i] = d
+            closest = np.minimum(closest, from_landmarks[:, i] + to_landmarks[:, i])
+            closest[index[landmark]] = -1
+        return cls(ids, landmarks, from_landmarks, to_landmarks, graph.get_mc(), edges_checksum(graph))
+
+    def get_mc(self) -> int:
+        """
+        Returns the version of the graph the index was built on
+        @return: The version of the graph
+        """
+        return self.mc
+
+    def matches(self, graph) -> bool:
+        """
+        Returns if the index was built on the current version of the graph, this checks every node and edge
+        (see edges_checksum) so it is meant for an index that was loaded from a file.
+        Two graphs can have the same mc and nodes but not the same weights, then the index is not a lower bound
+        @param graph: The graph
+        @return: True if the index can be used with the graph, False if it has to be rebuilt
+        """
+        return self.mc == graph.get_mc() and len(self.ids) == graph.v_size() and \
+            all(graph.get_all_v().__contains__(key) for key in self.ids.tolist()) and \
+            self.checksum is not None and self.checksum == edges_checksum(graph)
+
+    def estimate(self, id2: int):
+        """
+        Returns the A* heuristic towards id2
+        @param id2: The end node id
+        @return: A function of node id -> lower bound of the distance from the node to id2
+        """
+        from_target = self.from_landmarks[self.index[id2]]
+        to_target = self.to_landmarks[self.index[id2]]
+        from_landmarks = self.from_landmarks
+        to_landmarks = self.to_landmarks
+        index = self.index
+
+        def estimate(node_id: int) -> float:
+            i = index[node_id]
+            with np.errstate(invalid="ignore"):
+                bounds = np.concatenate((from_target - from_landmarks[i], to_landmarks[i] - to_target))
+            # inf - inf says nothing about the distance
+            bound = np.nanmax(bounds, initial=0.0)
+            return float(bound) if bound > 0 else 0.0
+
+        return estimate
+
+    def save(self, file_name: str):
+        """
+        Saves the index to a file (a numpy .npz archive)
+        @param file_name: The path to the out file
+        @return:
+        """
+        with open(file_name, "wb") as file:
+            np.savez(file, ids=self.ids, landmarks=np.array(self.landmarks, dtype=np.int64),
+                     from_landmarks=self.from_landmarks, to_landmarks=self.to_landmarks, mc=np.int64(self.mc),
+                     checksum=np.int64(-1 if self.checksum is None else self.checksum))
+
+    @classmethod
+    def load(cls, file_name: str):
+        """
+        Loads an index saved by save
+        @param file_name: The path to the index file
+        @return: The landmark index
+        """
+        with np.load(file_name) as data:
+            checksum = int(data["checksum"])
+            return cls(data["ids"], data["landmarks"].tolist(), data["from_landmarks"], data["to_landmarks"],
+                       int(data["mc"]), None if checksum < 0 else checksum)
+
+    def __repr__(self):
+        return f"LandmarkIndex: landmarks = {self.landmarks}, mc = {self.mc}"
@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import OrderedDict
+from src.GraphInterface import GraphInterface
+
+QUERY_CACHE_SIZE = 4096
+
+
+class QueryCache:
+    """
+    This class represents a bounded cache of query results of a graph, used by GraphAlgo for
+    shortest_path, connected_component and connected_components.
+    Keys are ("shortest_path", id1, id2), ("connected_component", id1) and ("connected_components",),
+    the values are stored as tuples so no caller can change them.
+    The least recently used entry is evicted when the cache is full, and an entry expires ttl seconds after it was put.
+    All the entries belong to one version of the graph (get_mc) and are dropped when it changes,
+    unless keep_unaffected is True: then the cache observes the changes of the graph (see DiGraph.subscribe)
+    and keeps the entries that cannot be affected by them:
+    removing an edge keeps the paths that do not use it and the components if its ends are in different SCCs,
+    adding an edge keeps the components if its ends are in the same SCC,
+    adding a node only drops the entries of the node and the list of all the components,
+    a batch of several operations (see DiGraph.batch) drops all the entries.
+    """
+
+    def __init__(self, graph: GraphInterface, maxsize: int = QUERY_CACHE_SIZE, ttl: float = None,
+                 keep_unaffected: bool = False, clock=time.monotonic):
+        self.graph = graph
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.mc = graph.get_mc()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.keep_unaffected = keep_unaffected
+        if keep_unaffected:
+            graph.subscribe(self.on_mutation)
+
+    def close(self):
+        """
+        Stops observing the graph
+        @return:
+        """
+        if self.keep_unaffected:
+            self.graph.unsubscribe(self.on_mutation)
+
+    def get(self, key: tuple) -> (bool, tuple):
+        """
+        Returns the cached result of a query on the current version of the graph
+        @param key: The key of the query
+        @return: True and the result if it is cached, False and None o.w.
+        """
+        with self.lock:
+            self.check_version()
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl is not None and entry[1] <= self.clock():
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key: tuple, value: tuple):
+        """
+        Caches the result of a query on the current version of the graph
+        @param key: The key of the query
+        @param value: The result of the query
+        @return:
+        """
+        if self.maxsize <= 0:
+            return
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self.lock:
+            self.check_version()
+            self.entries[key] = (value, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drops all the entries, the counters are kept
+        @return:
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def check_version(self):
+        """
+        Drops all the entries if the graph changed since they were put (the caller holds self.lock)
+        @return:
+        """
+        mc = self.graph.get_mc()
+        if self.mc != mc:
+            self.entries.clear()
+            self.mc = mc
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the cache
+        @return: A dict with the number of hits, misses, evictions and entries
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.entries)}
+
+    def on_mutation(self, mutation):
+        """
+        Drops the entries that a change of the graph may affect
+        @param mutation: The change (see DiGraph.Mutation)
+        @return:
+        """
+        with self.lock:
+            try:
+                if mutation.kind == "batch" or mutation.mc not in (self.mc, self.mc + 1):
+                    # some change was not observed, or can not be replayed
+                    self.entries.clear()
+                elif mutation.kind == "remove_edge":
+                    self.edge_removed(mutation.id1, mutation.id2)
+                elif mutation.kind == "add_edge":
+                    self.edge_added(mutation.id1, mutation.id2)
+                else:
+                    self.node_changed(mutation.id1)
+            except BaseException:
+                self.entries.clear()
+                raise
+            finally:
+                self.mc = mutation.mc
+
+    def same_component(self, id1: int, id2: int):
+        """
+        Returns if two nodes are in the same SCC, according to the cached components
+        @param id1: The first node id
+        @param id2: The second node id
+        @return: True or False, None if no cached entry tells
+        """
+        entry = self.entries.get(("connected_component", id1))
+        if entry is not None:
+            return id2 in entry[0]
+        entry = self.entries.get(("connected_components",))
+        if entry is not None:
+            for component in entry[0]:
+                if id1 in component:
+                    return id2 in component
+        return None
+
+    def drop(self, predicate):
+        """
+        Drops the entries that match the predicate
+        @param predicate: A function of (key, value) -> bool
+        @return:
+        """
+        for key in [key for key, (value, expires) in self.entries.items() if predicate(key, value)]:
+            del self.entries[key]
+
+    def edge_removed(self, id1: int, id2: int):
+        """
+        Drops the paths that use the edge id1 -> id2, and the components if id1 and id2 may be in the same SCC
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @return:
+        """
+        same_component = self.same_component(id1, id2) is not False
+
+        def affected(key: tuple, value: tuple) -> bool:
+            if key[0] == "shortest_path":
+                path = value[1]
+                return any(path[i] == id1 and path[i + 1] == id2 for i in range(0, len(path) - 1))
+            return same_component
+
+        self.drop(affected)
+
+    def edge_added(self, id1: int, id2: int):
+        """
+        Drops the paths, since the edge may shorten any of them, and the components if id1 and id2 may be in
+        different SCCs
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @return:
+        """
+        same_component = self.same_component(id1, id2) is True
+
+        def affected(key: tuple, value: tuple) -> bool:
+            if key[0] == "shortest_path":
+                return key[1] != key[2]
+            return not same_component
+
+        self.drop(affected)
+
+    def node_changed(self, node_id: int):
+        """
+        Drops the entries of a node that was added or removed, and the list of all the components.
+        The edges of a removed node were already reported
+        @param node_id: The node id
+        @return:
+        """
+        self.drop(lambda key, value: key[0] == "connected_components" or node_id in key[1:])
+
+    def __repr__(self):
+        return f"QueryCache: {self.stats()}, mc = {self.mc}"
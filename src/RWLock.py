@@ -0,0 +1,107 @@
+import threading
+from contextlib import contextmanager
+
+
+class RWLock:
+    """
+    This class represents a reader-writer lock: many threads can read at the same time, a writer is alone.
+    Waiting writers go before new readers so a stream of queries cannot starve the changes,
+    but a thread that already reads (or writes) may always read again, and a writer may write again,
+    so locked methods can call each other.
+    A reader cannot become a writer, asking for the write lock while reading raises RuntimeError.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.writer = None
+        self.writes = 0
+        self.waiting_writers = 0
+        self.local = threading.local()
+
+    def reads(self) -> int:
+        """
+        Returns how many times the current thread holds the read lock
+        @return: The number of nested reads of the thread
+        """
+        return getattr(self.local, "reads", 0)
+
+    def acquire_read(self):
+        """
+        Waits until there is no writer (or the writer is this thread) and takes the read lock
+        @return:
+        """
+        me = threading.get_ident()
+        with self.condition:
+            if self.writer != me and self.reads() == 0:
+                while self.writer is not None or self.waiting_writers:
+                    self.condition.wait()
+            self.readers += 1
+        self.local.reads = self.reads() + 1
+
+    def release_read(self):
+        """
+        Releases the read lock
+        @return:
+        """
+        self.local.reads = self.reads() - 1
+        with self.condition:
+            self.readers -= 1
+            if self.readers == 0:
+                self.condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Waits until there are no readers and no other writer and takes the write lock
+        @return:
+        """
+        me = threading.get_ident()
+        with self.condition:
+            if self.writer == me:
+                self.writes += 1
+                return
+            if self.reads():
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self.waiting_writers += 1
+            try:
+                while self.writer is not None or self.readers:
+                    self.condition.wait()
+            finally:
+                self.waiting_writers -= 1
+            self.writer = me
+            self.writes = 1
+
+    def release_write(self):
+        """
+        Releases the write lock
+        @return:
+        """
+        with self.condition:
+            self.writes -= 1
+            if self.writes == 0:
+                self.writer = None
+                self.condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        """
+        Holds the read lock for the duration of a with block
+        @return: A context manager
+        """
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """
+        Holds the write lock for the duration of a with block
+        @return: A context manager
+        """
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
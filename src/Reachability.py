@@ -0,0 +1,120 @@
+import numpy as np
+from src.CSRGraph import CSRGraph
+
+
+def bfs_hops(indptr, indices, sources, max_hops: int = None) -> np.ndarray:
+    """
+    Runs a level-synchronous BFS over CSR arrays: every level gathers the edges of the whole frontier
+    with array operations, keeps the targets that were not reached yet and makes them the next frontier
+    @param indptr: The row pointers
+    @param indices: The column indices
+    @param sources: The dense indices to start from
+    @param max_hops: The maximum number of edges from a source, None for no limit
+    @return: The number of edges from the closest source for every index, -1 for the indices that were not reached
+    """
+    hops = np.full(len(indptr) - 1, -1, dtype=np.int64)
+    frontier = np.unique(np.asarray(sources, dtype=np.int64))
+    hops[frontier] = 0
+    level = 0
+    while frontier.size and (max_hops is None or level < max_hops):
+        level += 1
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        # the position of every edge of the frontier in indices
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        targets = indices[offsets]
+        frontier = np.unique(targets[hops[targets] < 0])
+        hops[frontier] = level
+    return hops
+
+
+class Reachability:
+    """
+    This class represents a reachability engine over a CSR snapshot of a graph,
+    the searches are level-synchronous BFS over the arrays of the snapshot (see bfs_hops),
+    forwards on the out-edges and backwards on the in-edges.
+    Every query takes one or more node ids, the nodes that are not in the graph are ignored.
+    """
+
+    def __init__(self, graph: CSRGraph):
+        self.graph = graph
+
+    def get_mc(self) -> int:
+        """
+        Returns the version of the graph the snapshot was built from
+        @return: The version of the graph
+        """
+        return self.graph.get_mc()
+
+    def indices(self, node_ids) -> list:
+        """
+        Returns the dense indices of the nodes that are in the graph
+        @param node_ids: The node ids
+        @return: The list of dense indices
+        """
+        index = self.graph.index
+        return [index[key] for key in node_ids if key in index]
+
+    def forward_hops(self, sources, max_hops: int = None) -> np.ndarray:
+        """
+        Returns the number of edges from the closest source to every index
+        @param sources: The node ids to start from
+        @param max_hops: The maximum number of edges, None for no limit
+        @return: The hops array (see bfs_hops)
+        """
+        return bfs_hops(self.graph.indptr, self.graph.indices, self.indices(sources), max_hops)
+
+    def backward_hops(self, targets, max_hops: int = None) -> np.ndarray:
+        """
+        Returns the number of edges from every index to the closest target
+        @param targets: The node ids to end at
+        @param max_hops: The maximum number of edges, None for no limit
+        @return: The hops array (see bfs_hops)
+        """
+        return bfs_hops(self.graph.in_indptr, self.graph.in_indices, self.indices(targets), max_hops)
+
+    def reachable_from(self, *sources, max_hops: int = None) -> list:
+        """
+        Returns the nodes that are reachable from any of the sources (including the sources)
+        @param sources: The start node ids
+        @param max_hops: The maximum number of edges of a path, None for no limit (k-hop neighborhood)
+        @return: The list of node ids, in the order of the graph
+        """
+        return self.graph.ids[self.forward_hops(sources, max_hops) >= 0].tolist()
+
+    def reaches(self, *targets, max_hops: int = None) -> list:
+        """
+        Returns the nodes that reach any of the targets (including the targets)
+        @param targets: The end node ids
+        @param max_hops: The maximum number of edges of a path, None for no limit
+        @return: The list of node ids, in the order of the graph
+        """
+        return self.graph.ids[self.backward_hops(targets, max_hops) >= 0].tolist()
+
+    def hop_distances(self, *sources, max_hops: int = None) -> dict:
+        """
+        Returns the number of edges on the shortest unweighted path from the closest source to every reachable node
+        @param sources: The start node ids
+        @param max_hops: The maximum number of edges of a path, None for no limit
+        @return: A dict of node id -> number of edges
+        """
+        hops = self.forward_hops(sources, max_hops)
+        reached = np.flatnonzero(hops >= 0)
+        return dict(zip(self.graph.ids[reached].tolist(), hops[reached].tolist()))
+
+    def strongly_connected(self, node_id: int) -> list:
+        """
+        Returns the SCC of a node: the nodes it reaches that also reach it
+        @param node_id: The node id
+        @return: The list of node ids in the SCC, in the order of the graph, [] if the node is not in the graph
+        """
+        if node_id not in self.graph.index:
+            return []
+        both = (self.forward_hops((node_id,)) >= 0) & (self.backward_hops((node_id,)) >= 0)
+        return self.graph.ids[both].tolist()
+
+    def __repr__(self):
+        return f"Reachability: |V| = {self.graph.v_size()}, mc = {self.get_mc()}"
@@ -0,0 +1,59 @@
+class ShortestPathTree:
+    """This class represents the shortest paths from a single source to every node it reaches."""
+
+    def __init__(self, src: int, dist: dict, parent: dict, mc: int = 0):
+        self.src = src
+        self.dist = dist
+        self.parent = parent
+        self.mc = mc
+
+    def get_src(self) -> int:
+        """
+        Returns the source of the tree
+        @return: The source node id
+        """
+        return self.src
+
+    def get_mc(self) -> int:
+        """
+        Returns the version of the graph the tree was computed on
+        @return: The version of the graph
+        """
+        return self.mc
+
+    def distance(self, dest: int) -> float:
+        """
+        Returns the distance of the shortest path from the source to dest
+        @param dest: The end node id
+        @return: The distance, inf if dest is not reachable
+        """
+        return self.dist.get(dest, float("inf"))
+
+    def path(self, dest: int) -> list:
+        """
+        Returns the shortest path from the source to dest, in O(length of the path)
+        @param dest: The end node id
+        @return: The list of the nodes ids that the path goes through, [] if dest is not reachable
+        """
+        if dest not in self.dist:
+            return []
+        path_list = []
+        prev_node = dest
+        while prev_node is not None:
+            path_list.append(prev_node)
+            prev_node = self.parent.get(prev_node)
+        path_list.reverse()
+        return path_list
+
+    def reachable(self) -> list:
+        """
+        Returns the nodes that are reachable from the source (including the source)
+        @return: The list of the reachable nodes ids
+        """
+        return list(self.dist.keys())
+
+    def __contains__(self, node_id: int) -> bool:
+        return node_id in self.dist
+
+    def __repr__(self):
+        return f"ShortestPathTree: src = {self.src}, |reachable| = {len(self.dist)}, mc = {self.mc}"
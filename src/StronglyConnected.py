@@ -0,0 +1,232 @@
+from src.GraphInterface import GraphInterface
+
+
+def tarjan_scc(nodes, out_edges, allowed: set = None) -> list:
+    """
+    Computes the SCCs with an iterative version of Tarjan's algorithm in O(|V| + |E|)
+    @param nodes: The node ids to start from
+    @param out_edges: A function of node id -> its out-edges
+    @param allowed: If given, the search is restricted to the subgraph induced by these nodes
+    @return: The list of all SCC, in topological order of the condensed graph
+    More info:
+    https://en.wikipedia.org/wiki/Tarjan%27s_strongly_connected_components_algorithm
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(out_edges(root)))]
+        while work:
+            node_id, neighbors = work[-1]
+            for id2 in neighbors:
+                if allowed is not None and id2 not in allowed:
+                    continue
+                if id2 not in index:
+                    index[id2] = low[id2] = counter
+                    counter += 1
+                    stack.append(id2)
+                    on_stack.add(id2)
+                    work.append((id2, iter(out_edges(id2))))
+                    break
+                if id2 in on_stack and index[id2] < low[node_id]:
+                    low[node_id] = index[id2]
+            else:
+                work.pop()
+                if work and low[node_id] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node_id]
+                if low[node_id] == index[node_id]:
+                    start = len(stack) - 1
+                    while stack[start] != node_id:
+                        start -= 1
+                    component = stack[start:]
+                    del stack[start:]
+                    on_stack.difference_update(component)
+                    components.append(component)
+    components.reverse()
+    return components
+
+
+class IncrementalSCC:
+    """
+    This class maintains the SCCs of a DiGraph while it changes, by observing its mutations (see DiGraph.subscribe):
+    adding an edge u -> v between different SCCs merges the SCCs on the cycles it closes (the nodes that are
+    reachable from v and reach u), removing an edge inside an SCC recomputes only that SCC,
+    and the other changes only touch the SCC of the changed node.
+    Between changes the SCC of a node is a dict lookup.
+    """
+
+    def __init__(self, graph: GraphInterface):
+        self.graph = graph
+        self.component_of = {}
+        self.members = {}
+        self.next_id = 0
+        self.mc = -1
+        self.rebuild()
+        graph.subscribe(self.on_mutation)
+
+    def close(self):
+        """
+        Stops observing the graph
+        @return:
+        """
+        self.graph.unsubscribe(self.on_mutation)
+
+    def rebuild(self):
+        """
+        Recomputes all the SCCs of the graph from scratch
+        @return:
+        """
+        self.component_of = {}
+        self.members = {}
+        for component in tarjan_scc(self.graph.get_all_v().keys(), self.graph.all_out_edges_of_node):
+            self.new_component(component)
+        self.mc = self.graph.get_mc()
+
+    def is_current(self) -> bool:
+        """
+        Returns if every change of the graph was observed
+        @return: True if the SCCs are up to date, False o.w.
+        """
+        return self.mc == self.graph.get_mc()
+
+    def new_component(self, nodes) -> int:
+        """
+        Registers a new SCC
+        @param nodes: The nodes of the SCC
+        @return: The id of the SCC
+        """
+        component_id = self.next_id
+        self.next_id += 1
+        self.members[component_id] = dict.fromkeys(nodes)
+        for node_id in self.members[component_id]:
+            self.component_of[node_id] = component_id
+        return component_id
+
+    def on_mutation(self, mutation):
+        """
+        Updates the SCCs after a change of the graph
+        @param mutation: The change (see DiGraph.Mutation)
+        @return:
+        """
+        if mutation.kind == "batch" or mutation.mc not in (self.mc, self.mc + 1):
+            # some change was not observed, or can not be replayed
+            self.rebuild()
+            return
+        try:
+            if mutation.kind == "add_node":
+                self.new_component([mutation.id1])
+            elif mutation.kind == "add_edge":
+                self.edge_added(mutation.id1, mutation.id2)
+            elif mutation.kind == "remove_edge":
+                self.edge_removed(mutation.id1, mutation.id2)
+            elif mutation.kind == "remove_node":
+                component_id = self.component_of.pop(mutation.id1)
+                members = self.members.pop(component_id)
+                del members[mutation.id1]
+                if members:
+                    self.split_members(members)
+        except BaseException:
+            # the SCCs may be half-updated, they are rebuilt on the next change or query
+            self.mc = -1
+            raise
+        self.mc = mutation.mc
+
+    def edge_added(self, id1: int, id2: int):
+        """
+        Merges the SCCs that the edge id1 -> id2 closes a cycle through
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @return:
+        """
+        if self.component_of[id1] == self.component_of[id2]:
+            return
+        forward = self.search(id2, self.graph.all_out_edges_of_node)
+        if id1 not in forward:
+            return
+        cycle = self.search(id1, self.graph.all_in_edges_of_node, forward)
+        merged = {self.component_of[node_id] for node_id in cycle}
+        nodes = []
+        for component_id in merged:
+            nodes.extend(self.members.pop(component_id))
+        self.new_component(nodes)
+
+    def edge_removed(self, id1: int, id2: int):
+        """
+        Recomputes the SCC of the edge id1 -> id2 after it was removed, if both its nodes are in the same SCC.
+        When the edge was removed with one of its nodes, the SCC is recomputed when the node removal is observed
+        @param id1: The start node of the removed edge
+        @param id2: The end node of the removed edge
+        @return:
+        """
+        nodes = self.graph.get_all_v()
+        if not nodes.__contains__(id1) or not nodes.__contains__(id2):
+            return
+        component_id = self.component_of[id1]
+        if self.component_of[id2] == component_id:
+            self.split_members(self.members.pop(component_id))
+
+    def split_members(self, members: dict):
+        """
+        Recomputes the SCCs of the subgraph induced by members
+        @param members: The nodes of a former SCC
+        @return:
+        """
+        for component in tarjan_scc(members, self.graph.all_out_edges_of_node, members):
+            self.new_component(component)
+
+    @staticmethod
+    def search(node_id: int, edges_of_node, allowed=None) -> set:
+        """
+        Returns the nodes reachable from node_id
+        @param node_id: The start node
+        @param edges_of_node: A function of node id -> its edges to follow
+        @param allowed: If given, the search is restricted to these nodes
+        @return: The set of reachable nodes
+        """
+        visited = {node_id}
+        stack = [node_id]
+        while stack:
+            for id2 in edges_of_node(stack.pop()):
+                if id2 not in visited and (allowed is None or id2 in allowed):
+                    visited.add(id2)
+                    stack.append(id2)
+        return visited
+
+    def component_id(self, node_id: int):
+        """
+        Returns the id of the SCC that the node is a part of
+        @param node_id: The node id
+        @return: The id of the SCC, None if the node is not in the graph
+        """
+        if not self.is_current():
+            self.rebuild()
+        return self.component_of.get(node_id)
+
+    def connected_component(self, node_id: int) -> list:
+        """
+        Returns the SCC that the node is a part of
+        @param node_id: The node id
+        @return: The list of nodes in the SCC, [] if the node is not in the graph
+        """
+        component_id = self.component_id(node_id)
+        if component_id is None:
+            return []
+        return list(self.members[component_id])
+
+    def connected_components(self) -> list:
+        """
+        Returns all the SCCs
+        @return: The list all SCC
+        """
+        if not self.is_current():
+            self.rebuild()
+        return [list(members) for members in self.members.values()]
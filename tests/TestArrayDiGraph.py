@@ -0,0 +1,157 @@
+import os
+import random
+import tempfile
+import unittest as test
+from src.ArrayDiGraph import ArrayDiGraph
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+
+
+class TestArrayDiGraph(test.TestCase):
+
+    def test_api(self):
+        g = ArrayDiGraph()
+        for i in range(0, 5):
+            self.assertTrue(g.add_node(i, (i, 0, 0) if i else None))
+        self.assertFalse(g.add_node(0))
+        self.assertTrue(g.add_edge(0, 1, 0.5))
+        self.assertTrue(g.add_edge(1, 2, 0))
+        self.assertFalse(g.add_edge(0, 1, 3))
+        self.assertFalse(g.add_edge(3, 3, 3))
+        self.assertFalse(g.add_edge(3, 7, 3))
+        self.assertEqual(0.5, g.get_edge(0, 1))
+        self.assertEqual(-1, g.get_edge(1, 0))
+        self.assertTrue(g.has_edge(1, 2))
+        self.assertEqual({1: 0.5}, g.all_out_edges_of_node(0))
+        self.assertEqual({1: 0}, g.all_in_edges_of_node(2))
+        self.assertEqual((1.0, 0.0, 0.0), g.get_node(1).pos)
+        self.assertIsNone(g.get_node(0).pos)
+        self.assertEqual(g.get_node(0).get_pos(), g.get_node(0).pos)
+        self.assertTrue(g.get_all_v()[0].pos_generated)
+        self.assertIsNone(g.get_node(9))
+        self.assertTrue(g.remove_edge(1, 2))
+        self.assertFalse(g.remove_edge(1, 2))
+        self.assertTrue(g.remove_node(1))
+        self.assertEqual([0, 2, 3, 4], list(g.get_all_v()))
+        self.assertEqual(0, g.e_size())
+        self.assertEqual(9, g.get_mc())
+
+    def test_same_as_digraph(self):
+        rnd = random.Random(5)
+        g = ArrayDiGraph()
+        expected = DiGraph()
+        events = []
+        g.subscribe(events.append)
+        expected_events = []
+        expected.subscribe(expected_events.append)
+        for step in range(0, 3000):
+            action = rnd.random()
+            id1, id2 = rnd.randrange(60), rnd.randrange(60)
+            if action < 0.5:
+                w = rnd.randint(1, 9)
+                self.assertEqual(expected.add_edge(id1, id2, w), g.add_edge(id1, id2, w))
+            elif action < 0.8:
+                self.assertEqual(expected.remove_edge(id1, id2), g.remove_edge(id1, id2))
+            elif action < 0.9:
+                self.assertEqual(expected.add_node(id1), g.add_node(id1))
+            else:
+                self.assertEqual(expected.remove_node(id1), g.remove_node(id1))
+        self.assertEqual(expected_events, events)
+        self.assertEqual(expected.e_size(), g.e_size())
+        self.assertEqual(expected.get_mc(), g.get_mc())
+        self.assertEqual(list(expected.get_all_v()), list(g.get_all_v()))
+        for key in expected.get_all_v():
+            self.assertEqual(expected.all_out_edges_of_node(key), g.all_out_edges_of_node(key))
+            self.assertEqual(expected.all_in_edges_of_node(key), g.all_in_edges_of_node(key))
+        self.assertEqual(g, expected)
+        self.assertLessEqual(len(g.ids), 2 * g.v_size() + 1)
+        g.compact()
+        self.assertEqual(g.v_size(), len(g.ids))
+        for key in expected.get_all_v():
+            self.assertEqual(expected.all_out_edges_of_node(key), g.all_out_edges_of_node(key))
+
+    def test_batch_rollback(self):
+        rnd = random.Random(9)
+        g = ArrayDiGraph()
+        g.add_nodes_bulk((i, (i, 0, 0)) for i in range(0, 30))
+        g.add_edges_bulk((rnd.randrange(30), rnd.randrange(30), rnd.randint(1, 9)) for i in range(0, 120))
+        edges = {key: g.all_out_edges_of_node(key) for key in g.get_all_v()}
+        mc, e_size = g.get_mc(), g.e_size()
+        with self.assertRaises(ValueError):
+            with g.batch():
+                for step in range(0, 200):
+                    id1, id2 = rnd.randrange(35), rnd.randrange(35)
+                    action = rnd.random()
+                    if action < 0.4:
+                        g.add_edge(id1, id2, 1)
+                    elif action < 0.7:
+                        g.remove_edge(id1, id2)
+                    elif action < 0.85:
+                        g.remove_node(id1)
+                    else:
+                        g.add_node(id1)
+                raise ValueError("abort")
+        # the MC is increased, the caches of the rolled back changes are dropped
+        self.assertEqual((mc + 1, e_size), (g.get_mc(), g.e_size()))
+        self.assertEqual(edges, {key: g.all_out_edges_of_node(key) for key in g.get_all_v()})
+        self.assertEqual((4.0, 0.0, 0.0), g.get_node(4).pos)
+        for key in edges:
+            self.assertEqual({src: w for src in edges for dest, w in edges[src].items() if dest == key},
+                             g.all_in_edges_of_node(key))
+
+    def test_hub(self):
+        rnd = random.Random(3)
+        g = ArrayDiGraph()
+        expected = DiGraph()
+        for graph in (g, expected):
+            graph.add_nodes_bulk((i, None) for i in range(0, 3001))
+            graph.add_edges_bulk([(0, i, i) for i in range(1, 3001)] + [(i, 0, i) for i in range(1, 3001, 2)])
+            graph.add_edges_bulk([(0, i, 1) for i in range(1, 3001)] + [(1, 2, 1), (1, 2, 1)])
+        self.assertEqual(expected.e_size(), g.e_size())
+        self.assertIsNotNone(g.out_slots[g.index[0]])
+        self.assertIsNone(g.out_slots[g.index[1]])
+
+        def check():
+            for i in g.index.values():
+                for nodes, slots in ((g.out_nodes[i], g.out_slots[i]), (g.in_nodes[i], g.in_slots[i])):
+                    if slots is not None:
+                        self.assertEqual({j: k for k, j in enumerate(nodes) if j >= 0}, slots)
+            for key in expected.get_all_v():
+                self.assertEqual(expected.all_out_edges_of_node(key), g.all_out_edges_of_node(key))
+                self.assertEqual(expected.all_in_edges_of_node(key), g.all_in_edges_of_node(key))
+
+        removed = [(0, rnd.randrange(1, 3001)) for i in range(0, 2500)]
+        self.assertEqual(expected.remove_edges_bulk(removed), g.remove_edges_bulk(removed))
+        for i in range(0, 1700):
+            node_id = rnd.randrange(1, 3001)
+            self.assertEqual(expected.remove_node(node_id), g.remove_node(node_id))
+        for i in range(1, 3001):
+            self.assertEqual(expected.get_edge(0, i), g.get_edge(0, i))
+            self.assertEqual(expected.add_edge(i, 0, 2), g.add_edge(i, 0, 2))
+        check()
+        g.compact()
+        check()
+
+    def test_graph_algo(self):
+        g = DiGraph()
+        for i in range(0, 4):
+            g.add_node(i, (i, i, 0))
+        for id1, id2, w in ((0, 1, 1), (1, 2, 1), (2, 0, 1), (0, 3, 5)):
+            g.add_edge(id1, id2, w)
+        fd, file_name = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            GraphAlgo(g).save_to_json(file_name)
+            graph = GraphAlgo()
+            self.assertTrue(graph.load_from_json(file_name, ArrayDiGraph))
+        finally:
+            os.remove(file_name)
+        self.assertIsInstance(graph.get_graph(), ArrayDiGraph)
+        self.assertEqual((5, [0, 3]), graph.shortest_path(0, 3))
+        self.assertEqual((2, [1, 2, 0]), graph.shortest_path(1, 0))
+        self.assertEqual([0, 1, 2], sorted(graph.connected_component(2)))
+        self.assertEqual((3.0, 3.0, 0.0), graph.snapshot().get_node(3).pos)
+
+
+if __name__ == '__main__':
+    test.main()
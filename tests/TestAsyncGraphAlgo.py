@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import unittest as test
+from src.AsyncGraphAlgo import AsyncGraphAlgo
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+
+
+class GatedGraphAlgo(GraphAlgo):
+    """A GraphAlgo whose connected_components waits for a gate and counts its calls"""
+
+    def __init__(self, graph: DiGraph):
+        super().__init__(graph)
+        self.gate = threading.Event()
+        self.calls = 0
+
+    def connected_components(self):
+        self.calls += 1
+        self.gate.wait(5)
+        return super().connected_components()
+
+
+def line_graph(n: int) -> DiGraph:
+    g = DiGraph()
+    for i in range(0, n):
+        g.add_node(i)
+    for i in range(0, n - 1):
+        g.add_edge(i, i + 1, 1)
+    return g
+
+
+class TestAsyncGraphAlgo(test.TestCase):
+
+    def test_queries(self):
+        algo = GraphAlgo(line_graph(5))
+
+        async def main():
+            async with AsyncGraphAlgo(algo) as graph:
+                self.assertEqual((4, [0, 1, 2, 3, 4]), await graph.shortest_path(0, 4))
+                self.assertEqual((3, [1, 2, 3, 4]), await graph.shortest_path(1, 4, method="bidirectional"))
+                self.assertEqual([2], await graph.connected_component(2))
+                self.assertEqual(5, len(await graph.connected_components()))
+                self.assertEqual((1, [0, 1]), await graph.nearest_of(0, [1, 3]))
+                self.assertEqual({3: (3, [0, 1, 2, 3])}, await graph.shortest_paths_to_many(0, [3]))
+                self.assertEqual(2, (await graph.shortest_path_tree(0)).distance(2))
+
+        asyncio.run(main())
+
+    def test_coalesce(self):
+        algo = GatedGraphAlgo(line_graph(5))
+
+        async def main():
+            async with AsyncGraphAlgo(algo) as graph:
+                first = asyncio.ensure_future(graph.connected_components())
+                second = asyncio.ensure_future(graph.connected_components())
+                await asyncio.sleep(0.05)
+                algo.gate.set()
+                self.assertEqual(await first, await second)
+                self.assertEqual(1, algo.calls)
+                self.assertEqual(1, graph.coalesced)
+                self.assertEqual({}, graph.in_flight)
+
+        asyncio.run(main())
+
+    def test_retry_after_timeout(self):
+        algo = GatedGraphAlgo(line_graph(5))
+
+        async def main():
+            async with AsyncGraphAlgo(algo) as graph:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await graph.connected_components(timeout=0.05)
+                retry = asyncio.ensure_future(graph.connected_components())
+                await asyncio.sleep(0.05)
+                # the cancelled computation must not drop the new one
+                self.assertEqual(1, len(graph.in_flight))
+                again = asyncio.ensure_future(graph.connected_components())
+                algo.gate.set()
+                self.assertEqual(await retry, await again)
+                self.assertEqual(1, graph.coalesced)
+                self.assertEqual({}, graph.in_flight)
+
+        asyncio.run(main())
+
+    def test_timeout_and_backpressure(self):
+        algo = GatedGraphAlgo(line_graph(5))
+
+        async def main():
+            async with AsyncGraphAlgo(algo, max_pending=1) as graph:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await graph.connected_components(timeout=0.05)
+                # the computation still holds the only slot
+                with self.assertRaises(asyncio.TimeoutError):
+                    await graph.shortest_path(0, 4, timeout=0.05)
+                algo.gate.set()
+                self.assertEqual((4, [0, 1, 2, 3, 4]), await graph.shortest_path(0, 4, timeout=5))
+                query = asyncio.ensure_future(graph.shortest_path(0, 3))
+                await asyncio.sleep(0)
+                query.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await query
+                self.assertEqual((3, [0, 1, 2, 3]), await graph.shortest_path(0, 3))
+
+        asyncio.run(main())
+
+
+if __name__ == '__main__':
+    test.main()
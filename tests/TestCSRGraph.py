@@ -0,0 +1,90 @@
+import os
+import random
+import tempfile
+import unittest as test
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from src.GraphBinary import load_binary, save_binary
+
+
+def build_graph() -> DiGraph:
+    g = DiGraph()
+    for i in range(0, 6):
+        g.add_node(i, (i, i * 2, 0))
+    g.add_edge(0, 1, 1)
+    g.add_edge(1, 2, 2)
+    g.add_edge(2, 0, 3)
+    g.add_edge(2, 3, 4)
+    g.add_edge(3, 4, 5)
+    g.add_edge(4, 3, 6)
+    g.add_edge(0, 5, 7)
+    return g
+
+
+class TestCSRGraph(test.TestCase):
+
+    def test_freeze(self):
+        g = build_graph()
+        csr = g.freeze()
+        self.assertIs(csr, g.freeze())
+        self.assertEqual(g.v_size(), csr.v_size())
+        self.assertEqual(g.e_size(), csr.e_size())
+        self.assertEqual(g.get_mc(), csr.get_mc())
+        for key in g.get_all_v():
+            self.assertEqual(g.all_out_edges_of_node(key), csr.all_out_edges_of_node(key))
+            self.assertEqual(g.all_in_edges_of_node(key), csr.all_in_edges_of_node(key))
+        self.assertEqual((1.0, 2.0, 0.0), csr.get_node(1).get_pos())
+        self.assertTrue(5 in csr.get_all_v())
+        self.assertFalse(9 in csr.get_all_v())
+        self.assertEqual(2, csr.get_edge(1, 2))
+        self.assertEqual(-1, csr.get_edge(2, 1))
+        self.assertFalse(csr.add_edge(5, 0, 1))
+
+    def test_invalidated_by_mc(self):
+        g = build_graph()
+        csr = g.freeze()
+        g.add_edge(5, 0, 1)
+        self.assertIsNot(csr, g.freeze())
+        self.assertEqual(g.e_size(), g.freeze().e_size())
+        self.assertEqual(g.e_size() - 1, csr.e_size())
+
+    def test_algorithms(self):
+        g = build_graph()
+        graph = GraphAlgo(g)
+        frozen = GraphAlgo(g.freeze())
+        self.assertEqual(graph.shortest_path(1, 4), frozen.shortest_path(1, 4))
+        self.assertEqual(graph.shortest_path(5, 0), frozen.shortest_path(5, 0))
+        self.assertEqual(sorted(graph.connected_component(1)), sorted(frozen.connected_component(1)))
+        self.assertEqual(len(graph.connected_components()), len(frozen.connected_components()))
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "json_file")
+            self.assertTrue(frozen.save_to_json(file))
+            self.assertTrue(graph.load_from_json(file))
+        self.assertEqual(g, graph.get_graph())
+
+    def test_traversals(self):
+        rnd = random.Random(6)
+        g = DiGraph()
+        g.add_nodes_bulk((i * 7, None) for i in range(0, 300))
+        g.add_edges_bulk((rnd.randrange(300) * 7, rnd.randrange(300) * 7, rnd.randint(1, 9)) for i in range(0, 900))
+        graph = GraphAlgo(g)
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "binary_file")
+            save_binary(g, file)
+            # the loaded arrays are little-endian memory maps
+            for csr in (g.freeze(), load_binary(file, mmap=True)):
+                frozen = GraphAlgo(csr)
+                for src in (0, 7, 140):
+                    self.assertEqual(list(graph.settle(src)), list(frozen.settle(src)))
+                    self.assertEqual(graph.dfs(src), frozen.dfs(src))
+                    # the in-edges of a snapshot are sorted, the order of the nodes at the same depth differs
+                    self.assertEqual({node_id: dist for node_id, dist, parent in graph.settle(src, g.reversed())},
+                                     {node_id: dist for node_id, dist, parent in frozen.settle(src, csr.reversed())})
+                    self.assertEqual(sorted(graph.dfs(src, graph=g.reversed())),
+                                     sorted(frozen.dfs(src, graph=csr.reversed())))
+                marks = {node_id: "visited" for node_id in g.get_all_v() if node_id % 2}
+                self.assertEqual(graph.dfs(7, marks), frozen.dfs(7, marks))
+
+
+if __name__ == '__main__':
+    test.main()
@@ -0,0 +1,76 @@
+import random
+import unittest as test
+from src.Condensation import LABELS, Condensation
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+
+
+class TestCondensation(test.TestCase):
+
+    def test_build(self):
+        g = DiGraph()
+        for i in range(0, 6):
+            g.add_node(i)
+        for id1, id2 in ((0, 1), (1, 0), (1, 2), (2, 3), (3, 2), (0, 4), (4, 3)):
+            g.add_edge(id1, id2, 1)
+        condensation = Condensation.build(g)
+        self.assertEqual(4, len(condensation.components))
+        c0, c2, c4, c5 = (condensation.component(i) for i in (0, 2, 4, 5))
+        self.assertEqual(c0, condensation.component(1))
+        self.assertEqual(c2, condensation.component(3))
+        self.assertEqual({(c0, c2), (c0, c4), (c4, c2)}, set(condensation.dag_edges()))
+        self.assertTrue(all(c < s for c, s in condensation.dag_edges()))
+        self.assertTrue(condensation.can_reach(1, 3))
+        self.assertTrue(condensation.can_reach(4, 2))
+        self.assertTrue(condensation.can_reach(3, 2))
+        self.assertFalse(condensation.can_reach(3, 0))
+        self.assertFalse(condensation.can_reach(0, 5))
+        self.assertFalse(condensation.can_reach(0, 9))
+        self.assertIsNone(condensation.component(9))
+
+    def test_can_reach(self):
+        rnd = random.Random(11)
+        g = DiGraph()
+        for i in range(0, 120):
+            g.add_node(i)
+        for i in range(0, 160):
+            g.add_edge(rnd.randrange(120), rnd.randrange(120), 1)
+        graph = GraphAlgo(g)
+        for step in range(0, 3):
+            reachable = {src: set(graph.dfs(src)) for src in g.get_all_v()}
+            for id1 in g.get_all_v():
+                for id2 in g.get_all_v():
+                    self.assertEqual(id2 in reachable[id1], graph.can_reach(id1, id2))
+            condensation = graph.condensation()
+            self.assertIs(condensation, graph.condensation())
+            g.add_edge(rnd.randrange(120), rnd.randrange(120), 1)
+            g.remove_node(rnd.randrange(120))
+            self.assertIsNot(condensation, graph.condensation())
+
+    def test_labels(self):
+        g = DiGraph()
+        g.add_nodes_bulk((i, None) for i in range(0, 50000))
+        g.add_edges_bulk((i, i + 1, 1) for i in range(0, 49999))
+        condensation = Condensation.build(g)
+        # fixed-size labels, a bitset per component would take 50000^2 / 8 bytes
+        self.assertEqual(3 * LABELS * 50000, sum(map(len, condensation.lows + condensation.starts + condensation.posts)))
+        self.assertTrue(condensation.can_reach(0, 49999))
+        self.assertTrue(condensation.can_reach(25000, 25001))
+        self.assertFalse(condensation.can_reach(49999, 0))
+
+    def test_dense_dag(self):
+        rnd = random.Random(4)
+        g = DiGraph()
+        g.add_nodes_bulk((i, None) for i in range(0, 200))
+        g.add_edges_bulk((id1, id2, 1) for id1, id2 in (sorted(rnd.sample(range(0, 200), 2)) for i in range(0, 500)))
+        graph = GraphAlgo(g)
+        condensation = graph.condensation()
+        self.assertEqual(200, len(condensation.components))
+        for id1 in g.get_all_v():
+            reachable = set(graph.dfs(id1))
+            for id2 in g.get_all_v():
+                self.assertEqual(id2 in reachable, condensation.can_reach(id1, id2))
+
+
+if __name__ == '__main__':
+    test.main()
@@ -0,0 +1,84 @@
+import os
+import random
+import tempfile
+import unittest as test
+from src.ContractionHierarchy import ContractionHierarchy
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+
+
+def build_graph(seed: int, n: int = 150) -> DiGraph:
+    rnd = random.Random(seed)
+    g = DiGraph()
+    for i in range(0, n):
+        g.add_node(i)
+    for i in range(0, n):
+        g.add_edge(i, (i + 1) % n, rnd.randint(1, 9))
+    for i in range(0, n * 2):
+        g.add_edge(rnd.randrange(n), rnd.randrange(n), rnd.randint(1, 40))
+    return g
+
+
+class TestContractionHierarchy(test.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, "hierarchy_file")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check(self, g: DiGraph, hierarchy: ContractionHierarchy, queries: int):
+        rnd = random.Random(1)
+        n = g.v_size()
+        for _ in range(0, queries):
+            id1, id2 = rnd.randrange(n), rnd.randrange(n)
+            size, path = hierarchy.query(id1, id2)
+            self.assertEqual(GraphAlgo(g).shortest_path(id1, id2)[0], size)
+            if size != float("inf"):
+                self.assertEqual(id1, path[0])
+                self.assertEqual(id2, path[-1])
+                self.assertEqual(size, sum(g.get_edge(path[i], path[i + 1]) for i in range(0, len(path) - 1)))
+
+    def test_query(self):
+        for seed in range(0, 3):
+            g = build_graph(seed)
+            self.check(g, ContractionHierarchy.build(g), 80)
+        g = build_graph(4)
+        self.check(g, ContractionHierarchy.build(g.freeze(), witness_limit=2), 40)
+        g.add_node(1000)
+        self.assertEqual((float("inf"), []), ContractionHierarchy.build(g).query(0, 1000))
+
+    def test_graph_algo(self):
+        g = build_graph(7)
+        graph = GraphAlgo(g)
+        self.assertEqual(GraphAlgo(g).shortest_path(3, 90), graph.shortest_path(3, 90, method="ch"))
+        hierarchy = graph.hierarchy
+        self.assertTrue(graph.save_hierarchy(self.file))
+        loaded = GraphAlgo(build_graph(7))
+        self.assertTrue(loaded.load_hierarchy(self.file))
+        self.check(g, loaded.hierarchy, 60)
+        g.remove_edge(3, 4)
+        self.assertFalse(graph.load_hierarchy(self.file))
+        self.assertEqual(GraphAlgo(g).shortest_path(3, 90), graph.shortest_path(3, 90, method="ch"))
+        self.assertIsNot(hierarchy, graph.hierarchy)
+
+    def test_load_other_weights(self):
+        g = build_graph(2, 40)
+        lighter = DiGraph()
+        for key in g.get_all_v():
+            lighter.add_node(key)
+        for key in g.get_all_v():
+            for dest, w in g.all_out_edges_of_node(key).items():
+                lighter.add_edge(key, dest, 1)
+        self.assertEqual(g.get_mc(), lighter.get_mc())
+        self.assertTrue(GraphAlgo(lighter).save_hierarchy(self.file))
+        # same mc and nodes, but the shortcuts have the weights of lighter
+        graph = GraphAlgo(g)
+        self.assertFalse(graph.load_hierarchy(self.file))
+        self.assertEqual(GraphAlgo(g).shortest_path(0, 20), graph.shortest_path(0, 20, method="ch"))
+        self.assertTrue(GraphAlgo(lighter).load_hierarchy(self.file))
+
+
+if __name__ == '__main__':
+    test.main()
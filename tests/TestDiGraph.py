@@ -1,5 +1,5 @@
 import unittest as test
-from src.DiGraph import DiGraph
+from src.DiGraph import DiGraph, Mutation
 
 
 class TestDiGraph(test.TestCase):
@@ -159,6 +159,140 @@ class TestDiGraph(test.TestCase):
         self.assertEqual(-1, g.get_edge(4, 1))
         self.assertEqual(-1, g.get_edge(2, 4))
 
+    def test_reversed(self):
+        g = DiGraph()
+        for i in range(0, 4):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 2)
+        g.add_edge(3, 1, 3)
+        r = g.reversed()
+        self.assertIs(r, g.reversed())
+        self.assertIs(g, r.reversed())
+        self.assertEqual({0: 1, 3: 3}, r.all_out_edges_of_node(1))
+        self.assertEqual({2: 2}, r.all_in_edges_of_node(1))
+        self.assertEqual(2, r.get_edge(2, 1))
+        self.assertFalse(r.has_edge(1, 2))
+        self.assertFalse(r.add_edge(2, 0, 1))
+        g.add_edge(2, 0, 4)
+        self.assertEqual({2: 4}, r.all_out_edges_of_node(0))
+        self.assertEqual(g.get_mc(), r.get_mc())
+        self.assertEqual({1: 1}, g.all_out_edges_of_node(0))
+
+    def test_bulk(self):
+        g = DiGraph()
+        self.assertEqual(3, g.add_nodes_bulk([(0, None), (1, (1, 2, 0)), (2, None), (1, None)]))
+        self.assertEqual(1, g.get_mc())
+        self.assertEqual((1, 2, 0), g.get_node(1).get_pos())
+        self.assertEqual(2, g.add_edges_bulk([(0, 1, 1), (1, 2, 2), (0, 1, 3), (2, 2, 1), (2, 5, 1)]))
+        self.assertEqual(2, g.get_mc())
+        self.assertEqual(2, g.e_size())
+        self.assertEqual({0: 1}, g.all_in_edges_of_node(1))
+        self.assertEqual(0, g.add_edges_bulk([(0, 1, 1)]))
+        self.assertEqual(2, g.get_mc())
+
+    def test_subscribe(self):
+        g = DiGraph()
+        events = []
+        g.subscribe(events.append)
+        g.add_node(0)
+        g.add_node(1)
+        g.add_node(1)
+        g.add_edge(0, 1, 2.5)
+        g.add_edge(1, 0, 1)
+        g.remove_edge(0, 1)
+        g.remove_node(1)
+        self.assertEqual([("add_node", 0, None, None, 1), ("add_node", 1, None, None, 2), ("add_edge", 0, 1, 2.5, 3),
+                          ("add_edge", 1, 0, 1, 4), ("remove_edge", 0, 1, 2.5, 5), ("remove_edge", 1, 0, 1, 6),
+                          ("remove_node", 1, None, None, 6)], events)
+        g.unsubscribe(events.append)
+        g.add_node(2)
+        self.assertEqual(7, len(events))
+
+    def test_zero_weight(self):
+        g = DiGraph()
+        for i in range(0, 3):
+            g.add_node(i)
+        g.add_edge(0, 1, 0)
+        g.add_edge(1, 2, 0)
+        self.assertTrue(g.remove_edge(0, 1))
+        self.assertFalse(g.has_edge(0, 1))
+        self.assertEqual({}, g.all_in_edges_of_node(1))
+        self.assertTrue(g.remove_node(2))
+        self.assertEqual({}, g.all_out_edges_of_node(1))
+        self.assertEqual(0, g.e_size())
+        self.assertEqual(0, g.remove_edges_bulk([(1, 0), (0, 1), (1, 5)]))
+
+    def test_batch(self):
+        g = DiGraph()
+        events = []
+        g.subscribe(events.append)
+        with g.batch():
+            for i in range(0, 4):
+                g.add_node(i)
+            with g.batch():
+                g.add_edge(0, 1, 1)
+            self.assertEqual(2, g.add_edges_bulk([(1, 2, 1), (2, 3, 1)]))
+            self.assertEqual(0, len(events))
+        self.assertEqual(1, g.get_mc())
+        self.assertEqual([Mutation("batch", None, None, None, 1)], events)
+        self.assertEqual(3, g.e_size())
+        self.assertEqual(2, g.remove_edges_bulk([(0, 1), (1, 2), (1, 2)]))
+        self.assertEqual(2, g.get_mc())
+        # a batch of one operation is reported like the operation
+        with g.batch():
+            g.remove_node(3)
+        self.assertEqual([("remove_edge", 2, 3), ("remove_node", 3, None)],
+                         [(event.kind, event.id1, event.id2) for event in events[3:]])
+        self.assertEqual(3, g.get_mc())
+
+    def test_failing_observer(self):
+        g = DiGraph()
+        events = []
+
+        def failing(mutation):
+            raise ValueError("observer failed")
+
+        g.subscribe(failing)
+        g.subscribe(events.append)
+        g.add_node(0)
+        g.add_node(1)
+        with g.batch():
+            g.add_edge(0, 1, 1)
+            g.add_edge(1, 0, 1)
+        self.assertEqual(3, g.get_mc())
+        self.assertEqual(2, g.e_size())
+        self.assertEqual(["add_node", "add_node", "batch"], [event.kind for event in events])
+
+    def test_batch_rollback(self):
+        g = DiGraph()
+        for i in range(0, 4):
+            g.add_node(i, (i, 0, 0))
+        g.add_edges_bulk([(0, 1, 1), (1, 2, 0), (2, 0, 3), (2, 3, 1)])
+        edges = {key: dict(g.all_out_edges_of_node(key)) for key in g.get_all_v()}
+        events = []
+        g.subscribe(events.append)
+        with self.assertRaises(KeyError):
+            with g.batch():
+                g.remove_node(2)
+                g.add_node(4)
+                g.add_edge(4, 0, 7)
+                g.remove_edge(0, 1)
+                g.add_edge(2, 1, 1)
+                g.remove_node(4)
+                raise KeyError("abort")
+        self.assertEqual([Mutation("batch", None, None, None, 6)], events)
+        self.assertEqual(6, g.get_mc())
+        self.assertEqual(4, g.e_size())
+        self.assertEqual(edges, {key: g.all_out_edges_of_node(key) for key in g.get_all_v()})
+        self.assertEqual({1: 0}, g.all_in_edges_of_node(2))
+        self.assertEqual((2, 0, 0), g.get_node(2).get_pos())
+        with self.assertRaises(KeyError):
+            with g.batch():
+                raise KeyError("nothing to roll back")
+        self.assertEqual(6, g.get_mc())
+        self.assertEqual(1, len(events))
+
 
 if __name__ == '__main__':
     test.main()
\ No newline at end of file
@@ -0,0 +1,135 @@
+import random
+import unittest as test
+from src.DiGraph import DiGraph
+from src.DynamicSSSP import DynamicSSSP
+from src.GraphAlgo import GraphAlgo
+
+
+class TestDynamicSSSP(test.TestCase):
+
+    def test_repair(self):
+        g = DiGraph()
+        for i in range(0, 4):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 1)
+        g.add_edge(2, 3, 1)
+        g.add_edge(0, 3, 5)
+        tracker = DynamicSSSP(g, [0])
+        self.assertEqual(3, tracker.tree(0).distance(3))
+        g.remove_edge(1, 2)
+        self.assertEqual(5, tracker.tree(0).distance(3))
+        self.assertEqual([0, 3], tracker.tree(0).path(3))
+        self.assertNotIn(2, tracker.tree(0))
+        g.add_edge(0, 2, 1.5)
+        self.assertEqual(2.5, tracker.tree(0).distance(3))
+        self.assertEqual([0, 2, 3], tracker.tree(0).path(3))
+        g.remove_node(0)
+        self.assertNotIn(3, tracker.tree(0))
+        g.add_node(0)
+        g.add_edge(0, 3, 2)
+        self.assertEqual(2, tracker.tree(0).distance(3))
+        tracker.close()
+        g.remove_edge(0, 3)
+        self.assertEqual(float("inf"), tracker.tree(0).distance(3))
+
+    def test_random_updates(self):
+        rnd = random.Random(4)
+        g = DiGraph()
+        for i in range(0, 40):
+            g.add_node(i)
+        for i in range(0, 160):
+            g.add_edge(rnd.randrange(40), rnd.randrange(40), rnd.randint(1, 10))
+        algo = GraphAlgo(g)
+        tracker = DynamicSSSP(g, [0, 7, 19])
+        for step in range(0, 400):
+            action = rnd.random()
+            id1 = rnd.randrange(40)
+            out_edges = list(g.all_out_edges_of_node(id1)) if g.get_all_v().__contains__(id1) else []
+            if action < 0.4 and out_edges:
+                # a weight change
+                id2 = rnd.choice(out_edges)
+                g.remove_edge(id1, id2)
+                g.add_edge(id1, id2, rnd.randint(1, 10))
+            elif action < 0.65 and out_edges:
+                g.remove_edge(id1, rnd.choice(out_edges))
+            elif action < 0.95:
+                g.add_edge(id1, rnd.randrange(40), rnd.randint(1, 10))
+            elif action < 0.975:
+                g.remove_node(id1)
+            else:
+                g.add_node(id1)
+            for src in tracker.sources():
+                self.assertEqual(algo.dijkstra(src)[0] if g.get_all_v().__contains__(src) else {},
+                                 tracker.tree(src).dist)
+
+    def test_batches(self):
+        g = DiGraph()
+        for i in range(0, 3):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        tracker = DynamicSSSP(g, [0])
+        with g.batch():
+            g.add_node(5)
+            g.add_edge(1, 5, 1)
+            g.add_edge(5, 2, 1)
+            g.remove_node(5)
+            g.add_edge(1, 2, 4)
+        self.assertTrue(tracker.is_current())
+        self.assertEqual({0: 0, 1: 1, 2: 5}, tracker.tree(0).dist)
+        rnd = random.Random(5)
+        g = DiGraph()
+        for i in range(0, 30):
+            g.add_node(i)
+        for i in range(0, 100):
+            g.add_edge(rnd.randrange(30), rnd.randrange(30), rnd.randint(1, 10))
+        algo = GraphAlgo(g)
+        tracker = DynamicSSSP(g, [0, 11])
+        for step in range(0, 300):
+            try:
+                with g.batch():
+                    for _ in range(0, rnd.randint(1, 8)):
+                        action = rnd.random()
+                        id1, id2 = rnd.randrange(30), rnd.randrange(30)
+                        if action < 0.3 and g.get_all_v().__contains__(id1) and g.has_edge(id1, id2):
+                            # a weight change
+                            g.remove_edge(id1, id2)
+                            g.add_edge(id1, id2, rnd.randint(1, 10))
+                        elif action < 0.55:
+                            g.remove_edge(id1, id2)
+                        elif action < 0.9:
+                            g.add_edge(id1, id2, rnd.randint(1, 10))
+                        elif action < 0.95:
+                            g.remove_node(id1)
+                        else:
+                            g.add_node(id1)
+                    if rnd.random() < 0.1:
+                        raise KeyError("rollback")
+            except KeyError:
+                pass
+            self.assertTrue(tracker.is_current())
+            for src in tracker.sources():
+                self.assertEqual(algo.dijkstra(src)[0] if g.get_all_v().__contains__(src) else {},
+                                 tracker.tree(src).dist)
+
+    def test_graph_algo(self):
+        g = DiGraph()
+        for i in range(0, 3):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 1)
+        algo = GraphAlgo(g)
+        tracker = algo.track_shortest_paths([0])
+        self.assertIs(tracker, algo.shortest_path_tracker())
+        self.assertEqual((2, [0, 1, 2]), algo.shortest_path(0, 2))
+        g.remove_edge(1, 2)
+        g.add_edge(1, 2, 4)
+        self.assertIs(tracker.trees[0][0], algo.shortest_path_tree(0).dist)
+        self.assertEqual((5, [0, 1, 2]), algo.shortest_path(0, 2))
+        self.assertIsNone(algo.track_shortest_paths(enable=False))
+        self.assertIsNone(algo.shortest_path_tracker())
+        self.assertEqual((5, [0, 1, 2]), algo.shortest_path(0, 2))
+
+
+if __name__ == '__main__':
+    test.main()
@@ -1,4 +1,11 @@
+import json
+import math
+import os
+import random
+import tempfile
+import threading
 import unittest as test
+import numpy as np
 from src.DiGraph import DiGraph
 from src.GraphAlgo import GraphAlgo
 
@@ -27,6 +34,23 @@ class TestGraphAlgo(test.TestCase):
         self.assertEqual(path_list, [])
         graph.plot_graph()
 
+    def test_shortest_path_keeps_nodes(self):
+        g = DiGraph()
+        for i in range(0, 4):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 1)
+        g.add_edge(0, 2, 5)
+        g.add_edge(2, 3, 1)
+        graph = GraphAlgo(g)
+        self.assertEqual((2, [0, 1, 2]), graph.shortest_path(0, 2))
+        for node in g.get_all_v().values():
+            self.assertFalse(hasattr(node, "__dict__"))
+            self.assertFalse(hasattr(node, "weight"))
+        dist, parent = graph.dijkstra(0, 2)
+        self.assertNotIn(3, dist)
+        self.assertEqual(1, parent[2])
+
     def test_connected_component(self):
         g = DiGraph()
         for i in range(1, 7):
@@ -62,9 +86,284 @@ class TestGraphAlgo(test.TestCase):
         g.add_edge(5, 6, 10)
         g.add_edge(6, 4, 10)
         graph = GraphAlgo(g)
-        self.assertEqual(3, len(graph.connected_components()))
+        self.assertEqual(2, len(graph.connected_components()))
+        self.assertEqual([[1, 4, 5, 6], [2, 3]], sorted(sorted(scc) for scc in graph.connected_components()))
         graph.plot_graph()
 
+    def test_component_id(self):
+        g = DiGraph()
+        for i in range(0, 5000):
+            g.add_node(i)
+        for i in range(0, 4999):
+            g.add_edge(i, i + 1, 1)
+        g.add_edge(4999, 2500, 1)
+        graph = GraphAlgo(g)
+        components = graph.connected_components()
+        self.assertEqual(2501, len(components))
+        self.assertEqual([0], components[0])
+        self.assertEqual(list(range(2500, 5000)), components[-1])
+        self.assertEqual(graph.component_id(2500), graph.component_id(4999))
+        self.assertNotEqual(graph.component_id(0), graph.component_id(1))
+        self.assertIsNone(graph.component_id(5000))
+        g.add_edge(2500, 0, 1)
+        self.assertEqual(1, len(graph.connected_components()))
+        self.assertEqual(5000, len(graph.connected_component(4999)))
+        for node in g.get_all_v().values():
+            self.assertFalse(hasattr(node, "info"))
+
+    def test_backward_search(self):
+        g = DiGraph()
+        for i in range(0, 5):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 1)
+        g.add_edge(0, 2, 5)
+        g.add_edge(3, 2, 1)
+        graph = GraphAlgo(g)
+        self.assertEqual([2, 1, 0, 3], graph.dfs(2, graph=g.reversed()))
+        dist, parent = graph.dijkstra(2, graph=g.reversed())
+        self.assertEqual({2: 0, 1: 1, 3: 1, 0: 2}, dist)
+        self.assertEqual(1, parent[0])
+        self.assertEqual({1: 1, 2: 5}, g.all_out_edges_of_node(0))
+        self.assertEqual((2, [0, 1, 2]), GraphAlgo(g.freeze()).shortest_path(0, 2))
+        self.assertEqual((2, [2, 1, 0]), GraphAlgo(g.freeze().reversed()).shortest_path(2, 0))
+
+    def test_shortest_path_tree(self):
+        g = DiGraph()
+        for i in range(0, 5):
+            g.add_node(i)
+        g.add_edge(0, 1, 3)
+        g.add_edge(1, 2, 5)
+        g.add_edge(0, 2, 10)
+        g.add_edge(2, 3, 5)
+        graph = GraphAlgo(g)
+        tree = graph.shortest_path_tree(0)
+        self.assertEqual(8, tree.distance(2))
+        self.assertEqual([0, 1, 2, 3], tree.path(3))
+        self.assertEqual(float("inf"), tree.distance(4))
+        self.assertEqual([], tree.path(4))
+        self.assertEqual([0, 1, 2, 3], sorted(tree.reachable()))
+        self.assertIs(tree, graph.shortest_path_tree(0))
+        self.assertEqual((13, [0, 1, 2, 3]), graph.shortest_path(0, 3))
+        g.add_edge(3, 4, 1)
+        self.assertIsNot(tree, graph.shortest_path_tree(0))
+        self.assertEqual([0, 1, 2, 3, 4], graph.shortest_path_tree(0).path(4))
+        self.assertEqual([], graph.shortest_path_tree(9).reachable())
+        graph.tree_cache_size = 2
+        for src in range(0, 4):
+            graph.shortest_path_tree(src)
+        self.assertIsNone(graph.cached_tree(0))
+        self.assertIsNotNone(graph.cached_tree(3))
+
+    def test_many_targets(self):
+        g = DiGraph()
+        for i in range(0, 100):
+            g.add_node(i)
+        for i in range(0, 99):
+            g.add_edge(i, i + 1, 1)
+        g.add_edge(0, 50, 100)
+        graph = GraphAlgo(g)
+        dist, parent = graph.dijkstra(0, 3)
+        self.assertEqual([0, 1, 2, 3], sorted(dist))
+        dist, parent = graph.dijkstra(0, {2, 5})
+        self.assertEqual(6, len(dist))
+        paths = graph.shortest_paths_to_many(0, [2, 5, 200])
+        self.assertEqual((2, [0, 1, 2]), paths[2])
+        self.assertEqual(5, paths[5][0])
+        self.assertEqual((float("inf"), []), paths[200])
+        self.assertEqual((3, [0, 1, 2, 3]), graph.nearest_of(0, [60, 3, 7]))
+        self.assertEqual((0, [5]), graph.nearest_of(5, [5, 6]))
+        self.assertEqual((float("inf"), []), graph.nearest_of(10, [1, 2]))
+        self.assertEqual((float("inf"), []), graph.nearest_of(10, []))
+        graph.shortest_path_tree(0)
+        self.assertEqual((3, [0, 1, 2, 3]), graph.nearest_of(0, [60, 3, 7]))
+        self.assertEqual(paths, graph.shortest_paths_to_many(0, [2, 5, 200]))
+
+    def test_bidirectional(self):
+        rnd = random.Random(7)
+        for _ in range(0, 5):
+            g = DiGraph()
+            for i in range(0, 80):
+                g.add_node(i)
+            for i in range(0, 240):
+                g.add_edge(rnd.randrange(80), rnd.randrange(80), rnd.choice([0.5, 1, 2.5, 4, 10]))
+            graph = GraphAlgo(g)
+            for _ in range(0, 50):
+                id1, id2 = rnd.randrange(80), rnd.randrange(82)
+                size, path = graph.shortest_path(id1, id2, method="bidirectional")
+                self.assertEqual(GraphAlgo(g).shortest_path(id1, id2)[0], size)
+                if path:
+                    self.assertEqual(id1, path[0])
+                    self.assertEqual(id2, path[-1])
+                    self.assertEqual(size, sum(g.get_edge(path[i], path[i + 1]) for i in range(0, len(path) - 1)))
+        with self.assertRaises(ValueError):
+            graph.shortest_path(0, 1, method="nope")
+
+    def test_a_star(self):
+        rnd = random.Random(11)
+        g = DiGraph()
+        for i in range(0, 20):
+            for j in range(0, 20):
+                g.add_node(i * 20 + j, (i, j, 0))
+        for i in range(0, 20):
+            for j in range(0, 20):
+                for di, dj in ((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1)):
+                    if 0 <= i + di < 20 and 0 <= j + dj < 20:
+                        g.add_edge(i * 20 + j, (i + di) * 20 + j + dj, rnd.uniform(1.5, 3) * math.hypot(di, dj))
+        graph = GraphAlgo(g)
+        self.assertAlmostEqual(1.5, graph.min_weight_per_distance(), delta=0.05)
+        for _ in range(0, 30):
+            id1, id2 = rnd.randrange(400), rnd.randrange(400)
+            size, path = graph.shortest_path(id1, id2, heuristic="euclidean")
+            expected = GraphAlgo(g).shortest_path(id1, id2)
+            self.assertAlmostEqual(expected[0], size)
+            self.assertEqual(id2, path[-1])
+            self.assertAlmostEqual(size, sum(g.get_edge(path[i], path[i + 1]) for i in range(0, len(path) - 1)))
+        frozen = GraphAlgo(g.freeze())
+        self.assertEqual(graph.shortest_path(0, 399), frozen.shortest_path(0, 399, heuristic="euclidean"))
+        self.assertIsNotNone(graph.heuristic(5, "euclidean"))
+        g.add_node(400)
+        g.add_edge(399, 400, 1)
+        self.assertIsNone(graph.heuristic(5, "euclidean"))
+        self.assertEqual(GraphAlgo(g).shortest_path(0, 400), graph.shortest_path(0, 400, heuristic="euclidean"))
+        g.get_node(400).get_pos()
+        self.assertIsNone(graph.positions())
+        with self.assertRaises(ValueError):
+            graph.heuristic(5, "manhattan")
+
+    def test_a_star_after_load(self):
+        nodes = [{"pos": "0,0,0", "id": 0}, {"pos": "1,0,0", "id": 1}, {"pos": "2,0,0", "id": 2},
+                 {"pos": "1,3,0", "id": 3}]
+        graph = GraphAlgo()
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "json_file")
+            for weights, expected in (((20, 50, 50), (20, [0, 2])), ((20, 5, 5.4), (10.4, [0, 3, 2]))):
+                edges = [{"src": 0, "w": weights[0], "dest": 2}, {"src": 0, "w": weights[1], "dest": 3},
+                         {"src": 3, "w": weights[2], "dest": 2}]
+                with open(file, "w") as f:
+                    json.dump({"Nodes": nodes, "Edges": edges}, f)
+                # the graphs are equal and have the same mc, but not the same weights
+                self.assertTrue(graph.load_from_json(file))
+                self.assertEqual(expected, graph.shortest_path(0, 2, heuristic="euclidean"))
+
+    def test_batch_rollback(self):
+        g = DiGraph()
+        for i in range(0, 3):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        graph = GraphAlgo(g)
+        frozen = g.freeze()
+        with self.assertRaises(ValueError):
+            with g.batch():
+                g.add_edge(1, 2, 1)
+                g.add_edge(2, 0, 1)
+                self.assertEqual([[0, 1, 2]], graph.connected_components())
+                self.assertEqual(2, graph.shortest_path_tree(0).distance(2))
+                raise ValueError("rollback")
+        self.assertEqual(3, len(graph.connected_components()))
+        self.assertEqual(float("inf"), graph.shortest_path_tree(0).distance(2))
+        self.assertEqual(1, g.freeze().e_size())
+        self.assertIsNot(frozen, g.freeze())
+
+    def test_all_pairs_shortest_paths(self):
+        g = DiGraph()
+        rnd = random.Random(3)
+        for i in range(0, 60):
+            g.add_node(i)
+        for i in range(0, 300):
+            g.add_edge(rnd.randrange(60), rnd.randrange(60), rnd.randint(1, 20))
+        graph = GraphAlgo(g)
+        dist, pred = graph.all_pairs_shortest_paths(predecessors=True)
+        dijkstra_dist, dijkstra_pred = graph.dijkstra_rows(list(range(0, 60)))
+        self.assertTrue(np.array_equal(dist, dijkstra_dist))
+        for i in range(0, 60):
+            for j in range(0, 60):
+                self.assertEqual(graph.shortest_path(i, j)[0], dist[i, j])
+                if pred[i, j] != -1:
+                    self.assertEqual(dist[i, j], dist[i, pred[i, j]] + g.get_edge(pred[i, j], j))
+        rows = graph.all_pairs_shortest_paths([5, 2])
+        self.assertTrue(np.array_equal(dist[[5, 2]], rows))
+        rows, pred = graph.all_pairs_shortest_paths([5, 99], predecessors=True)
+        self.assertTrue(np.array_equal(dist[5], rows[0]))
+        self.assertTrue(np.all(np.isinf(rows[1])))
+        self.assertTrue(np.all(pred[1] == -1))
+
+    def test_all_pairs_shortest_paths_pool(self):
+        g = DiGraph()
+        for i in range(0, 400):
+            g.add_node(i)
+        for i in range(0, 400):
+            g.add_edge(i, (i + 1) % 400, 1)
+            g.add_edge(i, (i * 7) % 400, 3)
+        graph = GraphAlgo(g)
+        sources = list(range(0, 400, 5))
+        dist, pred = graph.all_pairs_shortest_paths(sources, predecessors=True, workers=2)
+        local_dist, local_pred = graph.all_pairs_shortest_paths(sources, predecessors=True)
+        self.assertEqual((80, 400), dist.shape)
+        self.assertTrue(np.array_equal(local_dist, dist))
+        self.assertTrue(np.array_equal(local_pred, pred))
+        self.assertEqual(1, dist[0, 1])
+        self.assertEqual(0, dist[1, 5])
+        self.assertEqual(-1, pred[1, 5])
+        dist = graph.all_pairs_shortest_paths(sources + [-3], workers=2)
+        self.assertTrue(np.array_equal(local_dist, dist[:-1]))
+        self.assertTrue(np.all(np.isinf(dist[-1])))
+
+    def test_shortest_path_batch(self):
+        rnd = random.Random(3)
+        g = DiGraph()
+        for i in range(0, 300):
+            g.add_node(i)
+        for i in range(0, 1200):
+            g.add_edge(rnd.randrange(300), rnd.randrange(300), rnd.randint(1, 20))
+        graph = GraphAlgo(g)
+        pairs = [(rnd.randrange(40), rnd.randrange(305)) for i in range(0, 500)] + [(7, 7), (301, 3)]
+        expected = [graph.shortest_path(id1, id2) for id1, id2 in pairs]
+        self.assertEqual(expected, list(graph.shortest_path_batch(pairs)))
+        self.assertEqual(expected, list(graph.shortest_path_batch(pairs, workers=2)))
+        self.assertEqual(expected, list(graph.shortest_path_batch(iter(pairs), workers=3, chunk_size=1)))
+        self.assertEqual([], list(graph.shortest_path_batch([], workers=2)))
+
+    def test_concurrent_queries(self):
+        rnd = random.Random(6)
+        g = DiGraph()
+        for i in range(0, 200):
+            g.add_node(i)
+        for i in range(0, 800):
+            g.add_edge(rnd.randrange(200), rnd.randrange(200), rnd.randint(1, 9))
+        graph = GraphAlgo(g)
+        errors = []
+
+        def query(seed: int):
+            local = random.Random(seed)
+            try:
+                for i in range(0, 100):
+                    id1, id2 = local.randrange(200), local.randrange(200)
+                    with g.lock.read():
+                        dist, path = graph.shortest_path(id1, id2)
+                        if path and sum(g.get_edge(path[j], path[j + 1]) for j in range(0, len(path) - 1)) != dist:
+                            errors.append((id1, id2, dist, path))
+                        component = graph.connected_component(id1)
+                        if id1 not in component:
+                            errors.append(component)
+            except Exception as e:
+                errors.append(e)
+
+        def change():
+            local = random.Random(1)
+            for i in range(0, 200):
+                id1, id2 = local.randrange(200), local.randrange(200)
+                if not g.remove_edge(id1, id2):
+                    g.add_edge(id1, id2, local.randint(1, 9))
+
+        threads = [threading.Thread(target=query, args=(seed,)) for seed in range(0, 4)]
+        threads.append(threading.Thread(target=change))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+        self.assertEqual([], errors)
+
     def test_plot_graph(self):
         g = DiGraph()
         for i in range(1, 7):
@@ -98,9 +397,10 @@ class TestGraphAlgo(test.TestCase):
         g.add_edge(6, 5, 10)
         _g = g
         graph = GraphAlgo(g)
-        file = "json_file"
-        self.assertTrue(graph.save_to_json(file))
-        self.assertTrue(graph.load_from_json(file))
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "json_file")
+            self.assertTrue(graph.save_to_json(file))
+            self.assertTrue(graph.load_from_json(file))
         self.assertEqual(_g, graph.get_graph())
         graph.plot_graph()
 
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import unittest as test
+import numpy as np
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from src.GraphBinary import json_to_binary, load_binary, save_binary
+
+
+def build_graph() -> DiGraph:
+    g = DiGraph()
+    for i in range(0, 6):
+        g.add_node(i * 10, (i, i + 0.5, 0) if i % 2 == 0 else None)
+    g.add_edge(0, 10, 1.5)
+    g.add_edge(10, 20, 2)
+    g.add_edge(20, 0, 3)
+    g.add_edge(20, 30, 4)
+    g.add_edge(30, 40, 5)
+    g.add_edge(40, 30, 6)
+    return g
+
+
+class TestGraphBinary(test.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, "binary_file")
+        self.json_file = os.path.join(self.directory.name, "json_file")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load(self):
+        g = build_graph()
+        file = self.file
+        save_binary(g.freeze(), file)
+        for mmap in (True, False):
+            csr = load_binary(file, mmap)
+            self.assertEqual(g.v_size(), csr.v_size())
+            self.assertEqual(g.e_size(), csr.e_size())
+            self.assertEqual(g.get_mc(), csr.get_mc())
+            self.assertEqual(list(g.get_all_v()), list(csr.get_all_v()))
+            for key in g.get_all_v():
+                self.assertEqual(g.all_out_edges_of_node(key), csr.all_out_edges_of_node(key))
+                self.assertEqual(g.all_in_edges_of_node(key), csr.all_in_edges_of_node(key))
+            self.assertEqual((2.0, 2.5, 0.0), csr.get_node(20).get_pos())
+            self.assertIsNone(csr.get_node(10).get_pos())
+        self.assertIsInstance(load_binary(file).indices, np.memmap)
+
+    def test_corrupted(self):
+        file = self.file
+        save_binary(build_graph(), file)
+        with open(file, "r+b") as f:
+            f.seek(-3, os.SEEK_END)
+            f.write(b"\xff")
+        with self.assertRaises(ValueError):
+            load_binary(file, verify=True)
+        load_binary(file)
+        self.assertFalse(GraphAlgo().load_from_binary(file, verify=True))
+        with open(file, "r+b") as f:
+            f.truncate(100)
+        with self.assertRaises(ValueError):
+            load_binary(file)
+        with open(file, "wb") as f:
+            f.write(b"{}" * 40)
+        with self.assertRaises(ValueError):
+            load_binary(file)
+
+    def test_json_to_binary(self):
+        data = {"Edges": [{"src": 1, "w": 2.5, "dest": 0}, {"src": 0, "w": 1, "dest": 1},
+                          {"src": 0, "w": 9, "dest": 1}, {"src": 0, "w": 1, "dest": 0},
+                          {"src": 0, "w": 1, "dest": 7}, {"src": 0, "w": 4, "dest": 2}],
+                "Nodes": [{"pos": "1,2,3", "id": 1}, {"id": 0}, {"id": 2}, {"id": 1}]}
+        with open(self.json_file, "w") as f:
+            json.dump(data, f)
+        json_to_binary(self.json_file, self.file)
+        graph = GraphAlgo()
+        self.assertTrue(graph.load_from_json(self.json_file))
+        csr = load_binary(self.file)
+        self.assertEqual(graph.get_graph().e_size(), csr.e_size())
+        for key in graph.get_graph().get_all_v():
+            self.assertEqual(graph.get_graph().all_out_edges_of_node(key), csr.all_out_edges_of_node(key))
+            self.assertEqual(graph.get_graph().all_in_edges_of_node(key), csr.all_in_edges_of_node(key))
+        self.assertEqual((1.0, 2.0, 3.0), csr.get_node(1).get_pos())
+
+    def test_graph_algo(self):
+        g = build_graph()
+        graph = GraphAlgo(g)
+        self.assertTrue(graph.save_to_binary(self.file))
+        loaded = GraphAlgo()
+        self.assertTrue(loaded.load_from_binary(self.file))
+        self.assertEqual(graph.shortest_path(0, 40), loaded.shortest_path(0, 40))
+        self.assertEqual(sorted(map(sorted, graph.connected_components())),
+                         sorted(map(sorted, loaded.connected_components())))
+        self.assertFalse(loaded.load_from_binary("no_such_file"))
+
+
+if __name__ == '__main__':
+    test.main()
@@ -0,0 +1,97 @@
+import io
+import json
+import os
+import tempfile
+import unittest as test
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from src.GraphJson import iter_json_arrays
+
+
+class TestGraphJson(test.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, "json_file")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_iter_json_arrays(self):
+        data = {"Edges": [{"src": 0, "w": 1.25, "dest": 1}, {"src": 1, "w": 12345678, "dest": 0}],
+                "Name": {"a": [1, 2]},
+                "Empty": [],
+                "Nodes": [{"pos": "1.5,2.5,0.0", "id": 0}, {"id": 1}]}
+        text = json.dumps(data, indent=2)
+        expected = [("Edges", item) for item in data["Edges"]] + [("Nodes", item) for item in data["Nodes"]]
+        for chunk_size in (1, 2, 3, 7, 64, 1 << 16):
+            self.assertEqual(expected, list(iter_json_arrays(io.StringIO(text), chunk_size)))
+        self.assertEqual([], list(iter_json_arrays(io.StringIO(" {} "))))
+        with self.assertRaises(ValueError):
+            list(iter_json_arrays(io.StringIO('{"Nodes": [{"id": 0} {"id": 1}]}'), 4))
+
+    def test_load_edges_before_nodes(self):
+        text = '{"Edges": [{"src": 0, "w": 1.5, "dest": 1}], "Nodes": [{"id": 0}, {"id": 1, "pos": "1,2,0"}]}'
+        file = self.file
+        with open(file, "w") as f:
+            f.write(text)
+        graph = GraphAlgo()
+        self.assertTrue(graph.load_from_json(file))
+        self.assertEqual(2, graph.get_graph().v_size())
+        self.assertEqual(1.5, graph.get_graph().get_edge(0, 1))
+        self.assertEqual((1.0, 2.0, 0.0), graph.get_graph().get_node(1).pos)
+        self.assertFalse(graph.load_from_json("no_such_file"))
+
+    def test_load_large(self):
+        g = DiGraph()
+        for i in range(0, 25000):
+            g.add_node(i)
+        for i in range(0, 25000):
+            g.add_edge(i, (i * 7 + 1) % 25000, i % 13 + 0.5)
+        file = self.file
+        graph = GraphAlgo(g)
+        self.assertTrue(graph.save_to_json(file))
+        self.assertTrue(graph.load_from_json(file))
+        self.assertEqual(g, graph.get_graph())
+        self.assertEqual(g.e_size(), graph.get_graph().e_size())
+        self.assertEqual(g.all_out_edges_of_node(100), graph.get_graph().all_out_edges_of_node(100))
+
+    def test_save_pos_and_atomic(self):
+        g = DiGraph()
+        g.add_node(0, (1.5, 2.25, 0.0))
+        g.add_node(1)
+        g.add_node(2, (3, 4, 5))
+        g.add_edge(0, 1, 0.1)
+        g.add_edge(2, 0, 7)
+        file = self.file
+        graph = GraphAlgo(g)
+        self.assertTrue(graph.save_to_json(file, atomic=True))
+        with open(file) as f:
+            data = json.load(f)
+        self.assertEqual([{"pos": "1.5,2.25,0.0", "id": 0}, {"id": 1}, {"pos": "3,4,5", "id": 2}], data["Nodes"])
+        self.assertEqual([{"src": 0, "w": 0.1, "dest": 1}, {"src": 2, "w": 7, "dest": 0}], data["Edges"])
+        self.assertTrue(graph.load_from_json(file))
+        self.assertEqual((1.5, 2.25, 0.0), graph.get_graph().get_node(0).pos)
+        self.assertIsNone(graph.get_graph().get_node(1).pos)
+        self.assertEqual(g, graph.get_graph())
+        broken = GraphAlgo(g)
+        broken.graph_algo = None
+        with self.assertRaises(AttributeError):
+            broken.save_to_json(file, atomic=True)
+        with open(file) as f:
+            self.assertEqual(data, json.load(f))
+        self.assertEqual(["json_file"], os.listdir(self.directory.name))
+
+    def test_atomic_mode(self):
+        graph = GraphAlgo(DiGraph())
+        plain = os.path.join(self.directory.name, "plain_file")
+        self.assertTrue(graph.save_to_json(plain))
+        self.assertTrue(graph.save_to_json(self.file, atomic=True))
+        self.assertEqual(os.stat(plain).st_mode, os.stat(self.file).st_mode)
+        os.chmod(self.file, 0o640)
+        self.assertTrue(graph.save_to_json(self.file, atomic=True))
+        self.assertEqual(0o640, os.stat(self.file).st_mode & 0o777)
+
+
+if __name__ == '__main__':
+    test.main()
@@ -0,0 +1,82 @@
+import os
+import random
+import tempfile
+import unittest as test
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+
+
+def build_graph(seed: int, n: int = 120) -> DiGraph:
+    rnd = random.Random(seed)
+    g = DiGraph()
+    for i in range(0, n):
+        g.add_node(i)
+    for i in range(0, n * 3):
+        g.add_edge(rnd.randrange(n), rnd.randrange(n), rnd.randint(1, 30))
+    return g
+
+
+class TestLandmarks(test.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, "landmarks_file")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_exact(self):
+        rnd = random.Random(5)
+        for seed in range(0, 3):
+            g = build_graph(seed)
+            graph = GraphAlgo(g)
+            index = graph.build_landmarks(4)
+            self.assertEqual(4, len(set(index.landmarks)))
+            for _ in range(0, 60):
+                id1, id2 = rnd.randrange(120), rnd.randrange(120)
+                expected = GraphAlgo(g).shortest_path(id1, id2)
+                size, path = graph.shortest_path(id1, id2, heuristic="landmarks")
+                self.assertEqual(expected[0], size)
+                if path:
+                    self.assertEqual(size, sum(g.get_edge(path[i], path[i + 1]) for i in range(0, len(path) - 1)))
+                estimate = index.estimate(id2)
+                self.assertLessEqual(estimate(id1), expected[0])
+
+    def test_invalidate_and_persist(self):
+        g = build_graph(9)
+        graph = GraphAlgo(g)
+        self.assertIsNone(graph.landmark_index())
+        self.assertFalse(graph.save_landmarks(self.file))
+        index = graph.build_landmarks(3)
+        self.assertTrue(graph.save_landmarks(self.file))
+        g.add_edge(0, 1, 1)
+        rebuilt = graph.landmark_index()
+        self.assertIsNot(index, rebuilt)
+        self.assertEqual(g.get_mc(), rebuilt.get_mc())
+        self.assertFalse(graph.load_landmarks(self.file))
+        self.assertTrue(GraphAlgo(build_graph(9)).load_landmarks(self.file))
+        graph.landmarks_auto_rebuild = False
+        g.remove_edge(0, 1)
+        self.assertIsNone(graph.landmark_index())
+        self.assertEqual(GraphAlgo(g).shortest_path(3, 4), graph.shortest_path(3, 4, heuristic="landmarks"))
+        self.assertFalse(graph.load_landmarks("no_such_file"))
+
+    def test_load_other_weights(self):
+        g = build_graph(4)
+        heavier = DiGraph()
+        for key in g.get_all_v():
+            heavier.add_node(key)
+        for key in g.get_all_v():
+            for dest, w in g.all_out_edges_of_node(key).items():
+                heavier.add_edge(key, dest, w * 2)
+        self.assertEqual(g.get_mc(), heavier.get_mc())
+        graph = GraphAlgo(heavier)
+        graph.build_landmarks(3)
+        self.assertTrue(graph.save_landmarks(self.file))
+        # same mc and nodes, but the distances of the index overestimate the ones of g
+        self.assertFalse(GraphAlgo(g).load_landmarks(self.file))
+        self.assertTrue(GraphAlgo(heavier).load_landmarks(self.file))
+
+
+if __name__ == '__main__':
+    test.main()
@@ -0,0 +1,194 @@
+import random
+import threading
+import time
+import unittest as test
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from src.QueryCache import QueryCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestQueryCache(test.TestCase):
+
+    def test_lru_and_ttl(self):
+        g = DiGraph()
+        g.add_node(0)
+        clock = FakeClock()
+        cache = QueryCache(g, maxsize=2, ttl=10, clock=clock)
+        cache.put(("connected_component", 1), (1,))
+        cache.put(("connected_component", 2), (2,))
+        self.assertEqual((True, (1,)), cache.get(("connected_component", 1)))
+        cache.put(("connected_component", 3), (3,))
+        self.assertEqual((False, None), cache.get(("connected_component", 2)))
+        self.assertEqual({"hits": 1, "misses": 1, "evictions": 1, "size": 2}, cache.stats())
+        clock.now = 10
+        self.assertEqual((False, None), cache.get(("connected_component", 1)))
+        cache.put(("connected_component", 1), (1,))
+        g.add_node(1)
+        self.assertEqual((False, None), cache.get(("connected_component", 1)))
+        self.assertEqual(0, cache.stats()["size"])
+
+    def test_graph_algo(self):
+        g = DiGraph()
+        for i in range(0, 4):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 1)
+        g.add_edge(2, 0, 1)
+        graph = GraphAlgo(g)
+        cache = graph.cache_queries(maxsize=16)
+        self.assertIs(cache, graph.result_cache())
+        path = graph.shortest_path(0, 2)
+        path[1].append(9)
+        self.assertEqual((2, [0, 1, 2]), graph.shortest_path(0, 2))
+        self.assertEqual([0, 1, 2], sorted(graph.connected_component(1)))
+        self.assertEqual([0, 1, 2], sorted(graph.connected_component(1)))
+        self.assertEqual(2, len(graph.connected_components()))
+        self.assertEqual(2, len(graph.connected_components()))
+        self.assertEqual(3, cache.hits)
+        g.add_edge(0, 2, 1)
+        self.assertEqual((1, [0, 2]), graph.shortest_path(0, 2))
+        self.assertIsNone(graph.cache_queries(0))
+        self.assertIsNone(graph.result_cache())
+
+    def test_weight_per_distance_not_cached(self):
+        g = DiGraph()
+        g.add_node(0, (0, 0, 0))
+        g.add_node(1, (0, 10, 0))
+        g.add_node(2, (1, 0, 0))
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 1)
+        g.add_edge(0, 2, 5)
+        graph = GraphAlgo(g)
+        cache = graph.cache_queries(maxsize=16)
+        # an overestimating ratio finds a longer path
+        self.assertEqual((5, [0, 2]), graph.shortest_path(0, 2, heuristic="euclidean", weight_per_distance=100))
+        self.assertEqual(0, cache.stats()["size"])
+        self.assertEqual((2, [0, 1, 2]), graph.shortest_path(0, 2))
+        self.assertEqual((2, [0, 1, 2]), graph.shortest_path(0, 2, heuristic="euclidean"))
+        self.assertEqual(1, cache.hits)
+
+    def test_lock_order(self):
+        g = DiGraph()
+        for i in range(0, 3):
+            g.add_node(i, (i, 0, 0))
+        graph = GraphAlgo(g)
+        reading = threading.Event()
+
+        def reader():
+            with g.lock.read():
+                reading.set()
+                time.sleep(0.2)
+                graph.positions()
+
+        threads = [threading.Thread(target=reader, daemon=True),
+                   threading.Thread(target=graph.cache_queries, kwargs={"keep_unaffected": True}, daemon=True)]
+        threads[0].start()
+        reading.wait(5)
+        threads[1].start()
+        for thread in threads:
+            thread.join(5)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertIsNotNone(graph.result_cache())
+        self.assertIsNone(graph.cache_queries(0))
+
+    def test_keep_unaffected(self):
+        g = DiGraph()
+        for i in range(0, 5):
+            g.add_node(i)
+        for id1, id2 in ((0, 1), (1, 2), (2, 0), (2, 3), (3, 4)):
+            g.add_edge(id1, id2, 1)
+        graph = GraphAlgo(g)
+        cache = graph.cache_queries(keep_unaffected=True)
+        graph.shortest_path(0, 2)
+        graph.shortest_path(0, 4)
+        graph.connected_component(0)
+        graph.connected_components()
+        # not on the path 0 -> 1 -> 2 and between two SCCs
+        g.remove_edge(3, 4)
+        self.assertIn(("shortest_path", 0, 2), cache.entries)
+        self.assertNotIn(("shortest_path", 0, 4), cache.entries)
+        self.assertIn(("connected_component", 0), cache.entries)
+        # inside the SCC {0, 1, 2}
+        g.add_edge(1, 0, 1)
+        self.assertNotIn(("shortest_path", 0, 2), cache.entries)
+        self.assertIn(("connected_component", 0), cache.entries)
+        g.remove_edge(0, 1)
+        self.assertEqual(0, len(cache.entries))
+
+    def test_keep_unaffected_random(self):
+        rnd = random.Random(8)
+        g = DiGraph()
+        for i in range(0, 25):
+            g.add_node(i)
+        for i in range(0, 60):
+            g.add_edge(rnd.randrange(25), rnd.randrange(25), rnd.randint(1, 5))
+        graph = GraphAlgo(g)
+        plain = GraphAlgo(g)
+        graph.cache_queries(maxsize=64, keep_unaffected=True)
+        for step in range(0, 300):
+            action = rnd.random()
+            id1, id2 = rnd.randrange(27), rnd.randrange(27)
+            if action < 0.3:
+                g.add_edge(id1, id2, rnd.randint(1, 5))
+            elif action < 0.6:
+                g.remove_edge(id1, id2)
+            elif action < 0.65:
+                g.remove_node(id1)
+            elif action < 0.7:
+                g.add_node(id1)
+            for i in range(0, 5):
+                id1, id2 = rnd.randrange(27), rnd.randrange(27)
+                self.assertEqual(plain.shortest_path(id1, id2)[0], graph.shortest_path(id1, id2)[0])
+                self.assertEqual(sorted(plain.connected_component(id1)), sorted(graph.connected_component(id1)))
+            self.assertEqual(sorted(map(sorted, plain.connected_components())),
+                             sorted(map(sorted, graph.connected_components())))
+
+
+    def test_keep_unaffected_batches(self):
+        rnd = random.Random(9)
+        g = DiGraph()
+        for i in range(0, 20):
+            g.add_node(i)
+        for i in range(0, 50):
+            g.add_edge(rnd.randrange(20), rnd.randrange(20), rnd.randint(1, 5))
+        graph = GraphAlgo(g)
+        plain = GraphAlgo(g)
+        cache = graph.cache_queries(maxsize=64, keep_unaffected=True)
+        for step in range(0, 200):
+            try:
+                with g.batch():
+                    for _ in range(0, rnd.randint(1, 8)):
+                        action = rnd.random()
+                        id1, id2 = rnd.randrange(22), rnd.randrange(22)
+                        if action < 0.4:
+                            g.add_edge(id1, id2, rnd.randint(1, 5))
+                        elif action < 0.8:
+                            g.remove_edge(id1, id2)
+                        elif action < 0.9:
+                            g.remove_node(id1)
+                        else:
+                            g.add_node(id1)
+                    if rnd.random() < 0.1:
+                        raise KeyError("rollback")
+            except KeyError:
+                pass
+            self.assertEqual(g.get_mc(), cache.mc)
+            for i in range(0, 5):
+                id1, id2 = rnd.randrange(22), rnd.randrange(22)
+                self.assertEqual(plain.shortest_path(id1, id2)[0], graph.shortest_path(id1, id2)[0])
+                self.assertEqual(sorted(plain.connected_component(id1)), sorted(graph.connected_component(id1)))
+            self.assertEqual(sorted(map(sorted, plain.connected_components())),
+                             sorted(map(sorted, graph.connected_components())))
+
+
+if __name__ == '__main__':
+    test.main()
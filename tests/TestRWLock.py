@@ -0,0 +1,60 @@
+import threading
+import time
+import unittest as test
+from src.RWLock import RWLock
+
+
+class TestRWLock(test.TestCase):
+
+    def test_readers_share(self):
+        lock = RWLock()
+        inside = threading.Barrier(3, timeout=5)
+
+        def read():
+            with lock.read():
+                inside.wait()
+
+        threads = [threading.Thread(target=read) for i in range(0, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertFalse(inside.broken)
+        self.assertEqual(0, lock.readers)
+
+    def test_writer_excludes(self):
+        lock = RWLock()
+        events = []
+
+        def write():
+            with lock.write():
+                events.append("write")
+
+        with lock.read():
+            writer = threading.Thread(target=write)
+            writer.start()
+            time.sleep(0.05)
+            events.append("read")
+            # a reader of this thread may read again while the writer waits
+            with lock.read():
+                events.append("read again")
+        writer.join(5)
+        self.assertEqual(["read", "read again", "write"], events)
+
+    def test_reentrant(self):
+        lock = RWLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    self.assertEqual(threading.get_ident(), lock.writer)
+            self.assertEqual(1, lock.writes)
+        self.assertIsNone(lock.writer)
+        with lock.read():
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
+        with lock.write():
+            pass
+
+
+if __name__ == '__main__':
+    test.main()
@@ -0,0 +1,82 @@
+import random
+import unittest as test
+from unittest import mock
+import numpy as np
+from src.CSRGraph import CSRGraph
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from src.Reachability import Reachability, bfs_hops
+from src.StronglyConnected import tarjan_scc
+
+
+def random_graph(seed: int, n: int, m: int) -> DiGraph:
+    rnd = random.Random(seed)
+    g = DiGraph()
+    for i in range(0, n):
+        g.add_node(i * 3)
+    for i in range(0, m):
+        g.add_edge(rnd.randrange(n) * 3, rnd.randrange(n) * 3, 1)
+    return g
+
+
+class TestReachability(test.TestCase):
+
+    def test_bfs_hops(self):
+        # 0 -> 1 -> 2 -> 3, 0 -> 2
+        indptr = np.array([0, 2, 3, 4, 4])
+        indices = np.array([1, 2, 2, 3])
+        self.assertEqual([0, 1, 1, 2], bfs_hops(indptr, indices, [0]).tolist())
+        self.assertEqual([0, 1, 1, -1], bfs_hops(indptr, indices, [0], max_hops=1).tolist())
+        self.assertEqual([-1, 0, 1, 0], bfs_hops(indptr, indices, [1, 3]).tolist())
+        self.assertEqual([-1, -1, -1, -1], bfs_hops(indptr, indices, []).tolist())
+
+    def test_queries(self):
+        g = random_graph(1, 200, 300)
+        engine = Reachability(CSRGraph.from_graph(g))
+        graph = GraphAlgo(g)
+        for src in range(0, 600, 30):
+            self.assertEqual(sorted(graph.dfs(src)), sorted(engine.reachable_from(src)))
+            self.assertEqual(sorted(graph.dfs(src, graph=g.reversed())), sorted(engine.reaches(src)))
+            hops = engine.hop_distances(src)
+            self.assertEqual(0, hops[src])
+            for node_id, count in engine.hop_distances(src, max_hops=2).items():
+                self.assertLessEqual(count, 2)
+                self.assertEqual(hops[node_id], count)
+        both = engine.reachable_from(0, 3)
+        self.assertEqual(sorted(set(graph.dfs(0)) | set(graph.dfs(3))), sorted(both))
+        self.assertEqual([], engine.reachable_from(1))
+        self.assertEqual([], engine.strongly_connected(1))
+
+    def test_graph_algo(self):
+        g = random_graph(2, 150, 260)
+        graph = GraphAlgo(g)
+        expected = {node_id: sorted(component) for component in graph.connected_components() for node_id in component}
+        g.add_node(1000)
+        g.remove_node(1000)
+        for node_id in g.get_all_v():
+            self.assertEqual(expected[node_id], sorted(graph.connected_component(node_id)))
+        self.assertEqual([], graph.connected_component(1))
+        self.assertEqual({0: 0}, graph.hop_distances(0, max_hops=0))
+        self.assertEqual(sorted(graph.dfs(3)), sorted(graph.reachable_from(3)))
+        self.assertEqual(sorted(graph.dfs(3, graph=g.reversed())), sorted(graph.reaches(3)))
+
+    def test_component_lookups(self):
+        g = DiGraph()
+        for i in range(0, 20000):
+            g.add_node(i)
+        for i in range(0, 19999):
+            g.add_edge(i, i + 1, 1)
+        g.add_edge(19999, 19990, 1)
+        graph = GraphAlgo(g)
+        with mock.patch("src.GraphAlgo.tarjan_scc", wraps=tarjan_scc) as full_pass:
+            for node_id in range(0, 19990, 10):
+                self.assertEqual(1, len(graph.connected_component(node_id)))
+            self.assertEqual(10, len(graph.connected_component(19995)))
+            # the SCCs are computed once, then every lookup is a dict lookup
+            self.assertEqual(1, full_pass.call_count)
+            g.remove_edge(19999, 19990)
+            self.assertEqual([19995], graph.connected_component(19995))
+            self.assertEqual(2, full_pass.call_count)
+
+if __name__ == '__main__':
+    test.main()
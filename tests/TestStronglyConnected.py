@@ -0,0 +1,124 @@
+import random
+import unittest as test
+from src.DiGraph import DiGraph
+from src.GraphAlgo import GraphAlgo
+from src.StronglyConnected import IncrementalSCC, tarjan_scc
+
+
+def components(g: DiGraph) -> list:
+    return sorted(sorted(component) for component in tarjan_scc(g.get_all_v().keys(), g.all_out_edges_of_node))
+
+
+class TestStronglyConnected(test.TestCase):
+
+    def test_tarjan_scc(self):
+        g = DiGraph()
+        for i in range(0, 6):
+            g.add_node(i)
+        for id1, id2 in ((0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 3), (4, 5)):
+            g.add_edge(id1, id2, 1)
+        self.assertEqual([[0, 1, 2], [3, 4], [5]], tarjan_scc(g.get_all_v().keys(), g.all_out_edges_of_node))
+        self.assertEqual([[0], [1]], sorted(tarjan_scc([0, 1], g.all_out_edges_of_node, {0, 1})))
+        self.assertEqual([[3, 4]], tarjan_scc([3, 4], g.all_out_edges_of_node, {3, 4}))
+
+    def test_incremental(self):
+        rnd = random.Random(2)
+        g = DiGraph()
+        for i in range(0, 40):
+            g.add_node(i)
+        tracker = IncrementalSCC(g)
+        for step in range(0, 600):
+            action = rnd.random()
+            if action < 0.55:
+                g.add_edge(rnd.randrange(45), rnd.randrange(45), 1)
+            elif action < 0.9:
+                id1 = rnd.choice(list(g.get_all_v().keys()))
+                out_edges = list(g.all_out_edges_of_node(id1))
+                if out_edges:
+                    g.remove_edge(id1, rnd.choice(out_edges))
+            elif action < 0.95:
+                g.remove_node(rnd.randrange(45))
+            else:
+                g.add_node(rnd.randrange(45))
+            if step % 7 == 0:
+                g.add_edges_bulk([(rnd.randrange(45), rnd.randrange(45), 1) for _ in range(0, 3)])
+            self.assertEqual(g.get_mc(), tracker.mc)
+            self.assertEqual(components(g), sorted(sorted(component) for component in tracker.connected_components()))
+            for node_id in g.get_all_v():
+                self.assertEqual(tracker.component_id(node_id), tracker.component_of[node_id])
+        tracker.close()
+        g.add_node(100)
+        self.assertFalse(tracker.is_current())
+        self.assertEqual([100], tracker.connected_component(100))
+
+    def test_batches(self):
+        g = DiGraph()
+        for i in range(0, 3):
+            g.add_node(i)
+        tracker = IncrementalSCC(g)
+        with g.batch():
+            g.add_edge(1, 2, 1)
+            g.add_node(9)
+            g.add_edge(2, 9, 1)
+            g.add_edge(9, 1, 1)
+        self.assertTrue(tracker.is_current())
+        self.assertEqual([1, 2, 9], sorted(tracker.connected_component(9)))
+        rnd = random.Random(6)
+        for step in range(0, 300):
+            try:
+                with g.batch():
+                    for _ in range(0, rnd.randint(1, 4)):
+                        action = rnd.random()
+                        if action < 0.5:
+                            g.add_edge(rnd.randrange(30), rnd.randrange(30), 1)
+                        elif action < 0.8:
+                            g.remove_edge(rnd.randrange(30), rnd.randrange(30))
+                        elif action < 0.9:
+                            g.remove_node(rnd.randrange(30))
+                        else:
+                            g.add_node(rnd.randrange(30))
+                    if rnd.random() < 0.1:
+                        raise KeyError("rollback")
+            except KeyError:
+                pass
+            self.assertTrue(tracker.is_current())
+            self.assertEqual(components(g), sorted(sorted(component) for component in tracker.connected_components()))
+
+    def test_failing_update(self):
+        g = DiGraph()
+        for i in range(0, 3):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        tracker = IncrementalSCC(g)
+
+        def failing(id1: int, id2: int):
+            raise RuntimeError("update failed")
+
+        tracker.edge_added = failing
+        self.assertTrue(g.add_edge(1, 0, 1))
+        self.assertFalse(tracker.is_current())
+        del tracker.edge_added
+        self.assertEqual([0, 1], sorted(tracker.connected_component(0)))
+        self.assertTrue(tracker.is_current())
+
+    def test_graph_algo(self):
+        g = DiGraph()
+        for i in range(0, 5):
+            g.add_node(i)
+        graph = GraphAlgo(g)
+        graph.track_components()
+        self.assertEqual(5, len(graph.connected_components()))
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 1)
+        g.add_edge(2, 0, 1)
+        self.assertEqual([0, 1, 2], sorted(graph.connected_component(1)))
+        self.assertEqual(graph.component_id(0), graph.component_id(2))
+        g.remove_edge(1, 2)
+        self.assertEqual([1], graph.connected_component(1))
+        self.assertEqual([], graph.connected_component(7))
+        self.assertIsNone(graph.track_components(False))
+        self.assertEqual(5, len(graph.connected_components()))
+
+
+if __name__ == '__main__':
+    test.main()